@@ -0,0 +1,368 @@
+"""
+端到端吞吐基准 - 用本地视频 / 图片目录代替摄像头，尽可能快地跑完整条流水线
+
+每帧依次经过：
+    解码 → 预处理（镜像 + RGB）→ GestureRecognizer → GestureController → 叠加层绘制
+与 main.py 的同步模式一致，只是不按键（动作记录成事件）、不显示窗口。
+时间戳按素材帧率合成，所以 SimpleGesture 的保持时间与真实播放一致。
+
+报告：帧率、每帧 CPU 时间、分阶段延迟（p50/p95/p99）、峰值 RSS、加载识别器的启动耗时，
+可以写成 JSON，方便不同版本 / 机器之间对比。
+
+用法：
+    python -m gesture_control.benchmark clips/*.mp4 frames_dir/
+    python -m gesture_control.benchmark clip.mp4 --roi --limit 500 --json bench.json
+    python -m gesture_control.benchmark clip.mp4 --classifier gestures.npz   # 自定义分类器引擎
+    python -m gesture_control.benchmark clip.mp4 --trigger hold --no-swipe   # 对比触发器 / 关掉挥手
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import Counter
+
+import cv2
+
+from . import __version__
+from .config import (
+    CLAP_DISTANCE_THRESHOLD, LANDMARK_FILTER, MAX_NUM_HANDS, PRIMARY_HAND, SMOOTHING,
+    SWIPE_GESTURES, TRIGGER,
+)
+from .core.clock import FrameClock
+from .core.classifier import CentroidClassifier, LandmarkRecognizer
+from .core.gestures import GestureRecognizer
+from .core.metrics import Metrics
+from .core.overlay import OverlayRenderer
+from .core.preprocess import FramePreprocessor
+from .core.startup import StartupTimer
+from .core.trigger import TRIGGERS
+from .main import (
+    FILTER_CHOICES, _is_scrolling, make_controller, make_profile, smoothing_config,
+)
+from .replay import RecordingDispatcher
+
+try:
+    import resource
+except ImportError:   # Windows 没有 resource 模块
+    resource = None
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+# 结果 JSON 的格式版本，字段变化时加一
+RESULT_VERSION = 1
+
+
+def iter_frames(path: str):
+    """
+    逐帧读取视频文件或图片目录（目录内按文件名排序）
+
+    Yields:
+        BGR 图像
+    """
+    if os.path.isdir(path):
+        names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+        for name in names:
+            image = cv2.imread(os.path.join(path, name))
+            if image is not None:
+                yield image
+        return
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Source not found: {path}")
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {path}")
+    try:
+        while True:
+            ok, image = cap.read()
+            if not ok:
+                break
+            yield image
+    finally:
+        cap.release()
+
+
+def source_fps(path: str, default: float = 30.0) -> float:
+    """素材帧率（图片目录或读不到时用 default）"""
+    if os.path.isdir(path):
+        return default
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0
+    cap.release()
+    return fps if fps and fps > 0 else default
+
+
+def peak_rss_mb():
+    """进程峰值常驻内存（MB），不支持的平台返回 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class BenchmarkPipeline:
+    """
+    基准流水线：一个识别器跑多个素材，每个素材单独计时
+
+    识别器在素材之间复用（模型只加载一次），时间戳连续递增。
+    """
+
+    def __init__(self, recognizer, overlay: bool = True, trigger: str = TRIGGER,
+                 swipe: bool = SWIPE_GESTURES, profile: str = None):
+        """
+        Args:
+            recognizer: GestureRecognizer（同步模式）
+            overlay: 是否绘制叠加层（关掉相当于 --headless）
+            trigger / swipe / profile: 同 main.py 的 --trigger / --no-swipe / --profile
+        """
+        self.recognizer = recognizer
+        self.overlay = OverlayRenderer() if overlay else None
+        self.preprocessor = FramePreprocessor()
+        self.events = []
+        self.clock = FrameClock()
+        dispatcher = RecordingDispatcher(self.events)
+        # 控制器与 main 同样构造（默认的触发器、挥手检测），测出来的才是实际的开销；配置不热加载
+        self.controller = make_controller(
+            dispatcher, self.clock, trigger, swipe,
+            make_profile(profile, dispatcher, trigger, interval=float('inf')),
+            verbose=False)
+        self.timestamp_ms = 0
+
+    def run(self, frames, fps: float = 30.0, limit: int = None, warmup: int = 0) -> dict:
+        """
+        跑一个素材
+
+        Args:
+            frames: 帧迭代器（iter_frames 的结果）
+            fps: 素材帧率，用于合成时间戳
+            limit: 最多处理多少帧（不含预热）
+            warmup: 预热帧数，不计入统计
+
+        Returns:
+            dict: {'frames', 'wall_s', 'fps', 'cpu_s', 'cpu_ms_per_frame',
+                   'cpu_utilization', 'stages', 'counts'}
+        """
+        metrics = Metrics(enabled=True)
+        self.recognizer.metrics = metrics
+        frame_interval_ms = 1000 / fps
+        start_ms = self.timestamp_ms
+        events_before = len(self.events)
+        frames = iter(frames)
+        processed = 0
+        n = 0
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        while limit is None or processed < limit:
+            t = metrics.start()
+            image = next(frames, None)
+            if image is None:
+                break
+            metrics.stop('decode', t)
+
+            frame_start = metrics.start()
+            self.timestamp_ms = start_ms + round(n * frame_interval_ms)
+            n += 1
+            self._process(image, metrics)
+            metrics.stop('frame', frame_start)
+            metrics.count('frames')
+
+            if n <= warmup:
+                if n == warmup:
+                    # 预热结束：丢掉之前的统计重新计时
+                    metrics = Metrics(enabled=True)
+                    self.recognizer.metrics = metrics
+                    events_before = len(self.events)
+                    wall_start, cpu_start = time.perf_counter(), time.process_time()
+                continue
+            processed += 1
+
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        self.timestamp_ms += round(frame_interval_ms)
+        snapshot = metrics.snapshot()
+        return {
+            'frames': processed,
+            'wall_s': wall,
+            'fps': processed / wall if wall > 0 else 0.0,
+            'cpu_s': cpu,
+            'cpu_ms_per_frame': cpu * 1000 / processed if processed else 0.0,
+            'cpu_utilization': cpu / wall if wall > 0 else 0.0,
+            'stages': snapshot['stages'],
+            'counts': dict(Counter(kind for _, kind, _ in self.events[events_before:])),
+        }
+
+    def _process(self, image, metrics):
+        """一帧：与 main.py 同步模式的处理顺序一致"""
+        t = metrics.start()
+        frame, rgb = self.preprocessor.process(image)
+        h, w = frame.shape[:2]
+        metrics.stop('preprocess', t)
+
+        gesture, points = self.recognizer.recognize(rgb, w, h, self.timestamp_ms, is_rgb=True)
+
+        t = metrics.start()
+        self.clock.update(self.timestamp_ms)
+        self.controller.update(gesture, points)
+        metrics.stop('gesture', t)
+
+        if self.overlay is not None:
+            t = metrics.start()
+            status = self.controller.get_status(gesture)
+            self.overlay.render(frame, status, _is_scrolling(gesture, points))
+            metrics.stop('overlay', t)
+
+
+def machine_info() -> dict:
+    """运行环境，写进结果方便跨机器对比"""
+    info = {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'gesture_control': __version__,
+    }
+    try:
+        import mediapipe
+        info['mediapipe'] = mediapipe.__version__
+    except (ImportError, AttributeError):
+        info['mediapipe'] = None
+    return info
+
+
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="端到端吞吐基准（视频文件 / 图片目录）")
+    parser.add_argument('sources', nargs='+', help="视频文件或图片目录")
+    parser.add_argument('--model', help="模型路径（默认 gesture_recognizer.task，"
+                                         "指定 --classifier 时默认 hand_landmarker.task）")
+    parser.add_argument('--classifier', metavar='PATH',
+                        help="用自定义分类器引擎（HandLandmarker + 最近质心）代替官方识别器")
+    parser.add_argument('--roi', action='store_true', help="开启 ROI 跟踪")
+    parser.add_argument('--num-hands', type=int, default=MAX_NUM_HANDS,
+                        help=f"最多检测几只手（默认 {MAX_NUM_HANDS}，与 main.py 一致）")
+    parser.add_argument('--smoothing', choices=('evidence', 'vote'), default=SMOOTHING,
+                        help=f"手势平滑方式（默认 {SMOOTHING}）")
+    parser.add_argument('--filter', dest='landmark_filter', choices=FILTER_CHOICES,
+                        default=str(LANDMARK_FILTER).lower(),
+                        help=f"关键点时域滤波（默认 {LANDMARK_FILTER}）")
+    parser.add_argument('--trigger', choices=TRIGGERS, default=TRIGGER,
+                        help=f"动作触发方式（默认 {TRIGGER}，与 main.py 一致）")
+    parser.add_argument('--no-swipe', dest='swipe', action='store_false', default=SWIPE_GESTURES,
+                        help="关闭挥手手势")
+    parser.add_argument('--profile', metavar='NAME_OR_PATH', help="手势绑定配置（名字或路径）")
+    parser.add_argument('--no-overlay', action='store_true', help="不绘制叠加层")
+    parser.add_argument('--limit', type=int, help="每个素材最多处理多少帧")
+    parser.add_argument('--warmup', type=int, default=10, help="预热帧数（默认 10，只对第一个素材）")
+    parser.add_argument('--fps', type=float, default=30.0,
+                        help="图片目录 / 读不到帧率时假定的帧率（默认 30）")
+    parser.add_argument('--json', metavar='PATH', help="把结果写成 JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """基准命令入口"""
+    args = parse_args(argv)
+    startup = StartupTimer()
+
+    try:
+        options = dict(roi_tracking=args.roi, num_hands=args.num_hands,
+                       clap_distance=CLAP_DISTANCE_THRESHOLD, primary_hand=PRIMARY_HAND,
+                       **smoothing_config(args.smoothing, args.landmark_filter))
+        with startup.stage('recognizer'):
+            if args.classifier:
+                model = args.model or 'hand_landmarker.task'
+                recognizer = LandmarkRecognizer(CentroidClassifier.load(args.classifier),
+                                                model_path=model, **options)
+            else:
+                model = args.model or 'gesture_recognizer.task'
+                recognizer = GestureRecognizer(model_path=model, **options)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(startup.report())
+    try:
+        pipeline = BenchmarkPipeline(recognizer, overlay=not args.no_overlay,
+                                     trigger=args.trigger, swipe=args.swipe, profile=args.profile)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        recognizer.close()
+        return 1
+
+    results = []
+    warmup = args.warmup
+    try:
+        for path in args.sources:
+            try:
+                frames = iter_frames(path)
+                result = pipeline.run(frames, source_fps(path, args.fps), args.limit, warmup)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"❌ {e}")
+                continue
+            warmup = 0
+            result['source'] = path
+            results.append(result)
+
+            print(f"{path}: {result['frames']} frames, {result['fps']:.1f} fps, "
+                  f"{result['cpu_ms_per_frame']:.2f} ms CPU/frame "
+                  f"({result['cpu_utilization'] * 100:.0f}% CPU)")
+            for stage, s in result['stages'].items():
+                print(f"  {stage:<12} p50 {s['p50_ms']:7.2f}  p95 {s['p95_ms']:7.2f}  "
+                      f"p99 {s['p99_ms']:7.2f}  max {s['max_ms']:7.2f} ms")
+    finally:
+        recognizer.close()
+
+    frames = sum(r['frames'] for r in results)
+    wall = sum(r['wall_s'] for r in results)
+    cpu = sum(r['cpu_s'] for r in results)
+    report = {
+        'version': RESULT_VERSION,
+        'time': time.time(),
+        'machine': machine_info(),
+        'config': {
+            'engine': 'landmark' if args.classifier else 'gesture',
+            'model': model,
+            'classifier': args.classifier,
+            'roi_tracking': args.roi,
+            'num_hands': args.num_hands,
+            'smoothing': args.smoothing,
+            'landmark_filter': args.landmark_filter,
+            'trigger': args.trigger,
+            'swipe': args.swipe,
+            'profile': args.profile,
+            'overlay': not args.no_overlay,
+            'limit': args.limit,
+            'warmup': args.warmup,
+        },
+        'sources': results,
+        'total': {
+            'frames': frames,
+            'wall_s': wall,
+            'fps': frames / wall if wall > 0 else 0.0,
+            'cpu_ms_per_frame': cpu * 1000 / frames if frames else 0.0,
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'startup': startup.summary(),
+    }
+
+    total = report['total']
+    rss = report['peak_rss_mb']
+    print(f"\nTotal: {total['frames']} frames, {total['fps']:.1f} fps, "
+          f"{total['cpu_ms_per_frame']:.2f} ms CPU/frame"
+          + (f", peak RSS {rss:.0f} MB" if rss is not None else ""))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    exit(main())
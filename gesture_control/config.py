@@ -12,11 +12,37 @@ MAX_NUM_HANDS = 2              # 支持双手检测（拍手手势需要）
 MIN_DETECTION_CONFIDENCE = 0.7
 MIN_TRACKING_CONFIDENCE = 0.7
 CLAP_DISTANCE_THRESHOLD = 0.2  # 拍手手势：双手距离阈值
+PRIMARY_HAND = 'Right'         # 两只手都在时主手势取哪只手（'Left' / 'Right'）
+LIVE_STREAM = False            # True: LIVE_STREAM 异步识别（推理与采集/绘制并行）
+INFERENCE_PROCESS = False      # True: 识别放到子进程（画面走共享内存，崩溃自动重启）
+ROI_TRACKING = False           # True: 只识别上一帧手部周围的区域（高分辨率摄像头省 CPU）
+INFERENCE_GOVERNOR = False     # True: 待机/无手时低频识别，看到张开手掌立即全速
+IDLE_INFERENCE_HZ = 4          # 低频识别的频率（次/秒）
+MOTION_GATE = False            # True: 画面静止时跳过识别（帧差检测）
+MOTION_THRESHOLD = 4.0         # 帧差阈值：缩小灰度图的平均差值（0-255）
+SMOOTHING = 'evidence'         # 'evidence': 置信度加权 + 迟滞（自信的手势更快确认）；'vote': 3 帧多数投票
+SMOOTHING_ENTER = 0.6          # 证据达到多少确认新手势
+SMOOTHING_EXIT = 0.35          # 已确认手势的证据低于多少才放开
+SMOOTHING_WINDOWS = {}         # 单个手势的窗口帧数，如 {'POINTING_UP': 2}（默认 3 帧）
+LANDMARK_FILTER = 'one_euro'   # 关键点时域滤波：'one_euro' / 'kalman' / None（指尖坐标不再抖）
+ONE_EURO_MIN_CUTOFF = 1.0      # One Euro：静止时的截止频率（Hz），越小越稳
+ONE_EURO_BETA = 20.0           # One Euro：速度系数，越大移动时越跟手
+KALMAN_PROCESS_NOISE = 0.05    # 卡尔曼：加速度噪声，越大越跟手
+KALMAN_MEASUREMENT_NOISE = 1e-5  # 卡尔曼：关键点测量方差（归一化坐标²）
+CLASSIFIER_PATH = None         # 自定义分类器（train_classifier 训练）：设置后改用 HandLandmarker 引擎
+LANDMARKER_MODEL = 'hand_landmarker.task'  # 自定义分类器使用的 HandLandmarker 模型
 
 # ===== 动作配置 =====
 ACTION_COOLDOWN = 1.0          # 动作冷却时间(秒) - 防止连续误触
+SWIPE_GESTURES = True          # 挥手手势：左右挥快退/快进，上下挥调音量（core/swipe.py）
 SWIPE_THRESHOLD = 0.15         # 挥手检测阈值(相对于画面宽度)
 SWIPE_FRAMES = 8               # 挥手检测帧数
+SWIPE_COOLDOWN = 0.6           # 挥手之后多久不再触发（长挥只算一次，收手不触发反方向）
+TRIGGER = 'sprt'               # 'sprt': 识别分数足够可信就提前触发（保持时间是上限）；'hold': 只按保持时间
+TRIGGER_FALSE_RATE = 0.01      # SPRT 可接受的误触发率
+TRIGGER_MISS_RATE = 0.05       # SPRT 可接受的漏检率
+PROFILE = None                 # 手势绑定配置（gesture_control/profiles 下的名字或文件路径），None 用内置映射
+PROFILE_RELOAD_INTERVAL = 1.0  # 多久检查一次配置文件有没有修改（秒），改了自动重新加载
 PALM_HOLD_TIME = 2.0           # 张开手掌切换模式的停留时间
 CLAP_HOLD_TIME = 0.3           # 拍手需要保持的时间（防误触）
 
@@ -34,6 +60,17 @@ VIDEO_SEEK_TIMES = 3           # 按键次数（10秒 x 3 = 30秒）
 WINDOW_NAME = "Gesture Control Hub"
 FONT_SCALE = 0.7
 FONT_THICKNESS = 2
+PREVIEW_FPS = 10               # 无界面模式下独立进程预览的帧率上限
+PREVIEW_SCALE = 0.5            # 预览画面缩放比例
+
+# ===== 性能指标 =====
+METRICS_INTERVAL = 10.0        # 指标导出周期（秒）
+
+# ===== 事件总线（core/events.py）=====
+EVENT_SOCKET = None            # Unix 域套接字路径，如 '/tmp/gesture_control.sock'；None 不开
+EVENT_WS_PORT = None           # 本机 WebSocket 端口（只监听 127.0.0.1），如 8765；None 不开
+EVENT_QUEUE_SIZE = 256         # 每个订阅者最多积攒的事件数，满了丢最老的
+EVENT_LANDMARKS = True         # 是否发布关键点事件（每帧每只手一条）
 
 # ===== 颜色定义 (BGR) =====
 COLOR_GREEN = (0, 255, 0)
@@ -7,12 +7,21 @@
 3. 可测试 - 所有动作逻辑独立，易于单元测试
 """
 
-import pyautogui
 from .gestures import GestureType
+from .lazy import lazy_import
+
+pyautogui = lazy_import('pyautogui')   # 第一次按键时才连接显示服务器
 
 
 class GestureAction:
-    """手势动作基类 - 统一接口"""
+    """
+    手势动作基类 - 统一接口
+
+    设置了 dispatcher（ActionDispatcher）时按键/滚动交给后台线程执行，
+    否则直接调用 pyautogui
+    """
+
+    dispatcher = None
 
     def execute(self, hold_time: float, state_machine, points: dict) -> str:
         """
@@ -28,6 +37,26 @@ class GestureAction:
         """
         raise NotImplementedError
 
+    def _press(self, key, count: int = 1):
+        """按键 count 次；key 也可以是可调用对象"""
+        if callable(key):
+            if self.dispatcher is not None:
+                self.dispatcher.call(key)
+            else:
+                key()
+        elif self.dispatcher is not None:
+            self.dispatcher.press(key, count)
+        else:
+            for _ in range(count):
+                pyautogui.press(key)
+
+    def _scroll(self, amount: int):
+        """滚动"""
+        if self.dispatcher is not None:
+            self.dispatcher.scroll(amount)
+        else:
+            pyautogui.scroll(amount)
+
 
 class TimedAction(GestureAction):
     """
@@ -38,26 +67,42 @@ class TimedAction(GestureAction):
             (0.5, 'space', 'Play/Pause'),
             (3.0, 'f', 'Fullscreen'),
         ])
+
+    传入 trigger（core/trigger.py 的 SPRTTrigger）时，识别分数足够可信就提前执行第一档，
+    第一档的时间阈值变成上限；后面几档是有意的长按，仍按时间。
+    points['replay'] 为 True 的帧是重放的上一次结果，不算新的证据。
     """
 
-    def __init__(self, thresholds: list):
+    def __init__(self, thresholds: list, dispatcher=None, trigger=None):
         """
         Args:
             thresholds: [(时间阈值, 按键, 描述), ...]
                        按键可以是字符串或可调用对象
+            dispatcher: 可选的 ActionDispatcher
+            trigger: 可选的证据触发器，读 points['scores']
         """
+        self.dispatcher = dispatcher
         self.thresholds = sorted(thresholds, key=lambda x: x[0])  # 按时间排序
+        self.trigger = trigger
+        self._last_hold_time = 0.0
 
     def execute(self, hold_time, state_machine, points):
-        # 检查是否达到某个时间阈值
-        for threshold, key, description in self.thresholds:
+        if self.trigger is not None:
+            # 保持时间变短说明是新的一段手势：不沿用上一段的证据
+            if hold_time < self._last_hold_time:
+                self.trigger.reset()
+            self._last_hold_time = hold_time
+            if not (points and points.get('replay')):
+                self.trigger.update(points.get('scores') if points else None)
+            if self.trigger.accepted(state_machine.current_gesture):
+                hold_time = max(hold_time, self.thresholds[0][0])
+
+        # 从最高档往下找已达到的阈值：前面几档执行过也不会挡住后面的
+        for threshold, key, description in reversed(self.thresholds):
             if hold_time >= threshold:
                 if state_machine.should_execute(threshold):
                     # 执行动作
-                    if callable(key):
-                        key()
-                    else:
-                        pyautogui.press(key)
+                    self._press(key)
                     return f"✓ {description}"
                 else:
                     # 已执行过，显示完成状态
@@ -76,14 +121,17 @@ class OnReleaseAction(GestureAction):
     处理 "手势保持一段时间后松开" 的场景
     """
 
-    def __init__(self, min_time: float, max_time: float, key, description: str):
+    def __init__(self, min_time: float, max_time: float, key, description: str,
+                 dispatcher=None):
         """
         Args:
             min_time: 最短保持时间（秒）
             max_time: 最长保持时间（秒），超过此时间不触发
             key: 按键或可调用对象
             description: 动作描述
+            dispatcher: 可选的 ActionDispatcher
         """
+        self.dispatcher = dispatcher
         self.min_time = min_time
         self.max_time = max_time
         self.key = key
@@ -98,10 +146,7 @@ class OnReleaseAction(GestureAction):
         if self._last_gesture != GestureType.NONE and current_gesture == GestureType.NONE:
             # 检查保持时间是否在有效范围内
             if self.min_time <= self._last_hold_time < self.max_time:
-                if callable(self.key):
-                    self.key()
-                else:
-                    pyautogui.press(self.key)
+                self._press(self.key)
                 self._last_hold_time = 0.0
                 return f"✓ {self.description}"
 
@@ -119,11 +164,13 @@ class PositionAction(GestureAction):
     好品味：用简单的线性映射替代复杂的 if-else
     """
 
-    def __init__(self, frame_height: int):
+    def __init__(self, frame_height: int, dispatcher=None):
         """
         Args:
             frame_height: 画面高度
+            dispatcher: 可选的 ActionDispatcher
         """
+        self.dispatcher = dispatcher
         self.frame_height = frame_height
         self.center_y = frame_height // 2
         self.dead_zone = frame_height // 6
@@ -143,7 +190,7 @@ class PositionAction(GestureAction):
         scroll_speed = max(-10, min(10, scroll_speed))
 
         if scroll_speed != 0:
-            pyautogui.scroll(scroll_speed)
+            self._scroll(scroll_speed)
             direction = "Up" if scroll_speed > 0 else "Down"
             return f"Scroll {direction} ({abs(scroll_speed)})"
 
@@ -158,14 +205,17 @@ class RepeatKeyAction(GestureAction):
         RepeatKeyAction(0.5, 'left', 4, 'Rewind 20s')
     """
 
-    def __init__(self, hold_time: float, key: str, count: int, description: str):
+    def __init__(self, hold_time: float, key: str, count: int, description: str,
+                 dispatcher=None):
         """
         Args:
             hold_time: 触发所需保持时间（秒）
             key: 按键
             count: 重复次数
             description: 动作描述
+            dispatcher: 可选的 ActionDispatcher（连按会合并成一次调用）
         """
+        self.dispatcher = dispatcher
         self.hold_time = hold_time
         self.key = key
         self.count = count
@@ -174,8 +224,7 @@ class RepeatKeyAction(GestureAction):
     def execute(self, hold_time, state_machine, points):
         if hold_time >= self.hold_time:
             if state_machine.should_execute(self.hold_time):
-                for _ in range(self.count):
-                    pyautogui.press(self.key)
+                self._press(self.key, self.count)
                 return f"✓ {self.description}"
             else:
                 return f"✓ {self.description}"
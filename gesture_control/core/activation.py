@@ -5,7 +5,7 @@
 手势计时和动作触发由 GestureStateMachine 和 Actions 处理
 """
 
-import time
+from .clock import MONOTONIC
 from ..core.gestures import GestureType
 
 
@@ -19,7 +19,12 @@ class ActivationManager:
     ACTIVATION_TIME = 1.0      # 张开手掌激活所需时间（1秒）
     DEACTIVATION_TIME = 3.0    # 手离开后自动退出时间
 
-    def __init__(self):
+    def __init__(self, clock=None):
+        """
+        Args:
+            clock: 时钟（core/clock.py），默认单调时钟
+        """
+        self.clock = clock if clock is not None else MONOTONIC
         self.is_activated = False
         self.palm_start_time = None
         self.hand_lost_time = None
@@ -36,7 +41,7 @@ class ActivationManager:
         Returns:
             dict: 激活状态信息
         """
-        current_time = time.time()
+        current_time = self.clock()
         is_open_palm = gesture == GestureType.OPEN_PALM
 
         result = {
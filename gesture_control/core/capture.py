@@ -0,0 +1,139 @@
+"""
+摄像头采集线程 - 只保留最新一帧
+
+单一职责：在独立线程里不停 read()，让驱动缓冲区永远是空的
+识别循环拿到的永远是最新画面，处理不过来的旧帧直接丢弃（并计数）
+"""
+
+import threading
+import time
+
+
+class CapturedFrame:
+    """一帧画面 + 采集时间戳"""
+
+    __slots__ = ('image', 'timestamp', 'index')
+
+    def __init__(self, image, timestamp: float, index: int):
+        self.image = image          # BGR 图像 (numpy 数组)
+        self.timestamp = timestamp  # 采集时刻，time.monotonic() 秒
+        self.index = index          # 采集序号，从 1 开始
+
+    @property
+    def timestamp_ms(self) -> int:
+        """毫秒时间戳（MediaPipe 需要整数毫秒）"""
+        return int(self.timestamp * 1000)
+
+
+class ThreadedCapture:
+    """
+    后台采集线程 + 单槽 "最新帧优先" 缓冲
+
+    用法：
+        capture = ThreadedCapture(cv2.VideoCapture(0)).start()
+        frame = capture.read()   # 阻塞直到有比上一次更新的帧
+        capture.stop()
+
+    好品味：缓冲区只有一个槽位，新帧直接覆盖旧帧，
+    不需要队列、不需要判断队列满不满
+    """
+
+    STOP_TIMEOUT = 1.0   # stop() 等采集线程退出的时间（秒）
+
+    def __init__(self, cap, clock=time.monotonic):
+        """
+        Args:
+            cap: 已打开的 cv2.VideoCapture（或任何有 read()/release() 的对象）
+            clock: 时间戳来源，默认 time.monotonic
+        """
+        self.cap = cap
+        self.clock = clock
+        self.captured_frames = 0   # 采集到的总帧数
+        self.dropped_frames = 0    # 还没被取走就被覆盖的帧数
+        self._latest = None
+        self._consumed = True
+        self._running = False
+        self._finished = False     # 摄像头读失败（拔掉、视频结束）
+        self._release_on_exit = False   # stop() 没等到线程退出：由线程退出时释放摄像头
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """启动采集线程，返回自身方便链式调用"""
+        if self._thread is not None:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='capture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            ret, image = self.cap.read()
+            timestamp = self.clock()
+            if not ret:
+                break
+
+            with self._cond:
+                self.captured_frames += 1
+                if not self._consumed:
+                    self.dropped_frames += 1
+                self._latest = CapturedFrame(image, timestamp, self.captured_frames)
+                self._consumed = False
+                self._cond.notify()
+
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+            release = self._release_on_exit
+        if release:
+            self.cap.release()
+
+    def read(self, timeout: float = 1.0):
+        """
+        取最新一帧（每帧只返回一次）
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            CapturedFrame，或 None（超时 / 采集已结束）
+        """
+        with self._cond:
+            if self._consumed and not self._finished:
+                self._cond.wait_for(lambda: not self._consumed or self._finished, timeout)
+            if self._consumed:
+                return None
+            self._consumed = True
+            return self._latest
+
+    @property
+    def finished(self) -> bool:
+        """采集是否已结束（且最后一帧已被取走）"""
+        with self._cond:
+            return self._finished and self._consumed
+
+    def get_stats(self) -> dict:
+        """返回采集统计"""
+        with self._cond:
+            return {
+                'captured': self.captured_frames,
+                'dropped': self.dropped_frames,
+            }
+
+    def stop(self):
+        """
+        停止采集线程并释放摄像头
+
+        线程还卡在 cap.read() 里（驱动没响应）时不能在这里 release()，
+        很多后端在读的同时释放会崩溃；交给线程退出时自己释放。
+        """
+        self._running = False
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.STOP_TIMEOUT)
+        with self._cond:
+            if thread is not None and not self._finished:
+                self._release_on_exit = True
+                return
+        self.cap.release()
@@ -0,0 +1,259 @@
+"""
+自定义手势分类 - HandLandmarker 关键点 + NumPy 最近质心分类器
+
+官方 GestureRecognizer 只有 7 个固定类别，而且每帧都要跑手势分类头。
+这里换成 HandLandmarker（只出关键点）+ 一个很小的分类器：
+    世界坐标关键点 → 以手腕为原点、按手掌大小缩放（左手镜像成右手）→ 63 维向量
+    → 与每个类别的质心比距离 → 类别 + 置信度
+
+新增手势不需要重新训练 TFLite 模型：录一段会话（main.py --record），
+用 gesture_control.train_classifier 重新算一遍质心即可（几毫秒）。
+类别名必须是 GestureType 里的名字（动作和绑定按 GestureType 查），全新的手势先在枚举里加一项。
+
+用法：
+    classifier = CentroidClassifier.load('gestures.npz')
+    recognizer = LandmarkRecognizer(classifier, model_path='hand_landmarker.task')
+    gesture, points = recognizer.recognize(frame, w, h)   # 与 GestureRecognizer 相同
+"""
+
+import numpy as np
+
+from .features import MCP, MIDDLE, NUM_LANDMARKS, WRIST, landmarks_to_array
+from .gestures import GESTURE_MAP, GestureRecognizer, GestureType
+from .lazy import lazy_import
+from .recording import Category, ReplayResult
+
+vision = lazy_import('mediapipe.tasks.python.vision')
+
+
+CLASSIFIER_VERSION = 1
+
+# 枚举名 → MediaPipe 官方名称：官方有的类别用官方名称输出，录制文件可以混用两种引擎
+_CANNED_NAMES = {gesture.name: name for name, gesture in GESTURE_MAP.items()}
+_CANNED_NAMES['NONE'] = 'None'
+
+
+def gesture_label(name: str) -> str:
+    """
+    训练 / 分类器的类别名 → GestureType 名（MediaPipe 官方名称也可以，'None' 是背景类）
+
+    分类器的输出按 GestureType 查动作，不认识的名字只会被当成 NONE，
+    所以这里直接抛 ValueError，不让它悄悄变成负样本。
+    """
+    if name == 'None':
+        return 'NONE'
+    gesture = GESTURE_MAP.get(name) or GestureType.__members__.get(name)
+    if gesture is None:
+        raise ValueError(f"Unknown gesture label: {name!r} "
+                         f"(use a GestureType name: {', '.join(GestureType.__members__)})")
+    return gesture.name
+
+
+def hand_vector(world_landmarks, is_left: bool = False) -> np.ndarray:
+    """
+    一只手的分类特征：(63,) float32
+
+    世界坐标本身与手在画面中的位置、ROI 裁剪无关；
+    再以手腕为原点、除以手腕到中指根的距离，消掉手的大小差异。
+
+    Args:
+        world_landmarks: 世界坐标关键点（列表或 (21, 3) 数组）
+        is_left: 左手时把 x 镜像，左右手共用一套质心
+    """
+    points = np.array(world_landmarks if isinstance(world_landmarks, np.ndarray)
+                      else landmarks_to_array(world_landmarks), dtype=np.float32)
+    points -= points[WRIST]
+    scale = float(np.linalg.norm(points[MCP[MIDDLE]]))
+    points /= max(scale, 1e-6)
+    if is_left:
+        points[:, 0] = -points[:, 0]
+    return points.reshape(-1)
+
+
+class CentroidClassifier:
+    """
+    最近质心分类器（各类别共享一个方差的高斯模型）
+
+    置信度 = softmax(-d² / 2σ²)；离所有质心都太远（超过该类训练样本的半径）时给出 'NONE'。
+    """
+
+    REJECT_LABEL = 'NONE'
+
+    def __init__(self, labels, centroids: np.ndarray, radii: np.ndarray, sigma: float):
+        self.labels = tuple(labels)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.radii = np.asarray(radii, dtype=np.float32)
+        self.sigma = float(sigma)
+        self._squared_norms = (self.centroids ** 2).sum(axis=1)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, labels, radius_percentile: float = 95.0,
+            radius_margin: float = 1.5):
+        """
+        训练：每个类别取均值作为质心
+
+        Args:
+            vectors: (N, 63) hand_vector 的结果
+            labels: 长度 N 的类别名
+            radius_percentile / radius_margin: 拒识半径 = 训练样本到质心距离的该百分位 × margin
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        labels = np.asarray(labels)
+        names = sorted(set(labels.tolist()))
+        if not names:
+            raise ValueError("No training samples")
+
+        centroids, radii, residuals = [], [], []
+        for name in names:
+            members = vectors[labels == name]
+            centroid = members.mean(axis=0)
+            distances = np.linalg.norm(members - centroid, axis=1)
+            centroids.append(centroid)
+            radii.append(np.percentile(distances, radius_percentile) * radius_margin)
+            residuals.append(distances ** 2)
+
+        # 共享方差：所有样本到各自质心的均方距离（按维度平均）
+        sigma = float(np.sqrt(np.concatenate(residuals).mean() / vectors.shape[1]))
+        radii = np.maximum(radii, 1e-3)
+        return cls(names, np.stack(centroids), radii, max(sigma, 1e-3))
+
+    def predict(self, vector: np.ndarray):
+        """
+        Returns:
+            (label, score, scores): 最可能的类别、置信度、每个类别的置信度 (C,)
+        """
+        # |x - c|² = |x|² - 2x·c + |c|²，一次矩阵乘法算完全部距离
+        squared = float(vector @ vector) - 2 * (self.centroids @ vector) + self._squared_norms
+        squared = np.maximum(squared, 0.0)
+        logits = -squared / (2 * self.sigma ** 2 * vector.shape[0])
+        scores = np.exp(logits - logits.max())
+        scores /= scores.sum()
+
+        best = int(np.argmax(scores))
+        if squared[best] > self.radii[best] ** 2:
+            return self.REJECT_LABEL, float(scores[best]), scores
+        return self.labels[best], float(scores[best]), scores
+
+    def save(self, path: str):
+        """写成 .npz"""
+        np.savez(path, version=np.array(CLASSIFIER_VERSION), labels=np.array(self.labels),
+                 centroids=self.centroids, radii=self.radii, sigma=np.array(self.sigma))
+
+    @classmethod
+    def load(cls, path: str):
+        """读取 save() 写出的文件"""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != CLASSIFIER_VERSION:
+                raise ValueError(f"Unsupported classifier version: {version}")
+            return cls([str(n) for n in data['labels']], data['centroids'], data['radii'],
+                       float(data['sigma']))
+
+
+def samples_from_recording(recording, label: str = None, min_score: float = 0.5):
+    """
+    从录制文件取训练样本（每帧第一只手）
+
+    Args:
+        recording: load_recording() 的结果
+        label: 整段录制都标成这个类别（一段录制只做一个手势）；
+               None 时用录制里官方识别器的结果做标签（分数不足 min_score 的帧跳过）
+
+    Returns:
+        (vectors (N, 63), labels (N,))，标签是 GestureType 名
+
+    Raises:
+        ValueError: 标签（或录制里的类别名）不是 GestureType 里的手势（gesture_label）
+    """
+    hands = recording.num_hands > 0
+    if label is None:
+        top = recording.scores[:, 0].argmax(axis=1)
+        top_score = recording.scores[:, 0].max(axis=1)
+        hands &= top_score >= min_score
+        names = np.array([gesture_label(c) for c in recording.categories])
+        labels = names[top[hands]]
+    else:
+        labels = np.full(int(hands.sum()), gesture_label(label))
+
+    world = recording.world_landmarks[hands, 0].astype(np.float32)
+    is_left = recording.handedness[hands, 0] == 0
+    # 批量版 hand_vector
+    world -= world[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(world[:, MCP[MIDDLE]], axis=1)
+    world /= np.maximum(scale, 1e-6)[:, None, None]
+    world[is_left, :, 0] *= -1
+    return world.reshape(len(world), NUM_LANDMARKS * 3), labels
+
+
+class LandmarkRecognizer(GestureRecognizer):
+    """
+    HandLandmarker + CentroidClassifier 识别引擎
+
+    接口与 GestureRecognizer 完全相同（recognize / recognize_async / on_result / ROI / 录制），
+    只是把手势分类头换成了 NumPy 分类器。
+    """
+
+    MODEL_URL = ("https://storage.googleapis.com/mediapipe-models/"
+                 "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task")
+
+    def __init__(self, classifier: CentroidClassifier, model_path='hand_landmarker.task',
+                 **kwargs):
+        """
+        Args:
+            classifier: 训练好的 CentroidClassifier
+            model_path: HandLandmarker 的 .task 模型
+            其他参数同 GestureRecognizer
+
+        Raises:
+            ValueError: 分类器里有不是 GestureType 的类别（识别出来也触发不了任何动作）
+        """
+        for label in classifier.labels:
+            gesture_label(label)
+        self.classifier = classifier
+        super().__init__(model_path=model_path, **kwargs)
+
+    def _create_task(self, base_options, running_mode):
+        options = vision.HandLandmarkerOptions(
+            base_options=base_options,
+            running_mode=running_mode,
+            num_hands=self.num_hands,
+            min_hand_detection_confidence=0.5,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_live_result if self.live_stream else None,
+        )
+        return vision.HandLandmarker.create_from_options(options)
+
+    def _run_task(self, mp_image, timestamp_ms):
+        return self.recognizer.detect_for_video(mp_image, timestamp_ms)
+
+    def _run_task_async(self, mp_image, timestamp_ms):
+        self.recognizer.detect_async(mp_image, timestamp_ms)
+
+    def process_result(self, result, frame_width, frame_height, region=None, timestamp_ms=None):
+        """先给每只手分类，补上 gestures 字段，再走 GestureRecognizer 的平滑"""
+        t = self.metrics.start()
+        world = getattr(result, 'hand_world_landmarks', None) or []
+        handedness = getattr(result, 'handedness', None) or []
+        gestures = []
+        for hand, landmarks in enumerate(world):
+            is_left = (hand < len(handedness) and bool(handedness[hand])
+                       and handedness[hand][0].category_name == 'Left')
+            label, score, scores = self.classifier.predict(hand_vector(landmarks, is_left))
+            # 第一个是结果（可能是拒识的 NONE），后面按分数给出其他类别（置信度加权平滑用）
+            categories = [Category(_CANNED_NAMES.get(label, label), score)]
+            for c in np.argsort(-scores, kind='stable'):
+                if self.classifier.labels[c] != label:
+                    name = self.classifier.labels[c]
+                    categories.append(Category(_CANNED_NAMES.get(name, name), float(scores[c])))
+            gestures.append(categories)
+        self.metrics.stop('classify', t)
+
+        result = ReplayResult(gestures, handedness, result.hand_landmarks, world)
+        return super().process_result(result, frame_width, frame_height, region, timestamp_ms)
+
+    @staticmethod
+    def output_names(classifier: CentroidClassifier) -> tuple:
+        """分类器可能输出的类别名（录制时传给 SessionRecorder）"""
+        labels = classifier.labels + (classifier.REJECT_LABEL,)
+        return tuple(_CANNED_NAMES.get(label, label) for label in labels)
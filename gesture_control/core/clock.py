@@ -0,0 +1,66 @@
+"""
+时钟 - 所有计时逻辑（保持时间、冷却、激活）统一从这里取时间
+
+时钟就是一个无参可调用对象，返回秒数（与 governor / capture 的 clock 参数一致）：
+    MonotonicClock   默认，单调时钟，不受系统改时间影响
+    FrameClock       跟随采集帧时间戳，保持/冷却与画面对齐
+    ManualClock      手动推进，用于测试和模拟（不需要 sleep）
+
+用法：
+    clock = FrameClock()
+    state_machine = GestureStateMachine(clock=clock)
+    clock.update(captured.timestamp_ms)    # 每帧一次
+    state_machine.update(gesture)
+"""
+
+import time
+
+
+class MonotonicClock:
+    """单调时钟（time.monotonic）"""
+
+    def __call__(self) -> float:
+        return time.monotonic()
+
+
+class ManualClock:
+    """手动推进的时钟"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        """向前推进 seconds 秒，返回新时间"""
+        self.now += seconds
+        return self.now
+
+    def set(self, seconds: float):
+        """直接设置当前时间"""
+        self.now = seconds
+
+
+class FrameClock:
+    """
+    帧时钟 - 当前时间 = 最近一帧的时间戳
+
+    时间戳倒退（比如换了视频源）时保持不动，保证单调。
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def update(self, timestamp_ms: int):
+        """每帧调用一次，传采集时间戳（毫秒）"""
+        seconds = timestamp_ms / 1000
+        if seconds > self.now:
+            self.now = seconds
+
+
+# 默认时钟：组件没有传 clock 时用它
+MONOTONIC = MonotonicClock()
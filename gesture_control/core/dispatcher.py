@@ -0,0 +1,155 @@
+"""
+动作派发器 - 在后台线程执行按键/滚动，不阻塞识别循环
+
+pyautogui 每次调用后默认 sleep PAUSE 秒（0.1s），
+"快进" 连按 4 次 right 就会让识别循环卡住半秒。
+派发器把动作放进队列，由工作线程执行，并把连续的相同按键合并成一次调用：
+    press('right') x 4  →  pyautogui.press('right', presses=4, interval=0)
+"""
+
+import queue
+import threading
+
+from .lazy import lazy_import, preload
+from .metrics import DISABLED
+
+pyautogui = lazy_import('pyautogui')   # 在工作线程里加载，不占启动时间
+
+
+# 队列里的命令类型
+PRESS = 'press'
+SCROLL = 'scroll'
+CALL = 'call'
+
+_STOP = object()
+
+
+class ActionDispatcher:
+    """
+    动作派发器 - 生产者只管投递，工作线程负责合并和执行
+
+    用法：
+        dispatcher = ActionDispatcher().start()
+        dispatcher.press('right', 4)
+        dispatcher.scroll(5)
+        dispatcher.stop()
+    """
+
+    def __init__(self, backend=None, metrics=None):
+        """
+        Args:
+            backend: 实际执行按键的对象（需要 press/scroll），默认 pyautogui
+            metrics: 可选的 Metrics，记录每次 backend 调用的耗时（action 阶段）
+        """
+        self.backend = backend if backend is not None else pyautogui
+        self.metrics = metrics if metrics is not None else DISABLED
+        self.submitted = 0   # 投递的命令数
+        self.executed = 0    # 实际调用 backend 的次数（合并后）
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """启动工作线程，返回自身方便链式调用"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dispatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    # ===== 生产者接口（识别循环调用，立即返回） =====
+
+    def press(self, key: str, count: int = 1):
+        """按键 count 次"""
+        self._submit((PRESS, key, count))
+
+    def scroll(self, amount: int):
+        """滚动（正 = 向上，负 = 向下）"""
+        self._submit((SCROLL, None, amount))
+
+    def call(self, func):
+        """在工作线程里执行任意可调用对象"""
+        self._submit((CALL, func, 0))
+
+    def _submit(self, command):
+        self.submitted += 1
+        self._queue.put(command)
+
+    # ===== 工作线程 =====
+
+    def _run(self):
+        try:
+            preload(self.backend)   # 第一个动作不用再等 import
+        except Exception as e:
+            print(f"Action error: {e}")
+        while True:
+            batch = [self._queue.get()]
+            # 把已经排队的命令一次取完，再统一合并
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            if _STOP in batch:
+                stop = True
+                batch = batch[:batch.index(_STOP)]
+
+            for command in coalesce(batch):
+                self._execute(command)
+
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+
+            if stop:
+                return
+
+    def _execute(self, command):
+        kind, target, amount = command
+        t = self.metrics.start()
+        try:
+            if kind == PRESS:
+                if amount == 1:
+                    self.backend.press(target)
+                else:
+                    self.backend.press(target, presses=amount, interval=0)
+            elif kind == SCROLL:
+                self.backend.scroll(amount)
+            elif kind == CALL:
+                target()
+            self.executed += 1
+            self.metrics.count('actions')
+        except Exception as e:
+            # 工作线程不能死：打印后继续处理后面的动作
+            print(f"Action error: {e}")
+        self.metrics.stop('action', t)
+
+    def flush(self):
+        """等待已投递的动作全部执行完（测试和退出时用）"""
+        self._queue.join()
+
+    def stop(self):
+        """执行完剩余动作后停止工作线程"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+def coalesce(commands: list) -> list:
+    """
+    合并相邻的同类命令
+
+    - 相同按键的 press：次数相加
+    - 相邻的 scroll：滚动量相加（抵消为 0 则丢弃）
+    - call 不合并，保持顺序
+    """
+    merged = []
+    for kind, target, amount in commands:
+        if merged and kind != CALL:
+            last_kind, last_target, last_amount = merged[-1]
+            if last_kind == kind and last_target == target:
+                merged[-1] = (kind, target, last_amount + amount)
+                continue
+        merged.append((kind, target, amount))
+
+    return [c for c in merged if c[0] != SCROLL or c[2] != 0]
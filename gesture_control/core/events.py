@@ -0,0 +1,416 @@
+"""
+手势事件总线 - 让本机其他程序订阅手势，不用抢键盘焦点
+
+识别循环（GestureController）把事件交给 EventBus.publish()，
+每个订阅者有自己的有界队列：满了丢最老的，慢的订阅者只会丢事件，永远不会卡住识别循环。
+每个订阅者一个发送线程，醒来时把队列里积攒的事件一次取完，合并成一次 send；
+另有一个读线程，订阅者断开（或发来 WebSocket close）时立即退订。
+
+传输：
+    UnixEventServer       Unix 域套接字，每行一个 JSON（JSON Lines）；
+                          路径上的套接字还有程序在监听时拒绝启动（不抢另一个实例的）
+    WebSocketEventServer  本机 WebSocket（只用标准库，浏览器可以直接连），
+                          每个文本帧是一批 JSON Lines；回应 ping 和 close
+
+消息是紧凑的 JSON，所有事件都有 e（类型）和 ts（毫秒，帧时钟），多路模式下还有 src：
+    {"e":"gesture","ts":1200,"g":"FIST"}                  确认的手势变化（NONE 表示手势结束）
+    {"e":"hold","ts":1233,"g":"FIST","hold":0.1,"p":0.33}  保持进度（p 到 1 触发）
+    {"e":"action","ts":1300,"action":"pause"}             执行的动作
+    {"e":"landmarks","ts":1300,"hand":"Right","pts":[x0,y0,...]}  21 个关键点（归一化，3 位小数）
+识别放在子进程里时（--inference-process、多路模式）结果不带关键点，没有 landmarks 事件。
+
+用法：
+    bus = EventBus()
+    server = UnixEventServer(bus, '/tmp/gesture_control.sock').start()
+    controller = GestureController(dispatcher, events=bus)
+    ...
+    server.stop()
+
+    $ socat - UNIX-CONNECT:/tmp/gesture_control.sock
+"""
+
+import base64
+import errno
+import hashlib
+import json
+import os
+import socket
+import stat
+import threading
+from collections import deque
+
+
+class Subscription:
+    """一个订阅者的有界队列（满了丢最老的）"""
+
+    def __init__(self, maxlen: int):
+        self._queue = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0   # 因为队列满被丢掉的事件数
+
+    def put(self, message: bytes):
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(message)
+            self._cond.notify()
+
+    def get_batch(self, timeout: float = None) -> list:
+        """等到有事件（或关闭 / 超时），一次取走全部积攒的事件"""
+        with self._cond:
+            if not self._queue and not self.closed:
+                self._cond.wait(timeout)
+            batch = list(self._queue)
+            self._queue.clear()
+            return batch
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class EventBus:
+    """
+    发布/订阅
+
+    publish() 在识别循环里调用：没有订阅者时直接返回，有订阅者时只编码一次，
+    再放进每个订阅者的队列（不做任何 I/O）。
+    """
+
+    def __init__(self, queue_size: int = 256):
+        """
+        Args:
+            queue_size: 每个订阅者最多积攒多少条事件
+        """
+        self.queue_size = queue_size
+        self.published = 0
+        self._closed_dropped = 0  # 已经退订的订阅者丢的
+        self._subscribers = ()   # 元组整体替换：publish 不用加锁
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """有没有订阅者（没有时调用方可以连事件都不构造）"""
+        return bool(self._subscribers)
+
+    @property
+    def dropped(self) -> int:
+        """所有订阅者（包括已经断开的）一共丢了多少条事件"""
+        return self._closed_dropped + sum(sub.dropped for sub in self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription(self.queue_size)
+        with self._lock:
+            self._subscribers = self._subscribers + (sub,)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        sub.close()
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+                self._closed_dropped += sub.dropped
+
+    def publish(self, kind: str, timestamp_ms: int, **fields):
+        """发布一条事件：{"e": kind, "ts": timestamp_ms, **fields}"""
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        message = json.dumps(dict(e=kind, ts=timestamp_ms, **fields),
+                             separators=(',', ':')).encode() + b'\n'
+        for sub in subscribers:
+            sub.put(message)
+        self.published += 1
+
+
+class _Rewound:
+    """recv 先交出握手时多读到的字节，再读套接字；其他方法转给原连接"""
+
+    def __init__(self, conn, pending: bytes):
+        self._conn = conn
+        self._pending = pending
+
+    def recv(self, n: int) -> bytes:
+        if self._pending:
+            chunk, self._pending = self._pending[:n], self._pending[n:]
+            return chunk
+        return self._conn.recv(n)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _EventServer:
+    """监听线程 + 每个连接一个发送线程；子类决定怎么监听、握手和分帧"""
+
+    ACCEPT_TIMEOUT = 0.5      # 监听线程多久检查一次是否要停止（秒）
+    HANDSHAKE_TIMEOUT = 5.0   # 握手时每次读最多等多久（秒），不发完请求的客户端不会一直占着线程
+
+    def __init__(self, bus: EventBus):
+        self.bus = bus
+        self._subs = {}           # 这个服务器上的订阅 → 连接
+        self._conns = set()       # 全部连接（包括还在握手的），stop() 时都要断开
+        self._sock = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    @property
+    def clients(self) -> int:
+        """当前连接数"""
+        return len(self._subs)
+
+    def _listen(self) -> socket.socket:
+        raise NotImplementedError
+
+    def _handshake(self, conn):
+        """
+        连接建立后、开始推送前的握手
+
+        Returns:
+            握手之后多读到的字节（交给读线程），None 表示放弃这个连接
+        """
+        return b''
+
+    def _start_reader(self, conn, sub: Subscription, lock: threading.Lock):
+        """起读线程：客户端断开时退订，发送线程随之退出（读线程往 conn 写要拿 lock）"""
+        threading.Thread(target=self._read, args=(conn, sub, lock), name='event-client-reader',
+                         daemon=True).start()
+
+    def _read(self, conn, sub, lock):
+        """默认：客户端发来的数据都丢掉，读到 EOF 就退订"""
+        try:
+            while conn.recv(4096):
+                pass
+        except OSError:
+            pass
+        finally:
+            self.bus.unsubscribe(sub)
+
+    def _encode(self, batch: list) -> bytes:
+        return b''.join(batch)
+
+    def start(self):
+        """开始监听，返回自身方便链式调用"""
+        if self._thread is None:
+            self._sock = self._listen()
+            self._sock.settimeout(self.ACCEPT_TIMEOUT)
+            self._thread = threading.Thread(target=self._accept_loop, name='event-server',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _accept_loop(self):
+        while not self._stopping.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), name='event-client',
+                             daemon=True).start()
+
+    def _serve(self, conn):
+        self._conns.add(conn)
+        sub = None
+        try:
+            if self._stopping.is_set():   # stop() 已经断开过全部连接，这个没赶上
+                return
+            conn.settimeout(self.HANDSHAKE_TIMEOUT)
+            pending = self._handshake(conn)
+            if pending is None:
+                return
+            conn.settimeout(None)
+            sub = self.bus.subscribe()
+            self._subs[sub] = conn
+            lock = threading.Lock()
+            self._start_reader(_Rewound(conn, pending), sub, lock)
+            while not self._stopping.is_set():
+                batch = sub.get_batch(timeout=self.ACCEPT_TIMEOUT)
+                if sub.closed:
+                    return
+                if batch:
+                    # 只有这个线程会阻塞在慢订阅者上；识别循环照常往队列里放（丢最老的）
+                    with lock:
+                        conn.sendall(self._encode(batch))
+        except OSError:
+            pass   # 订阅者断开（握手超时也是 OSError）
+        finally:
+            if sub is not None:
+                self.bus.unsubscribe(sub)
+                self._subs.pop(sub, None)
+            self._conns.discard(conn)
+            conn.close()
+
+    def stop(self):
+        """停止监听并断开全部连接"""
+        self._stopping.set()
+        if self._sock is not None:
+            self._sock.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for sub in list(self._subs):
+            sub.close()
+        for conn in list(self._conns):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)   # 卡在 sendall 的发送线程也会醒来退出
+            except OSError:
+                pass
+
+
+class UnixEventServer(_EventServer):
+    """Unix 域套接字：每行一个 JSON"""
+
+    def __init__(self, bus: EventBus, path: str):
+        super().__init__(bus)
+        self.path = path
+
+    def _listen(self):
+        if os.path.exists(self.path):
+            self._remove_stale()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        sock.listen()
+        return sock
+
+    def _remove_stale(self):
+        """删掉上次没正常退出留下的套接字；还有程序在监听，或者不是套接字时报错"""
+        if not stat.S_ISSOCK(os.stat(self.path).st_mode):
+            raise OSError(errno.EEXIST, f"Not a socket: {self.path}")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)   # 没人监听
+        else:
+            raise OSError(errno.EADDRINUSE, f"Event socket already in use: {self.path}")
+        finally:
+            probe.close()
+
+    def stop(self):
+        super().stop()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+def websocket_accept(key: str) -> str:
+    """Sec-WebSocket-Accept（RFC 6455）"""
+    return base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+
+
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def websocket_frame(payload: bytes, opcode: int = WS_TEXT) -> bytes:
+    """服务端 → 客户端的一帧（FIN，不加掩码），默认文本帧"""
+    n = len(payload)
+    first = 0x80 | opcode
+    if n < 126:
+        header = bytes((first, n))
+    elif n < 1 << 16:
+        header = bytes((first, 126)) + n.to_bytes(2, 'big')
+    else:
+        header = bytes((first, 127)) + n.to_bytes(8, 'big')
+    return header + payload
+
+
+def _recv_exact(conn, n: int) -> bytes:
+    data = b''
+    while len(data) < n:
+        chunk = conn.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def read_websocket_frame(conn, max_size: int = 1 << 16):
+    """
+    读客户端发来的一帧（客户端的帧都带掩码），返回 (opcode, payload)
+
+    Raises:
+        ConnectionError: 连接断开或帧超过 max_size
+    """
+    first, second = _recv_exact(conn, 2)
+    n = second & 0x7F
+    if n == 126:
+        n = int.from_bytes(_recv_exact(conn, 2), 'big')
+    elif n == 127:
+        n = int.from_bytes(_recv_exact(conn, 8), 'big')
+    if n > max_size:
+        raise ConnectionError(f"frame too large: {n} bytes")
+    mask = _recv_exact(conn, 4) if second & 0x80 else None
+    payload = _recv_exact(conn, n)
+    if mask is not None:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class WebSocketEventServer(_EventServer):
+    """
+    本机 WebSocket：每个文本帧是一批 JSON Lines
+
+    只推送事件；客户端的 ping 回 pong，close 原样回一个 close 后断开，
+    其他帧丢掉。默认只监听 127.0.0.1。
+        const ws = new WebSocket('ws://localhost:8765');
+        ws.onmessage = m => m.data.trim().split('\\n').map(JSON.parse).forEach(handle);
+    """
+
+    MAX_REQUEST = 8192
+
+    def __init__(self, bus: EventBus, port: int, host: str = '127.0.0.1'):
+        super().__init__(bus)
+        self.host = host
+        self.port = port
+
+    def _listen(self):
+        sock = socket.create_server((self.host, self.port))
+        self.port = sock.getsockname()[1]   # port=0 时拿到实际端口
+        return sock
+
+    def _handshake(self, conn):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = conn.recv(1024)
+            if not chunk or len(request) > self.MAX_REQUEST:
+                return None
+            request += chunk
+        # 客户端可能紧接着请求就发了帧（同一次 recv 读到），留给读线程
+        head, _, pending = request.partition(b'\r\n\r\n')
+        key = None
+        for line in head.decode('latin-1').split('\r\n')[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'sec-websocket-key':
+                key = value.strip()
+        if key is None:
+            conn.sendall(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            return None
+        conn.sendall(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                     b'Connection: Upgrade\r\nSec-WebSocket-Accept: '
+                     + websocket_accept(key).encode() + b'\r\n\r\n')
+        return pending
+
+    def _read(self, conn, sub, lock):
+        try:
+            while not sub.closed:
+                opcode, payload = read_websocket_frame(conn, self.MAX_REQUEST)
+                if opcode == WS_PING:
+                    with lock:
+                        conn.sendall(websocket_frame(payload, WS_PONG))
+                elif opcode == WS_CLOSE:
+                    with lock:
+                        conn.sendall(websocket_frame(payload[:2], WS_CLOSE))   # 回同一个状态码
+                    return
+        except OSError:
+            pass   # 断开（ConnectionError 也是 OSError）
+        finally:
+            self.bus.unsubscribe(sub)   # 发送线程醒来后关闭连接
+
+    def _encode(self, batch: list) -> bytes:
+        return websocket_frame(b''.join(batch))
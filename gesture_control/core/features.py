@@ -0,0 +1,242 @@
+"""
+关键点特征 - 每帧把 21 个关键点转成一次 NumPy 数组，所有特征一次算完
+
+MediaPipe 手部关键点编号：
+    0 手腕
+    拇指 1-4，食指 5-8，中指 9-12，无名指 13-16，小指 17-20
+    （每根手指依次是 根部 MCP、PIP、DIP、指尖）
+
+HandFeatures 里的每个特征都是 5 根手指一起算的数组，
+新的手势判断直接读现成的字段，不需要再逐点计算。
+"""
+
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+WRIST = 0
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+
+# 每根手指的四个关节编号，形状 (5,)
+MCP = np.array([1, 5, 9, 13, 17])
+PIP = MCP + 1
+DIP = MCP + 2
+TIP = MCP + 3
+
+# 手腕 + 五个指根：手掌中心取它们的平均
+_PALM = np.array([WRIST, *MCP])
+
+# 手腕 + 五个指尖：动态手势（挥手）跟踪这几个点的轨迹
+TRACKED = np.array([WRIST, *TIP])
+
+# 三段指骨 MCP→PIP、PIP→DIP、DIP→TIP 的起止关节，形状 (3, 5)
+_BONE_START = np.stack([MCP, PIP, DIP])
+_BONE_END = np.stack([PIP, DIP, TIP])
+_TIP_MCP = np.stack([TIP, MCP])
+_CROSS_A = np.array([1, 2, 0])   # 叉积 a × b = a[1,2,0] * b[2,0,1] - a[2,0,1] * b[1,2,0]
+_CROSS_B = np.array([2, 0, 1])
+
+
+def landmarks_to_array(landmarks, out: np.ndarray = None) -> np.ndarray:
+    """
+    关键点列表（有 x/y/z 属性的对象）→ (21, 3) float64 数组
+
+    用 float64：与逐点的 Python 浮点运算结果一致（像素坐标取整不会差 1）
+
+    Args:
+        out: 可选的复用缓冲区
+    """
+    coords = [(lm.x, lm.y, lm.z) for lm in landmarks]
+    if out is None:
+        return np.array(coords, dtype=np.float64)
+    out[:] = coords
+    return out
+
+
+class HandFeatures:
+    """
+    一只手的全部特征（构造时一次算完）
+
+    坐标：
+        points        (21, 3) 归一化图像坐标（x, y ∈ [0, 1]，y 向下）
+        world         (21, 3) 世界坐标（米，原点在手掌中心），没有时为 None
+    距离（归一化图像坐标的 x-y 平面，与原来的 _distance 一致）：
+        tip_distance  (5,) 指尖到手腕
+        base_distance (5,) 指根到手腕
+        extension     (5,) tip_distance / base_distance，> 1 表示伸出
+        palm_center   (x, y) 手腕和五个指根的平均位置（归一化图像坐标）
+        palm_size     手腕到中指根的距离，用来把其他距离归一化
+        pinch         拇指尖到食指尖的距离 / palm_size
+    弯曲：
+        curl          (5,) PIP、DIP 两个关节的平均弯曲角 / π，0 = 伸直，1 = 完全折回
+                      （有世界坐标时用世界坐标，不受透视影响）
+    朝向：
+        orientation   手腕 → 中指根 在图像平面的角度（弧度，0 = 向右，π/2 = 向上）
+        palm_normal   (3,) 手掌法向量（单位向量）
+    """
+
+    __slots__ = ('points', 'world', 'tip_distance', 'base_distance', 'extension',
+                 'palm_center', 'palm_size', 'pinch', 'curl', 'orientation', 'palm_normal')
+
+    def __init__(self, points: np.ndarray, world: np.ndarray = None):
+        batch = _compute(points[None], None if world is None else world[None])
+        self._assign(batch, 0)
+
+    def _assign(self, batch: dict, i: int):
+        """从批量计算结果里取第 i 只手"""
+        self.points = batch['points'][i]
+        self.world = batch['world'][i] if batch['world'] is not None else None
+        self.tip_distance = batch['tip_distance'][i]
+        self.base_distance = batch['base_distance'][i]
+        self.extension = batch['extension'][i]
+        self.palm_center = batch['palm_center'][i]
+        self.palm_size = batch['palm_size'][i]
+        self.pinch = batch['pinch'][i]
+        self.curl = batch['curl'][i]
+        self.orientation = batch['orientation'][i]
+        self.palm_normal = batch['palm_normal'][i]
+
+    # ===== 由上面的特征直接得到的判断 =====
+
+    @property
+    def pointing_up(self) -> bool:
+        """食指尖高于食指根"""
+        return bool(self.points[TIP[INDEX], 1] < self.points[MCP[INDEX], 1])
+
+    @property
+    def index_extended(self) -> bool:
+        """食指伸出：指尖到手腕距离 > 指根到手腕距离 × 1.1"""
+        return bool(self.extension[INDEX] > 1.1)
+
+    @property
+    def middle_folded(self) -> bool:
+        """中指收起（宽松）：指尖到手腕距离 < 指根到手腕距离 × 1.5"""
+        return bool(self.extension[MIDDLE] < 1.5)
+
+    @property
+    def single_finger(self) -> bool:
+        """单指伸出（用于向下指滚动）"""
+        return self.index_extended and self.middle_folded
+
+    def extended_fingers(self, threshold: float = 1.1) -> np.ndarray:
+        """(5,) bool，每根手指是否伸出"""
+        return self.extension > threshold
+
+
+def _compute(points: np.ndarray, world: np.ndarray = None) -> dict:
+    """
+    H 只手的特征一次算完（所有数组第一维是手）
+
+    Args:
+        points: (H, 21, 3) 归一化图像坐标
+        world: (H, 21, 3) 世界坐标或 None
+    """
+    # 手腕到每个关节的 x-y 向量，指尖和指根一起算 (H, 2, 5, 2)
+    xy = points[..., :2]
+    wrist = xy[:, WRIST]
+    offsets = xy[:, _TIP_MCP] - wrist[:, None, None]
+    distances = np.sqrt((offsets * offsets).sum(axis=3))
+    tip_distance, base_distance = distances[:, 0], distances[:, 1]
+    palm_size = base_distance[:, MIDDLE]
+
+    pinch = xy[:, TIP[THUMB]] - xy[:, TIP[INDEX]]
+    pinch = np.sqrt((pinch * pinch).sum(axis=1)) / np.maximum(palm_size, 1e-6)
+
+    # 指骨单位向量 (H, 3, 5, 3)，相邻两段的夹角就是 PIP / DIP 的弯曲角
+    joints = world if world is not None else points
+    bones = joints[:, _BONE_END] - joints[:, _BONE_START]
+    bones /= np.maximum(np.sqrt((bones * bones).sum(axis=3, keepdims=True)), 1e-9)
+    cos = np.clip((bones[:, :-1] * bones[:, 1:]).sum(axis=3), -1.0, 1.0)   # (H, 2, 5)
+    curl = np.arccos(cos).sum(axis=1) / (2 * np.pi)
+
+    # 图像 y 向下，取反后向上为正
+    middle = offsets[:, 1, MIDDLE]
+    orientation = np.arctan2(-middle[:, 1], middle[:, 0])
+
+    a = joints[:, MCP[INDEX]] - joints[:, WRIST]
+    b = joints[:, MCP[PINKY]] - joints[:, WRIST]
+    normal = a[:, _CROSS_A] * b[:, _CROSS_B] - a[:, _CROSS_B] * b[:, _CROSS_A]
+    normal /= np.maximum(np.sqrt((normal * normal).sum(axis=1, keepdims=True)), 1e-9)
+
+    return {
+        'points': points,
+        'world': world,
+        'tip_distance': tip_distance,
+        'base_distance': base_distance,
+        'extension': tip_distance / np.maximum(base_distance, 1e-6),
+        'palm_center': [tuple(c) for c in (xy[:, _PALM].sum(axis=1) / len(_PALM)).tolist()],
+        'palm_size': palm_size.tolist(),
+        'pinch': pinch.tolist(),
+        'curl': curl,
+        'orientation': orientation.tolist(),
+        'palm_normal': normal,
+    }
+
+
+def extract_features(landmarks, world_landmarks=None) -> HandFeatures:
+    """
+    从关键点列表（或 (21, 3) 数组）计算一只手的特征
+
+    Args:
+        landmarks: 整帧归一化关键点
+        world_landmarks: 可选的世界坐标关键点
+    """
+    points = landmarks if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+    world = None
+    if world_landmarks is not None and len(world_landmarks):
+        world = (world_landmarks if isinstance(world_landmarks, np.ndarray)
+                 else landmarks_to_array(world_landmarks))
+    return HandFeatures(points, world)
+
+
+def extract_all_features(hand_landmarks, world_landmarks=None) -> list:
+    """
+    一帧里所有手的特征：所有手的关键点拼成一个数组，一次向量化计算
+
+    第二只手只多一次关键点转换，其余计算的 NumPy 调用次数与一只手相同。
+
+    Args:
+        hand_landmarks: 每只手的整帧归一化关键点
+        world_landmarks: 每只手的世界坐标关键点（数量不一致时不使用）
+
+    Returns:
+        list: 每只手一个 HandFeatures
+    """
+    return features_from_arrays(*hands_to_arrays(hand_landmarks, world_landmarks))
+
+
+def hands_to_arrays(hand_landmarks, world_landmarks=None) -> tuple:
+    """
+    所有手的关键点 → (H, 21, 3) float64 数组（滤波等逐点处理在这一步之后做）
+
+    Returns:
+        (points, world): 没有手时 points 为 None；world 数量与手数不一致时为 None
+    """
+    if not hand_landmarks:
+        return None, None
+    points = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in hand_landmarks],
+                      dtype=np.float64)
+    world = None
+    if world_landmarks is not None and len(world_landmarks) == len(hand_landmarks):
+        world = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in world_landmarks],
+                         dtype=np.float64)
+    return points, world
+
+
+def features_from_arrays(points: np.ndarray, world: np.ndarray = None) -> list:
+    """hands_to_arrays() 的结果 → 每只手一个 HandFeatures"""
+    if points is None or not len(points):
+        return []
+    batch = _compute(points, world)
+    features = []
+    for i in range(len(points)):
+        hand = HandFeatures.__new__(HandFeatures)
+        hand._assign(batch, i)
+        features.append(hand)
+    return features
+
+
+def palm_centers(points: np.ndarray) -> list:
+    """(H, 21, 3) → 每只手的手掌中心 (x, y)，与 HandFeatures.palm_center 相同"""
+    return [tuple(c) for c in (points[:, _PALM, :2].sum(axis=1) / len(_PALM)).tolist()]
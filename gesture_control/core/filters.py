@@ -0,0 +1,172 @@
+"""
+关键点时域滤波 - 让指尖坐标稳定下来，又不明显拖慢跟手
+
+模型每帧给出的关键点有 1-3 像素的抖动，PositionAction 和指向滚动只能靠宽死区和冷却挡住。
+这里的滤波器直接作用在一只手的整个 (21, 3) 数组上，所有点一次 NumPy 运算，用真实时间戳：
+    one_euro  OneEuroFilter：低通，截止频率随速度升高 —— 静止时很稳，快速移动时几乎不滞后
+    kalman    KalmanFilter：匀速模型的卡尔曼滤波，估计位置和速度
+
+两种滤波器接口相同：filter(points, t) → 滤波后的数组（t 为秒，单调递增），reset()。
+LandmarkFilter 按手的 ID（'Left' / 'Right'）各持有一个，手离开画面时重置。
+"""
+
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """
+    One Euro 滤波（Casiez 2012），逐元素向量化
+
+    每个坐标：先对速度做固定截止频率 d_cutoff 的低通，
+    再用 cutoff = min_cutoff + beta * |速度| 对位置低通。
+    min_cutoff 越小静止越稳；beta 越大移动时越跟手。
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 20.0, d_cutoff: float = 1.0):
+        """
+        Args:
+            min_cutoff: 静止时的截止频率（Hz）
+            beta: 速度系数（坐标单位/秒 → Hz）
+            d_cutoff: 速度低通的截止频率（Hz）
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    def filter(self, x: np.ndarray, t: float) -> np.ndarray:
+        """加入一帧（任意形状的数组），返回滤波后的新数组"""
+        x = np.asarray(x, dtype=np.float64)
+        if self._x is None or self._x.shape != x.shape:
+            self._x = x.copy()
+            self._dx = np.zeros_like(x)
+            self._t = t
+            return self._x.copy()
+
+        dt = t - self._t
+        if dt <= 0:
+            return self._x.copy()   # 重复的时间戳：沿用上一帧
+        self._t = t
+
+        self._dx += _alpha(self.d_cutoff, dt) * ((x - self._x) / dt - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        # alpha = 1 / (1 + tau / dt)，tau = 1 / (2π cutoff)；cutoff 是逐元素数组
+        self._x += (x - self._x) / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+        return self._x.copy()
+
+
+class KalmanFilter:
+    """
+    匀速模型卡尔曼滤波，状态为每个坐标的 (位置, 速度)
+
+    所有坐标的过程/测量噪声相同、时间步相同，协方差矩阵对每个坐标都一样，
+    所以协方差只算一份标量，状态是两个与输入同形状的数组。
+    """
+
+    def __init__(self, process_noise: float = 0.05, measurement_noise: float = 1e-5):
+        """
+        Args:
+            process_noise: 加速度噪声的谱密度（越大越跟手）
+            measurement_noise: 测量方差（坐标单位²；归一化坐标 1e-5 ≈ 0.3% 的抖动）
+        """
+        self.q = process_noise
+        self.r = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._v = None
+        self._t = None
+        self._p = None   # 协方差 (p00, p01, p11)
+
+    def filter(self, z: np.ndarray, t: float) -> np.ndarray:
+        """加入一帧测量，返回位置估计"""
+        z = np.asarray(z, dtype=np.float64)
+        if self._x is None or self._x.shape != z.shape:
+            self._x = z.copy()
+            self._v = np.zeros_like(z)
+            self._t = t
+            self._p = (self.r, 0.0, 1.0)   # 速度未知：初始方差取大一些
+            return self._x.copy()
+
+        dt = t - self._t
+        if dt <= 0:
+            return self._x.copy()
+        self._t = t
+
+        # 预测：x += v dt，P = F P F' + Q（连续白噪声加速度模型）
+        p00, p01, p11 = self._p
+        q = self.q
+        p00 += dt * (2.0 * p01 + dt * p11) + q * dt ** 3 / 3.0
+        p01 += dt * p11 + q * dt ** 2 / 2.0
+        p11 += q * dt
+        self._x += self._v * dt
+
+        # 更新
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        innovation = z - self._x
+        self._x += k0 * innovation
+        self._v += k1 * innovation
+        self._p = ((1.0 - k0) * p00, (1.0 - k0) * p01, p11 - k1 * p01)
+        return self._x.copy()
+
+
+def _alpha(cutoff: float, dt: float) -> float:
+    return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+
+FILTERS = {
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+def create_filter(kind: str = 'one_euro', **options):
+    """
+    按名字创建单个滤波器
+
+    Args:
+        kind: 'one_euro' 或 'kalman'
+        options: 对应滤波器的构造参数
+    """
+    if kind not in FILTERS:
+        raise ValueError(f"Unknown landmark filter: {kind} (choose from {', '.join(FILTERS)})")
+    return FILTERS[kind](**options)
+
+
+class LandmarkFilter:
+    """
+    每只手一个滤波器
+
+    用法：
+        landmark_filter = LandmarkFilter('one_euro', beta=20.0)
+        points = landmark_filter.filter('Right', points, timestamp_ms / 1000)
+        landmark_filter.reset('Left')   # 左手离开画面
+    """
+
+    def __init__(self, kind: str = 'one_euro', **options):
+        create_filter(kind, **options)   # 先检查参数
+        self.kind = kind
+        self.options = options
+        self._filters = {}
+
+    def filter(self, hand_id, points: np.ndarray, t: float) -> np.ndarray:
+        """滤波一只手的关键点数组"""
+        hand_filter = self._filters.get(hand_id)
+        if hand_filter is None:
+            hand_filter = self._filters[hand_id] = create_filter(self.kind, **self.options)
+        return hand_filter.filter(points, t)
+
+    def reset(self, hand_id=None):
+        """重置一只手（None：全部）"""
+        for key, hand_filter in self._filters.items():
+            if hand_id is None or key == hand_id:
+                hand_filter.reset()
@@ -4,10 +4,20 @@
 """
 
 from enum import Enum, auto
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
 import os
+import threading
+import time
+from .features import (
+    INDEX, TIP, TRACKED, features_from_arrays, hands_to_arrays, palm_centers,
+)
+from .lazy import lazy_import
+from .metrics import DISABLED
+from .roi import HandROITracker
+
+# MediaPipe 在创建模型时才 import（回放、测试只用后处理，不需要它）
+mp = lazy_import('mediapipe')
+python = lazy_import('mediapipe.tasks.python')
+vision = lazy_import('mediapipe.tasks.python.vision')
 
 
 class GestureType(Enum):
@@ -20,6 +30,11 @@ class GestureType(Enum):
     I_LOVE_YOU = auto()     # ILoveYou 三指 🤟
     THUMB_UP = auto()       # Thumb_Up 大拇指 👍
     THUMB_DOWN = auto()     # Thumb_Down 大拇指向下 👎
+    CLAP = auto()           # 双手靠拢 👏（由双手距离判断，不是模型类别）
+    SWIPE_LEFT = auto()     # 向左挥 👈（动态手势，由关键点轨迹判断，core/swipe.py）
+    SWIPE_RIGHT = auto()    # 向右挥 👉
+    SWIPE_UP = auto()       # 向上挥 👆
+    SWIPE_DOWN = auto()     # 向下挥 👇
 
 
 # MediaPipe 手势名称到我们枚举的映射
@@ -34,115 +49,353 @@ GESTURE_MAP = {
 }
 
 
+def gesture_from_name(name: str) -> GestureType:
+    """类别名 → GestureType：MediaPipe 官方名称或枚举名（自定义分类器的标签），未知为 NONE"""
+    gesture = GESTURE_MAP.get(name)
+    if gesture is None:
+        gesture = GestureType.__members__.get(name, GestureType.NONE)
+    return gesture
+
+
 class GestureRecognizer:
     """使用 MediaPipe Gesture Recognizer Task 的手势识别器"""
 
     SMOOTHING_FRAMES = 3  # 平滑窗口：3 帧（从 4 降到 3，更快响应）
+    PENDING_TIMEOUT = 1.0  # 异步模式：在途帧超过 1s 没有结果就放弃等待
+    MODEL_URL = ("https://storage.googleapis.com/mediapipe-models/"
+                 "gesture_recognizer/gesture_recognizer/float16/1/gesture_recognizer.task")
+
+    def __init__(self, model_path='gesture_recognizer.task', live_stream=False, on_result=None,
+                 roi_tracking=False, metrics=None, recorder=None, num_hands=1,
+                 clap_distance=0.2, smoothing_frames=None, smoothing='vote',
+                 smoothing_options=None, landmark_filter=None, filter_options=None,
+                 primary_hand='Right'):
+        """
+        初始化识别器
+
+        Args:
+            model_path: .task 模型路径；None 表示不加载模型，只用 process_result 做后处理（回放）
+            live_stream: True 使用 LIVE_STREAM 异步模式（recognize_async + 回调），
+                         False 使用 VIDEO 同步模式（recognize）
+            on_result: 异步模式下每个结果到达时调用 on_result(gesture, points, timestamp_ms)，
+                       在 MediaPipe 的回调线程中执行
+            roi_tracking: True 时只识别上一帧手部周围的裁剪区域（HandROITracker）
+            metrics: 可选的 Metrics，记录 convert / inference / smoothing 三个阶段耗时
+            recorder: 可选的 SessionRecorder，录制每帧的原始识别结果
+            num_hands: 最多检测几只手；每只手在 self.hands 里有自己的平滑和状态机
+            clap_distance: 两只手掌中心的距离（归一化坐标）小于它时识别为 CLAP
+            smoothing_frames: 平滑窗口帧数，默认 SMOOTHING_FRAMES
+            smoothing: 平滑器，'vote'（top-1 多数投票）或 'evidence'（置信度加权 + 迟滞）
+            smoothing_options: EvidenceSmoother 的 enter / exit / windows（core/smoothing.py）
+            landmark_filter: 关键点时域滤波，'one_euro' / 'kalman'，None 不滤波（core/filters.py）；
+                             滤波后的坐标用于全部特征和 points，录制和 ROI 仍用原始关键点
+            filter_options: 滤波器参数
+            primary_hand: 两只手都在时主手势取哪只手（'Left' / 'Right'，按 HandTracker 的 ID）；
+                          MediaPipe 的检测顺序每帧都可能变，不能直接用第一只
+        """
+        if model_path is not None and not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model not found: {model_path}\nDownload: {self.MODEL_URL}")
 
-    def __init__(self, model_path='gesture_recognizer.task'):
-        """初始化识别器"""
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(
-                f"Model not found: {model_path}\n"
-                "Download: https://storage.googleapis.com/mediapipe-models/"
-                "gesture_recognizer/gesture_recognizer/float16/1/gesture_recognizer.task"
-            )
+        self.live_stream = live_stream
+        self.on_result = on_result
+        self.roi = HandROITracker() if roi_tracking else None
+        self.metrics = metrics if metrics is not None else DISABLED
+        self.recorder = recorder
+        self.num_hands = num_hands
+        self.clap_distance = clap_distance
+        self.primary_hand = primary_hand
+        if smoothing_frames is not None:
+            self.SMOOTHING_FRAMES = smoothing_frames
+
+        self.recognizer = None
+        if model_path is not None:
+            base_options = python.BaseOptions(model_asset_path=model_path)
+            running_mode = vision.RunningMode.LIVE_STREAM if live_stream else vision.RunningMode.VIDEO
+            self.recognizer = self._create_task(base_options, running_mode)
+        self.frame_count = 0
+        self.last_timestamp_ms = -1
+        # 多帧平滑：主手势（第一只手 / 拍手）一份，每只手各一份
+        from .hands import HandTracker
+        from .smoothing import create_smoother
+        smoothing_options = smoothing_options or {}
+        self.smoother = create_smoother(smoothing, self.SMOOTHING_FRAMES, **smoothing_options)
+        self.hands = HandTracker(self.SMOOTHING_FRAMES, smoothing=smoothing,
+                                 smoothing_options=smoothing_options)
+        self.landmark_filter = None
+        if landmark_filter is not None:
+            from .filters import LandmarkFilter
+            self.landmark_filter = LandmarkFilter(landmark_filter, **(filter_options or {}))
+        self.confirmed_gesture = GestureType.NONE
+        self.raw_gesture = GestureType.NONE
+        self.raw_confidence = 0.0
+        self.features = None   # 最近一帧第一只手的 HandFeatures（core/features.py）
+        # 异步模式：最新结果 (gesture, points, timestamp_ms)，以及在途帧的尺寸
+        self.latest = (GestureType.NONE, {}, -1)
+        self.skipped_frames = 0
+        self._pending = {}
+        self._submitted_at = 0.0
+        self._input = None     # _to_rgb 的复用缓冲区
+        # 异步模式：主线程提交、MediaPipe 回调线程处理结果，在途帧表和 ROI / 平滑状态都要加锁
+        self._lock = threading.Lock()
 
-        base_options = python.BaseOptions(model_asset_path=model_path)
+    def _create_task(self, base_options, running_mode):
+        """创建 MediaPipe 任务（子类换成别的任务，比如 HandLandmarker）"""
         options = vision.GestureRecognizerOptions(
             base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
-            num_hands=1,
+            running_mode=running_mode,
+            num_hands=self.num_hands,
             min_hand_detection_confidence=0.5,  # 从 0.6 → 0.5，更容易检测到手
             min_hand_presence_confidence=0.5,   # 从 0.6 → 0.5
             min_tracking_confidence=0.5,        # 从 0.6 → 0.5
+            # 输出全部类别的分数（按分数排序，第一个仍是 top-1），给置信度加权平滑和录制用
+            canned_gesture_classifier_options=python.components.processors.ClassifierOptions(
+                max_results=-1),
+            result_callback=self._on_live_result if self.live_stream else None,
         )
-        self.recognizer = vision.GestureRecognizer.create_from_options(options)
-        self.frame_count = 0
-        # 多帧平滑
-        from collections import deque
-        self.gesture_history = deque(maxlen=self.SMOOTHING_FRAMES)
-        self.confirmed_gesture = GestureType.NONE
-        self.raw_gesture = GestureType.NONE
-        self.raw_confidence = 0.0
+        return vision.GestureRecognizer.create_from_options(options)
+
+    def _run_task(self, mp_image, timestamp_ms):
+        """同步推理一帧"""
+        return self.recognizer.recognize_for_video(mp_image, timestamp_ms)
+
+    def _run_task_async(self, mp_image, timestamp_ms):
+        """异步提交一帧（结果送到 _on_live_result）"""
+        self.recognizer.recognize_async(mp_image, timestamp_ms)
+
+    def recognize(self, frame, frame_width, frame_height, timestamp_ms=None, is_rgb=False):
+        """
+        识别当前帧中的手势（VIDEO 同步模式，带多帧平滑）
+
+        Args:
+            frame: BGR 图像（is_rgb=True 时为 RGB 图像，跳过颜色转换）
+            frame_width, frame_height: 画面尺寸（用于换算关键点像素坐标）
+            timestamp_ms: 帧的采集时间戳（毫秒，单调递增）；不传则取当前单调时钟
+            is_rgb: frame 是否已经是 RGB（FramePreprocessor 的输出）
+        """
+        metrics = self.metrics
+        t = metrics.start()
+        region = self.roi.next_region() if self.roi is not None else None
+        mp_image = self._to_mp_image(frame, region, is_rgb)
+        timestamp_ms = self._next_timestamp(timestamp_ms)
+        metrics.stop('convert', t)
+
+        t = metrics.start()
+        result = self._run_task(mp_image, timestamp_ms)
+        metrics.stop('inference', t)
+
+        t = metrics.start()
+        gesture, points = self.process_result(result, frame_width, frame_height, region,
+                                              timestamp_ms)
+        metrics.stop('smoothing', t)
+        metrics.count('inferences')
+        return gesture, points
 
-    def recognize(self, frame, frame_width, frame_height):
-        """识别当前帧中的手势（带多帧平滑）"""
+    def recognize_async(self, frame, frame_width, frame_height, timestamp_ms=None,
+                        is_rgb=False) -> bool:
+        """
+        提交一帧做异步识别（LIVE_STREAM 模式），立即返回
+
+        结果通过 on_result 回调送达，同时更新 self.latest。
+        上一帧还在推理时直接跳过本帧 —— 识别永远只处理最新画面。
+
+        Returns:
+            bool: 是否提交成功
+        """
+        t = self.metrics.start()
+        with self._lock:
+            if self._pending:
+                # 结果迟迟不来（被 MediaPipe 丢弃）时不能永远等下去；之后才到的旧结果直接丢掉
+                if time.monotonic() - self._submitted_at < self.PENDING_TIMEOUT:
+                    self.skipped_frames += 1
+                    return False
+                self._pending.clear()
+            region = self.roi.next_region() if self.roi is not None else None
+            timestamp_ms = self._next_timestamp(timestamp_ms)
+            self._pending[timestamp_ms] = (frame_width, frame_height, region)
+            self._submitted_at = time.monotonic()
+        mp_image = self._to_mp_image(frame, region, is_rgb)
+        self.metrics.stop('convert', t)
+
+        self._run_task_async(mp_image, timestamp_ms)
+        return True
+
+    def _on_live_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM 回调：平滑后交给 on_result"""
+        with self._lock:
+            pending = self._pending.pop(timestamp_ms, None)
+            # 更早的帧如果被 MediaPipe 丢弃，不再等待它们；更新的在途帧留着
+            for stale in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[stale]
+            if pending is None:
+                return   # 等待超时后才到的旧结果：尺寸和 ROI 已经不知道了
+            frame_width, frame_height, region = pending
+
+            # 异步模式的推理耗时 = 提交到回调的时间
+            self.metrics.record('inference', time.monotonic() - self._submitted_at)
+
+            t = self.metrics.start()
+            gesture, points = self.process_result(result, frame_width, frame_height, region,
+                                                  timestamp_ms)
+            self.metrics.stop('smoothing', t)
+            self.metrics.count('inferences')
+            self.latest = (gesture, points, timestamp_ms)
+        if self.on_result is not None:
+            self.on_result(gesture, points, timestamp_ms)
+
+    def _to_mp_image(self, frame, region=None, is_rgb=False):
+        """
+        BGR → RGB → mp.Image（有 ROI 时只转换裁剪区域）
+
+        mp.Image 构造时总会把数据拷进它自己的（C++）缓冲区，这一次拷贝省不掉；
+        在这之前的裁剪和颜色转换写进复用的缓冲区（_to_rgb），不再每帧分配。
+        """
+        return mp.Image(image_format=mp.ImageFormat.SRGB,
+                        data=self._to_rgb(frame, region, is_rgb))
+
+    def _to_rgb(self, frame, region=None, is_rgb=False):
+        """
+        送进 mp.Image 的连续 RGB 数组
+
+        整帧 RGB 本来就连续，直接用；ROI 裁剪（不连续的视图）和 BGR 转换写进 _input，
+        它按最大的尺寸分配一次，每帧取开头一段 reshape 成本帧的形状（连续、不拷贝）。
+        返回的数组下一帧会被覆盖。
+        """
         import cv2
+        import numpy as np
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        if region is not None:
+            x0, y0, x1, y1 = region
+            frame = frame[y0:y1, x0:x1]
+        if is_rgb and frame.flags.c_contiguous:
+            return frame
+        size = frame.size
+        if self._input is None or self._input.size < size:
+            self._input = np.empty(size, dtype=np.uint8)
+        buffer = self._input[:size].reshape(frame.shape)
+        if is_rgb:
+            np.copyto(buffer, frame)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+        return buffer
 
+    def _next_timestamp(self, timestamp_ms=None) -> int:
+        """MediaPipe 要求时间戳严格递增：同一毫秒内的帧顺延 1ms"""
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        timestamp_ms = max(int(timestamp_ms), self.last_timestamp_ms + 1)
+        self.last_timestamp_ms = timestamp_ms
         self.frame_count += 1
-        timestamp_ms = int(self.frame_count * 33)
+        return timestamp_ms
 
-        result = self.recognizer.recognize_for_video(mp_image, timestamp_ms)
+    def process_result(self, result, frame_width, frame_height, region=None, timestamp_ms=None):
+        """
+        解析识别结果：多帧平滑 + 关键点
 
-        # 解析原始手势
-        raw_gesture = GestureType.NONE
-        self.raw_confidence = 0.0
-        points = {}
+        Args:
+            result: GestureRecognizerResult（或字段相同的回放结果）
+            frame_width, frame_height: 画面尺寸
+            region: 本帧的 ROI 裁剪区域，None 表示整帧
+            timestamp_ms: 帧时间戳（录制用）
+        """
+        hand_landmarks = result.hand_landmarks
+        if self.roi is not None:
+            hand_landmarks = [self.roi.to_full_frame(lms, region, frame_width, frame_height)
+                              for lms in hand_landmarks]
+            # 多只手时区域框住所有手
+            self.roi.update([lm for lms in hand_landmarks for lm in lms],
+                            frame_width, frame_height)
 
-        if result.gestures and len(result.gestures) > 0:
-            top_gesture = result.gestures[0][0]
-            gesture_name = top_gesture.category_name
-            confidence = top_gesture.score
-            self.raw_confidence = confidence
+        if self.recorder is not None:
+            self.recorder.record(timestamp_ms, result, hand_landmarks, frame_width, frame_height)
 
-            # 置信度阈值 0.5（从 0.6 降低，提高灵敏度）
-            if confidence > 0.5 and gesture_name in GESTURE_MAP:
-                raw_gesture = GESTURE_MAP[gesture_name]
+        # 逐手解析：原始手势 + 特征（关键点一次转成数组，所有特征一次算完）
+        gestures = result.gestures or []
+        handedness = getattr(result, 'handedness', None) or []
+        world = getattr(result, 'hand_world_landmarks', None) or []
+        hands = []
+        sides = [handedness[i][0].category_name if i < len(handedness) and handedness[i] else None
+                 for i in range(len(hand_landmarks))]
+        all_points, world = hands_to_arrays(hand_landmarks, world)
+        # 先按原始位置分配左右手（主手势和滤波器都按手 ID，不按检测顺序）
+        hand_ids = []
+        if all_points is not None:
+            hand_ids = self.hands.assign(sides, palm_centers(all_points))
+        if self.landmark_filter is not None:
+            # 每只手用自己的滤波器（世界坐标不滤波，只用于角度）
+            self._filter_hands(all_points, hand_ids, timestamp_ms)
+        all_features = features_from_arrays(all_points, world)
+        for i, features in enumerate(all_features):
+            raw, confidence = GestureType.NONE, 0.0
+            scores = {GestureType.NONE: 0.0}   # 手在画面里，但可能没有任何类别
+            if i < len(gestures) and gestures[i]:
+                top_gesture = gestures[i][0]
+                confidence = top_gesture.score
+                # 置信度阈值 0.5（从 0.6 降低，提高灵敏度）
+                if confidence > 0.5:
+                    raw = gesture_from_name(top_gesture.category_name)
+                for category in gestures[i]:
+                    gesture = gesture_from_name(category.category_name)
+                    scores[gesture] = max(scores.get(gesture, 0.0), category.score)
+            hands.append((sides[i], raw, confidence, features, scores))
 
+        # 主手势：primary_hand 那只手（不在时取第一只）；两只手掌靠拢时为拍手
+        primary = hand_ids.index(self.primary_hand) if self.primary_hand in hand_ids else 0
+        raw_gesture = GestureType.NONE
+        raw_scores = None
+        self.raw_confidence = 0.0
+        if hands:
+            _, raw_gesture, self.raw_confidence, _, raw_scores = hands[primary]
+        if len(hands) >= 2 and self._is_clap(hands[0][3], hands[1][3]):
+            raw_gesture = GestureType.CLAP
+            raw_scores = None
         self.raw_gesture = raw_gesture
+        self.confirmed_gesture = self.smoother.update(raw_gesture, raw_scores)
 
-        # 多帧平滑 - 使用多数投票（好品味：不要求全部相同）
-        self.gesture_history.append(raw_gesture)
-        if len(self.gesture_history) >= self.SMOOTHING_FRAMES:
-            # 统计最常出现的手势
-            from collections import Counter
-            gesture_counts = Counter(self.gesture_history)
-            most_common_gesture, count = gesture_counts.most_common(1)[0]
-
-            # 多数投票：至少 2/3 帧相同（3 帧中至少 2 帧）
-            if count >= (self.SMOOTHING_FRAMES * 2 // 3):
-                self.confirmed_gesture = most_common_gesture
-
-            # 手离开时快速重置（优先级更高）
-            if raw_gesture == GestureType.NONE:
-                self.confirmed_gesture = GestureType.NONE
-
-        # 获取手部关键点
-        if result.hand_landmarks and len(result.hand_landmarks) > 0:
-            landmarks = result.hand_landmarks[0]
-            index_tip = landmarks[8]   # 食指尖
-            index_base = landmarks[5]  # 食指根部
-            wrist = landmarks[0]       # 手腕
-
-            # 判断手指方向
-            pointing_up = index_tip.y < index_base.y
-
-            # 检测单指伸出（用于向下指滚动）
-            # 食指伸出：指尖到手腕距离 > 指根到手腕距离
-            index_extended = self._distance(index_tip, wrist) > self._distance(index_base, wrist) * 1.1
-            # 其他手指收起（放宽条件）
-            middle_tip = landmarks[12]
-            middle_base = landmarks[9]
-            middle_folded = self._distance(middle_tip, wrist) < self._distance(middle_base, wrist) * 1.5
-
-            single_finger = index_extended and middle_folded
-
-            points = {
-                'index_x': int(index_tip.x * frame_width),
-                'index_y': int(index_tip.y * frame_height),
-                'pointing_up': pointing_up,
-                'single_finger': single_finger,
+        # 每只手：自己的平滑和状态机
+        tracks = self.hands.update(hands, timestamp_ms, hand_ids)
+
+        points = {}
+        self.features = None
+        if hands:
+            features = hands[primary][3]
+            self.features = features
+            points = self._hand_points(features, frame_width, frame_height)
+            points['pointing_up'] = features.pointing_up
+            points['single_finger'] = features.single_finger
+            points['features'] = features
+            points['scores'] = raw_scores   # 主手势本帧的类别分布（拍手时为 None），给证据触发用
+            points['tracked'] = features.points[TRACKED, :2]   # 手腕 + 指尖 (6, 2)，给挥手检测用
+            points['hands'] = {
+                track.hand_id: dict(self._hand_points(track.features, frame_width, frame_height),
+                                    gesture=track.gesture, hold_time=track.hold_time,
+                                    features=track.features)
+                for track in tracks
             }
 
         return self.confirmed_gesture, points
 
-    def _distance(self, p1, p2) -> float:
-        """计算两点距离"""
-        return ((p1.x - p2.x)**2 + (p1.y - p2.y)**2) ** 0.5
+    def _filter_hands(self, all_points, hand_ids, timestamp_ms):
+        """按分配好的手 ID 原地滤波每只手的 (21, 3) 关键点；不在画面里的手重置滤波器"""
+        if all_points is None:
+            self.landmark_filter.reset()
+            return
+        t = timestamp_ms / 1000.0 if timestamp_ms is not None else time.monotonic()
+        for i, hand_id in enumerate(hand_ids):
+            all_points[i] = self.landmark_filter.filter(hand_id, all_points[i], t)
+        for hand_id in self.hands.tracks:
+            if hand_id not in hand_ids:
+                self.landmark_filter.reset(hand_id)
+
+    def _is_clap(self, a, b) -> bool:
+        """两只手掌中心足够近"""
+        (ax, ay), (bx, by) = a.palm_center, b.palm_center
+        return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 < self.clap_distance
+
+    @staticmethod
+    def _hand_points(features, frame_width, frame_height) -> dict:
+        """食指尖像素坐标"""
+        index_x, index_y = features.points[TIP[INDEX], :2]
+        return {'index_x': int(index_x * frame_width), 'index_y': int(index_y * frame_height)}
 
     def get_debug_info(self):
         """返回调试信息"""
@@ -150,6 +403,8 @@ class GestureRecognizer:
 
     def close(self):
         """释放资源"""
-        if hasattr(self, 'recognizer'):
+        if getattr(self, 'recognizer', None) is not None:
             self.recognizer.close()
+        if getattr(self, 'recorder', None) is not None:
+            self.recorder.close()
 
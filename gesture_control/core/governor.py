@@ -0,0 +1,89 @@
+"""
+推理频率调节器 - 待机时低频识别，看到激活手掌立即全速
+
+单一职责：决定 "这一帧要不要跑识别"
+激活/待机状态仍由 ActivationManager 管理，调节器只根据它的状态选择频率：
+- 待机 / 画面里没有手：每秒只识别 idle_hz 次
+- 看到张开手掌（正在激活）或已激活且手在画面中：每帧都识别
+"""
+
+from .activation import ActivationManager
+from .clock import MONOTONIC
+from .gestures import GestureType
+
+
+class InferenceGovernor:
+    """
+    推理频率调节器
+
+    用法：
+        governor = InferenceGovernor()
+        if governor.should_run():
+            gesture, points = recognizer.recognize(...)
+            governor.update(bool(points), gesture, recognizer.raw_gesture)
+
+    后面还有别的门控（运动检测）时分两步：due() 放行后再问门控，
+    真正送去识别了才 record_run()，被门控挡下的帧不占用低频识别的名额。
+    """
+
+    def __init__(self, activation: ActivationManager = None, idle_hz: float = 4.0,
+                 clock=None):
+        """
+        Args:
+            activation: 激活状态管理器，默认用同一个时钟新建一个
+            idle_hz: 低频模式下每秒识别次数
+            clock: 时钟（core/clock.py），默认单调时钟
+        """
+        self.clock = clock if clock is not None else MONOTONIC
+        self.activation = activation if activation is not None else ActivationManager(self.clock)
+        self.idle_interval = 1.0 / idle_hz
+        self.full_rate = False
+        self.processed_frames = 0
+        self.skipped_frames = 0
+        self._last_run = None
+
+    def should_run(self) -> bool:
+        """这一帧是否需要识别（放行即计为识别）"""
+        if self.due():
+            self.record_run()
+            return True
+        return False
+
+    def due(self) -> bool:
+        """按当前频率这一帧该不该识别；不该时计为跳过"""
+        if (self.full_rate or self._last_run is None
+                or self.clock() - self._last_run >= self.idle_interval):
+            return True
+        self.skipped_frames += 1
+        return False
+
+    def record_run(self):
+        """这一帧真正送去识别了"""
+        self._last_run = self.clock()
+        self.processed_frames += 1
+
+    def update(self, has_hand: bool, gesture: GestureType,
+               raw_gesture: GestureType = GestureType.NONE) -> dict:
+        """
+        用识别结果更新激活状态并选择频率
+
+        Args:
+            has_hand: 是否检测到手
+            gesture: 平滑后的手势
+            raw_gesture: 未平滑的手势 —— 单帧看到手掌就切全速，不等平滑确认
+
+        Returns:
+            dict: ActivationManager.update 的结果
+        """
+        state = self.activation.update(has_hand, gesture)
+        palm_seen = has_hand and GestureType.OPEN_PALM in (gesture, raw_gesture)
+        self.full_rate = has_hand and (state['activated'] or palm_seen)
+        return state
+
+    def get_stats(self) -> dict:
+        """返回识别/跳过帧数统计"""
+        return {
+            'processed': self.processed_frames,
+            'skipped': self.skipped_frames,
+            'full_rate': self.full_rate,
+        }
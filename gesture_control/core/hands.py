@@ -0,0 +1,132 @@
+"""
+多手跟踪 - 每只手有自己的平滑历史和 GestureStateMachine
+
+手的 ID 就是左右手（'Left' / 'Right'）：两个槽位在构造时建好，
+每帧只按检测到的手数做常数次更新，多一只手不会多出任何遍历。
+MediaPipe 偶尔把两只手标成同一边，这时按上一帧的位置重新分配。
+"""
+
+from .clock import FrameClock
+from .gestures import GestureType
+from .smoothing import create_smoother
+from .state_machine import GestureStateMachine
+
+
+HAND_IDS = ('Left', 'Right')
+
+
+class HandTrack:
+    """一只手的跟踪状态"""
+
+    __slots__ = ('hand_id', 'smoother', 'state_machine', 'present', 'raw_gesture',
+                 'confidence', 'gesture', 'hold_time', 'features', 'center')
+
+    def __init__(self, hand_id: str, smoother, clock):
+        self.hand_id = hand_id
+        self.smoother = smoother
+        self.state_machine = GestureStateMachine(clock)
+        self.present = False
+        self.raw_gesture = GestureType.NONE
+        self.confidence = 0.0
+        self.gesture = GestureType.NONE
+        self.hold_time = 0.0
+        self.features = None      # 本帧的 HandFeatures（手不在时为 None）
+        self.center = None        # 最后一次看到时的手掌中心（归一化坐标），用于重新分配 ID
+
+    def update(self, raw_gesture: GestureType, confidence: float = 0.0, features=None,
+               scores: dict = None):
+        """每帧调用一次；手不在画面里时 raw_gesture 传 NONE、features 传 None"""
+        self.present = features is not None
+        self.raw_gesture = raw_gesture
+        self.confidence = confidence
+        self.features = features
+        if features is not None:
+            self.center = features.palm_center
+        self.gesture = self.smoother.update(raw_gesture, scores)
+        self.hold_time = self.state_machine.update(self.gesture)
+
+
+class HandTracker:
+    """
+    左右两只手的跟踪器
+
+    用法：
+        tracker = HandTracker()
+        tracks = tracker.update([('Right', GestureType.FIST, 0.9, features)], timestamp_ms)
+        tracker.tracks['Right'].hold_time
+    """
+
+    def __init__(self, smoothing_frames: int = 3, clock=None, smoothing: str = 'vote',
+                 smoothing_options: dict = None):
+        """
+        Args:
+            smoothing_frames: 每只手的平滑窗口
+            clock: 每只手状态机的时钟；默认用帧时钟，跟随 update 传入的时间戳
+            smoothing / smoothing_options: 平滑器种类和参数（core/smoothing.py）
+        """
+        self.clock = clock if clock is not None else FrameClock()
+        self.tracks = {
+            hand_id: HandTrack(hand_id,
+                               create_smoother(smoothing, smoothing_frames,
+                                               **(smoothing_options or {})),
+                               self.clock)
+            for hand_id in HAND_IDS
+        }
+
+    def update(self, hands: list, timestamp_ms: int = None, hand_ids: list = None) -> list:
+        """
+        更新所有手
+
+        Args:
+            hands: 本帧检测到的手，按检测顺序
+                   [(handedness 或 None, 原始手势, 置信度, HandFeatures[, 类别分布])]
+            timestamp_ms: 帧时间戳（用默认帧时钟时推进时钟）
+            hand_ids: 已经用 assign() 分配好的槽位（调用方要先知道 ID，比如按手滤波）
+
+        Returns:
+            list: 与 hands 顺序一致的 HandTrack
+        """
+        if timestamp_ms is not None and isinstance(self.clock, FrameClock):
+            self.clock.update(timestamp_ms)
+
+        if hand_ids is None:
+            hand_ids = self.assign([hand[0] for hand in hands],
+                                   [hand[3].palm_center for hand in hands])
+        active = []
+        for hand_id, hand in zip(hand_ids, hands):
+            track = self.tracks[hand_id]
+            track.update(*hand[1:])
+            active.append(track)
+
+        for hand_id, track in self.tracks.items():
+            if hand_id not in hand_ids:
+                track.update(GestureType.NONE)
+        return active
+
+    def assign(self, labels: list, centers: list) -> list:
+        """handedness → 槽位；两只手标签冲突（或缺失）时按与上一帧的距离分配"""
+        labels = labels[:len(HAND_IDS)]
+        if len(labels) < 2:
+            return [label if label in self.tracks else HAND_IDS[1] for label in labels]
+        if labels[0] != labels[1] and labels[0] in self.tracks and labels[1] in self.tracks:
+            return labels
+
+        left, right = self.tracks['Left'].center, self.tracks['Right'].center
+        a, b = centers[0], centers[1]
+        if left is None or right is None:
+            # 没有历史位置：画面左边的是左手（画面已镜像）
+            return ['Left', 'Right'] if a[0] <= b[0] else ['Right', 'Left']
+        straight = _distance(a, left) + _distance(b, right)
+        swapped = _distance(a, right) + _distance(b, left)
+        return ['Left', 'Right'] if straight <= swapped else ['Right', 'Left']
+
+    def reset(self):
+        for track in self.tracks.values():
+            track.smoother.reset()
+            track.state_machine.reset()
+            track.present = False
+            track.center = None
+
+
+def _distance(p1, p2) -> float:
+    return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
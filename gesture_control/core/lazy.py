@@ -0,0 +1,68 @@
+"""
+延迟导入 - 重量级依赖（mediapipe、pyautogui）第一次用到时才 import
+
+import mediapipe 要近一秒，import pyautogui 要连接显示服务器；
+模块顶层直接 import 会让 `import gesture_control.main` 串行地等它们，
+连回放、测试这种根本不用模型/按键的场景也一样。
+
+用法（模块顶层）：
+    vision = lazy_import('mediapipe.tasks.python.vision')
+    ...
+    vision.GestureRecognizer.create_from_options(options)   # 这里才真正 import
+
+代理本身是模块对象，unittest.mock.patch('pkg.mod.vision') 照常可用；
+加载之前访问下划线开头的属性（__version__ 等）不会触发 import，会得到 AttributeError。
+每个模块实际 import 的耗时记在 IMPORT_TIMES 里，启动计时（core/startup.py）会打印出来。
+"""
+
+import importlib
+import time
+import types
+
+IMPORT_TIMES = {}   # 模块名 → 实际 import 耗时（秒），只记通过代理加载的
+
+
+class LazyModule(types.ModuleType):
+    """第一次访问属性时才 import 的模块代理"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            # 并发访问时 import 系统自己有模块锁，重复赋值无害
+            t = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            IMPORT_TIMES.setdefault(self.__name__, time.perf_counter() - t)
+            self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, name):
+        # 下划线开头的属性不触发加载：mock、inspect、copy 探测对象时会先问这些
+        if name.startswith('_') and not self.loaded:
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """返回模块代理；模块已经 import 过时也只是多一层转发"""
+    return LazyModule(name)
+
+
+def preload(module):
+    """立即加载（比如在后台线程里提前付掉 import 的时间）；不是代理时什么也不做"""
+    if isinstance(module, LazyModule):
+        module._load()
@@ -0,0 +1,210 @@
+"""
+性能指标 - 分阶段延迟直方图 + 帧率计数
+
+延迟用固定内存的对数分桶直方图记录（每 10 倍区间 20 个桶，误差约 12%），
+运行多久内存都不变，随时可以算 p50/p95/p99/max。
+
+关闭时（默认）start()/stop() 只是一次属性判断就返回，几乎没有开销。
+
+用法：
+    metrics = Metrics(enabled=True)
+    t = metrics.start()
+    ...  # 某个阶段
+    metrics.stop('inference', t)
+    metrics.count('frames')
+"""
+
+import json
+import math
+import os
+import time
+
+
+class LatencyHistogram:
+    """固定内存的对数分桶延迟直方图"""
+
+    MIN_SECONDS = 1e-5          # 10μs 以下算进第一个桶
+    DECADES = 6                 # 10μs ~ 10s
+    BUCKETS_PER_DECADE = 20
+
+    def __init__(self):
+        self._log_step = math.log(10) / self.BUCKETS_PER_DECADE
+        self.counts = [0] * (self.DECADES * self.BUCKETS_PER_DECADE + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """记录一次耗时（秒）"""
+        if seconds > self.MIN_SECONDS:
+            index = int(math.log(seconds / self.MIN_SECONDS) / self._log_step) + 1
+            index = min(index, len(self.counts) - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """
+        第 p 百分位的延迟（秒），取所在桶的上界，不超过实际最大值
+
+        Args:
+            p: 0-100
+        """
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                upper = self.MIN_SECONDS * math.exp(index * self._log_step)
+                return min(upper, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """毫秒为单位的统计摘要"""
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'mean_ms': mean * 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class Metrics:
+    """阶段计时器 + 计数器的集合"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = {}      # 阶段名 → LatencyHistogram
+        self.counters = {}    # 计数器名 → 累计次数
+        self.started_at = time.monotonic()
+        self._rate_base = (self.started_at, {})
+
+    def start(self) -> float:
+        """阶段开始：返回起始时间（关闭时返回 0）"""
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def stop(self, stage: str, start: float):
+        """阶段结束：把耗时记进该阶段的直方图"""
+        if not self.enabled:
+            return
+        self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float):
+        """直接记录一个耗时（秒），用于不是 start/stop 包起来的延迟"""
+        if not self.enabled:
+            return
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages.setdefault(stage, LatencyHistogram())
+        histogram.record(seconds)
+
+    def count(self, name: str, n: int = 1):
+        """计数器 +n"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        """
+        当前所有指标
+
+        rates 是距离上一次 snapshot 的平均速率（次/秒），比如 frames → 帧率
+        """
+        now = time.monotonic()
+        base_time, base_counts = self._rate_base
+        elapsed = max(now - base_time, 1e-9)
+        counters = dict(self.counters)
+        self._rate_base = (now, counters)
+
+        return {
+            'time': time.time(),
+            'uptime_s': now - self.started_at,
+            'stages': {name: h.snapshot() for name, h in sorted(self.stages.items())},
+            'counters': counters,
+            'rates': {name: (n - base_counts.get(name, 0)) / elapsed
+                      for name, n in counters.items()},
+        }
+
+
+def format_prometheus(snapshot: dict, prefix: str = 'gesture') -> str:
+    """把 snapshot 转成 Prometheus 文本格式"""
+    lines = [
+        f'# HELP {prefix}_stage_latency_seconds Per-stage latency.',
+        f'# TYPE {prefix}_stage_latency_seconds summary',
+    ]
+    for stage, s in snapshot['stages'].items():
+        for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+            lines.append(f'{prefix}_stage_latency_seconds{{stage="{stage}",quantile="{quantile}"}} '
+                         f'{s[key] / 1000:.6f}')
+        lines.append(f'{prefix}_stage_latency_seconds_sum{{stage="{stage}"}} '
+                     f'{s["mean_ms"] * s["count"] / 1000:.6f}')
+        lines.append(f'{prefix}_stage_latency_seconds_count{{stage="{stage}"}} {s["count"]}')
+
+    lines.append(f'# TYPE {prefix}_stage_latency_max_seconds gauge')
+    for stage, s in snapshot['stages'].items():
+        lines.append(f'{prefix}_stage_latency_max_seconds{{stage="{stage}"}} {s["max_ms"] / 1000:.6f}')
+
+    lines.append(f'# TYPE {prefix}_events_total counter')
+    for name, n in snapshot['counters'].items():
+        lines.append(f'{prefix}_events_total{{event="{name}"}} {n}')
+
+    lines.append(f'# TYPE {prefix}_events_per_second gauge')
+    for name, rate in snapshot['rates'].items():
+        lines.append(f'{prefix}_events_per_second{{event="{name}"}} {rate:.3f}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """
+    定期导出指标
+
+    - json_path: 每个周期追加一行 JSON（JSON Lines）
+    - prom_path: 每个周期覆盖写 Prometheus 文本文件（给 node_exporter textfile collector）
+    """
+
+    def __init__(self, metrics: Metrics, json_path: str = None, prom_path: str = None,
+                 interval: float = 10.0):
+        self.metrics = metrics
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self._next_export = time.monotonic() + interval
+
+    def maybe_export(self):
+        """到时间了就导出一次（每帧调用）"""
+        now = time.monotonic()
+        if now < self._next_export:
+            return False
+        self._next_export = now + self.interval
+        self.export()
+        return True
+
+    def export(self):
+        """立即导出一次"""
+        snapshot = self.metrics.snapshot()
+        if self.json_path:
+            with open(self.json_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+        if self.prom_path:
+            # 先写临时文件再改名，采集方不会读到写了一半的文件
+            tmp_path = self.prom_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(format_prometheus(snapshot))
+            os.replace(tmp_path, self.prom_path)
+        return snapshot
+
+
+# 默认的关闭状态实例：组件没有传 metrics 时用它
+DISABLED = Metrics(enabled=False)
@@ -0,0 +1,109 @@
+"""
+运动门控 - 画面没变化就跳过识别
+
+绝大多数时间摄像头前是静止的场景，没有手。
+在缩小的灰度图上做帧差：和上一次识别时的画面相比变化很小，就不跑 MediaPipe。
+跳过的帧沿用上一次的识别结果，平滑历史不受影响。
+"""
+
+import cv2
+import numpy as np
+
+
+class MotionDetector:
+    """
+    帧差运动检测
+
+    参考帧是 "上一次放行（识别）的画面"，而不是上一帧 ——
+    缓慢的变化会累积起来，最终超过阈值被放行，不会一直漏掉
+    """
+
+    def __init__(self, threshold: float = 4.0, width: int = 64, max_skip_frames: int = 15):
+        """
+        Args:
+            threshold: 平均灰度差阈值（0-255），超过即认为有运动
+            width: 缩小后的宽度（像素），高度按比例
+            max_skip_frames: 最多连续跳过的帧数，之后强制识别一次刷新结果
+        """
+        self.threshold = threshold
+        self.width = width
+        self.max_skip_frames = max_skip_frames
+        self.processed_frames = 0
+        self.skipped_frames = 0
+        self.last_score = 0.0
+        self._skipped_in_row = 0
+        self._small = None
+        self._gray = None
+        self._reference = None
+        self._diff = None
+        self._undo = None    # 上一次放行前连续跳过的帧数（cancel 用），None 表示当时还没有参考帧
+
+    def has_motion(self, frame) -> bool:
+        """
+        判断这一帧是否需要识别
+
+        Args:
+            frame: BGR 图像
+
+        Returns:
+            bool: True = 有变化（或需要强制刷新），应该识别
+        """
+        self._downsample(frame)
+
+        if self._reference is None:
+            self._reference = self._gray.copy()
+            self._undo = None
+            return self._process()
+
+        cv2.absdiff(self._gray, self._reference, dst=self._diff)
+        self.last_score = cv2.mean(self._diff)[0]
+
+        if self.last_score >= self.threshold or self._skipped_in_row >= self.max_skip_frames:
+            self._gray, self._reference = self._reference, self._gray
+            self._undo = self._skipped_in_row
+            return self._process()
+
+        self._skipped_in_row += 1
+        self.skipped_frames += 1
+        return False
+
+    def cancel(self):
+        """
+        刚放行的帧最终没有识别（识别器还在忙）：换回原来的参考帧，这一帧记为跳过
+
+        只能紧跟在返回 True 的 has_motion() 之后调用。
+        """
+        if self._undo is None:
+            self._reference = None
+            self._skipped_in_row = 0
+        else:
+            # 交换之后原来的参考帧还在 _gray 里（下一帧才会覆盖）
+            self._gray, self._reference = self._reference, self._gray
+            self._skipped_in_row = self._undo + 1
+        self.processed_frames -= 1
+        self.skipped_frames += 1
+
+    def _downsample(self, frame):
+        """缩小 + 灰度，复用缓冲区"""
+        h, w = frame.shape[:2]
+        size = (self.width, max(1, h * self.width // w))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+            self._diff = np.empty_like(self._gray)
+            self._reference = None
+
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+    def _process(self) -> bool:
+        self._skipped_in_row = 0
+        self.processed_frames += 1
+        return True
+
+    def get_stats(self) -> dict:
+        """返回识别/跳过帧数统计"""
+        return {
+            'processed': self.processed_frames,
+            'skipped': self.skipped_frames,
+        }
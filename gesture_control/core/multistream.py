@@ -0,0 +1,204 @@
+"""
+多路视频 - 每路一个识别进程，结果按时间戳合并成一条有序的动作流
+
+    采集线程（每路一个） → RecognizerPool → EventMerger → 每路自己的 GestureController
+                                                          → 同一个 ActionDispatcher
+
+各路的采集时间戳都来自主进程的 time.monotonic()，可以直接比较。
+EventMerger 用水位线做多路归并：所有还在出结果的路都已经超过某个时间戳，
+这个时间戳之前的事件才按顺序放出；某路卡住超过 max_delay 就不再等它。
+"""
+
+import heapq
+import threading
+import time
+
+from .clock import FrameClock
+from .gestures import GestureType
+from .worker import ERROR, RESULT, RecognizerPool
+
+
+class GestureEvent:
+    """一路视频一帧的识别结果"""
+
+    __slots__ = ('source', 'timestamp_ms', 'gesture', 'points', 'latency')
+
+    def __init__(self, source: str, timestamp_ms: int, gesture: GestureType, points: dict,
+                 latency: float = 0.0):
+        self.source = source
+        self.timestamp_ms = timestamp_ms
+        self.gesture = gesture
+        self.points = points
+        self.latency = latency   # 识别进程里的处理耗时（秒）
+
+    def __lt__(self, other):
+        return (self.timestamp_ms, self.source) < (other.timestamp_ms, other.source)
+
+
+class EventMerger:
+    """
+    多路事件按时间戳归并
+
+    用法：
+        merger = EventMerger(['cam0', 'cam1'], max_delay_ms=100)
+        merger.push(event)
+        for event in merger.pop_ready(now_ms): ...
+    """
+
+    def __init__(self, sources, max_delay_ms: int = 100):
+        self.max_delay_ms = max_delay_ms
+        self.latest = {source: None for source in sources}   # 每路最新的时间戳
+        self._heap = []
+        self.released = None   # 最后放出的事件时间戳
+        self.late = 0          # 到得太晚（早于已放出的事件）的事件数
+
+    def push(self, event: GestureEvent):
+        self.latest[event.source] = event.timestamp_ms
+        if self.released is not None and event.timestamp_ms < self.released:
+            self.late += 1   # 卡住的一路恢复了：照样处理，只是顺序已经保证不了
+        heapq.heappush(self._heap, event)
+
+    def pop_ready(self, now_ms: int) -> list:
+        """
+        放出所有可以确定顺序的事件
+
+        Args:
+            now_ms: 当前时间（与事件时间戳同一时钟），用来判断哪一路已经卡住
+        """
+        # 水位线：还活跃的路里最慢的那一路；超过 max_delay 没出结果的路不再等
+        active = [ts for ts in self.latest.values()
+                  if ts is not None and now_ms - ts <= self.max_delay_ms]
+        if not active:
+            watermark = now_ms - self.max_delay_ms
+        else:
+            watermark = min(active)
+        if any(ts is None for ts in self.latest.values()):
+            # 还有路一个结果都没出（比如模型还在加载）：最多等 max_delay
+            watermark = min(watermark, now_ms - self.max_delay_ms)
+
+        return self._release(watermark)
+
+    def flush(self) -> list:
+        """放出剩余的全部事件（退出时用）"""
+        return self._release(float('inf'))
+
+    def _release(self, watermark) -> list:
+        ready = []
+        while self._heap and self._heap[0].timestamp_ms <= watermark:
+            ready.append(heapq.heappop(self._heap))
+        if ready:
+            self.released = max(ready[-1].timestamp_ms, self.released or ready[-1].timestamp_ms)
+        return ready
+
+
+class MultiStreamRunner:
+    """
+    多路运行器：采集线程 + 识别进程池 + 归并 + 每路的动作层
+
+    用法：
+        runner = MultiStreamRunner({'cam0': cap0, 'cam1': cap1}, controller_factory).start()
+        while running:
+            for event, action in runner.step(): ...
+        runner.stop()
+    """
+
+    def __init__(self, captures: dict, controller_factory, pool: RecognizerPool = None,
+                 max_delay_ms: int = 100, clock=None):
+        """
+        Args:
+            captures: source_id → 已启动的 ThreadedCapture
+            controller_factory: controller_factory(source_id, clock) → 有 update(gesture, points) 的对象
+            pool: 识别进程池，默认 RecognizerPool()
+            max_delay_ms: 归并时最多等慢的一路多久
+            clock: 当前时间（秒），默认 time.monotonic，与采集时间戳同一时钟
+        """
+        self.captures = captures
+        self.pool = pool if pool is not None else RecognizerPool()
+        self.clock = clock if clock is not None else time.monotonic
+        self.merger = EventMerger(captures, max_delay_ms)
+        self.clocks = {source: FrameClock() for source in captures}
+        self.controllers = {source: controller_factory(source, self.clocks[source])
+                            for source in captures}
+        self.stats = {source: {'submitted': 0, 'results': 0} for source in captures}
+        self.errors = {}
+        self.last_message = self.clock()
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        """每路启动一个采集转发线程（第一帧到达后才知道画面尺寸，再启动识别进程）"""
+        for source, capture in self.captures.items():
+            thread = threading.Thread(target=self._feed, args=(source, capture),
+                                      name=f'feed-{source}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _feed(self, source, capture):
+        started = False
+        while not self._stopping.is_set():
+            captured = capture.read(timeout=0.5)
+            if captured is None:
+                if capture.finished:
+                    return
+                continue
+            if not started:
+                self.pool.add_stream(source, captured.image.shape)
+                started = True
+            self.pool.submit(source, captured.image, captured.timestamp_ms)
+            self.stats[source]['submitted'] += 1
+
+    def step(self, timeout: float = 0.05) -> list:
+        """
+        处理已到达的识别结果，按时间顺序驱动各路的动作层
+
+        Returns:
+            list: (GestureEvent, 触发的动作或 None)，按时间戳排序
+        """
+        for message in self.pool.poll(timeout):
+            self.last_message = self.clock()
+            kind, source = message[0], message[1]
+            if kind == RESULT:
+                _, _, timestamp_ms, name, _, points, latency = message
+                self.merger.push(GestureEvent(source, timestamp_ms, GestureType[name], points,
+                                              latency))
+                self.stats[source]['results'] += 1
+            elif kind == ERROR:
+                self.errors[source] = message[2]
+        # 崩溃的识别进程自动重启（重启次数见 pool.restarts）
+        self.pool.revive()
+
+        return self._dispatch(self.merger.pop_ready(int(self.clock() * 1000)))
+
+    def _dispatch(self, events: list) -> list:
+        handled = []
+        for event in events:
+            self.clocks[event.source].update(event.timestamp_ms)
+            action = self.controllers[event.source].update(event.gesture, event.points)
+            handled.append((event, action))
+        return handled
+
+    @property
+    def starting(self) -> int:
+        """已启动、但还没报告 READY / ERROR 的识别进程数（模型还在加载）"""
+        return len(self.pool.streams) - len(self.pool.ready) - len(self.errors)
+
+    @property
+    def idle_time(self) -> float:
+        """距离上一次收到识别进程消息的秒数"""
+        return self.clock() - self.last_message
+
+    @property
+    def finished(self) -> bool:
+        """所有输入都结束了（视频文件放完）"""
+        return all(not thread.is_alive() for thread in self._threads)
+
+    def stop(self) -> list:
+        """停止采集和识别进程，返回还没放出的事件的处理结果"""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        for capture in self.captures.values():
+            capture.stop()
+        self.pool.stop()
+        return self._dispatch(self.merger.flush())
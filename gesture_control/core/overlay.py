@@ -0,0 +1,127 @@
+"""
+界面叠加层 - 只处理需要画的区域，文字渲染结果缓存
+
+原来每帧：frame.copy() + 整帧 addWeighted，只为了压暗顶部 35 像素的状态栏；
+状态文字、辅助线每帧重新光栅化。
+现在：
+- 状态栏只在顶部 ROI 上混合（预先准备好的底色）
+- 每种文字只光栅化一次，缓存成像素坐标，状态变化时才重新渲染
+- 辅助线按行直接赋值
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class TextSprite:
+    """
+    预渲染的文字：记录文字覆盖的像素坐标和覆盖度（抗锯齿边缘），
+    绘制时只对这些像素做 alpha 混合
+    """
+
+    __slots__ = ('ys', 'xs', 'alpha', 'tint')
+
+    def __init__(self, text: str, org: tuple, scale: float, thickness: int,
+                 color: tuple, size: tuple):
+        """
+        Args:
+            text, org, scale, thickness, color: 与 cv2.putText 相同
+            size: (高, 宽) 文字所在区域的大小
+        """
+        mask = np.zeros(size, dtype=np.uint8)
+        cv2.putText(mask, text, org, FONT, scale, 255, thickness)
+        self.ys, self.xs = np.nonzero(mask)
+        alpha = mask[self.ys, self.xs].astype(np.uint16)[:, None]
+        self.alpha = 255 - alpha                                   # 原像素权重
+        self.tint = alpha * np.array(color, dtype=np.uint16) + 127  # 文字颜色部分（含四舍五入）
+
+    def draw(self, image):
+        pixels = image[self.ys, self.xs]
+        image[self.ys, self.xs] = (pixels * self.alpha + self.tint) // 255
+
+
+class OverlayRenderer:
+    """
+    状态栏 + 滚动辅助线 + [PIN] 标记
+
+    用法：
+        overlay = OverlayRenderer()
+        overlay.render(frame, status, scrolling=True, pinned=False)
+    """
+
+    BAR_HEIGHT = 36            # 与原来的 rectangle((0, 0), (w, 35)) 一致（含端点）
+    BAR_COLOR = (40, 40, 40)
+    BAR_ALPHA = 0.75           # 底色占比
+    TEXT_COLOR = (0, 220, 0)
+    PIN_COLOR = (0, 255, 255)
+    MAX_SPRITES = 64           # 缓存上限（状态文字种类很少，超过说明有动态文字）
+
+    def __init__(self):
+        self.render_time = 0.0     # 累计耗时（秒）
+        self.rendered_frames = 0
+        self.sprite_renders = 0    # 文字光栅化次数
+        self._sprites = {}
+        self._fill = None
+        self._size = None
+
+    def render(self, frame, status: str, scrolling: bool = False, pinned: bool = False):
+        """在 frame 上原地绘制叠加层"""
+        start = time.perf_counter()
+
+        h, w = frame.shape[:2]
+        if self._size != (h, w):
+            self._resize(h, w)
+
+        bar = frame[:self.BAR_HEIGHT]
+        cv2.addWeighted(bar, 1 - self.BAR_ALPHA, self._fill, self.BAR_ALPHA, 0, dst=bar)
+        self._sprite(status, (10, 23), 0.6, 2, self.TEXT_COLOR).draw(bar)
+
+        if scrolling:
+            self._draw_scroll_guides(frame, h)
+
+        if pinned:
+            self._sprite("[PIN]", (w - 60, 20), 0.5, 1, self.PIN_COLOR).draw(bar)
+
+        self.render_time += time.perf_counter() - start
+        self.rendered_frames += 1
+
+    def _resize(self, h: int, w: int):
+        """分辨率变化：重建底色缓冲区，清空文字缓存（坐标跟宽度有关）"""
+        self._size = (h, w)
+        self._fill = np.empty((min(self.BAR_HEIGHT, h), w, 3), dtype=np.uint8)
+        self._fill[:] = self.BAR_COLOR
+        self._sprites.clear()
+
+    def _sprite(self, text: str, org: tuple, scale: float, thickness: int, color: tuple):
+        key = (text, org, scale, thickness, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            if len(self._sprites) >= self.MAX_SPRITES:
+                self._sprites.clear()
+            sprite = TextSprite(text, org, scale, thickness, color, self._fill.shape[:2])
+            self._sprites[key] = sprite
+            self.sprite_renders += 1
+        return sprite
+
+    @staticmethod
+    def _draw_scroll_guides(frame, h: int):
+        """滚动辅助线：中线 + 死区上下边界"""
+        center_y = h // 2
+        dead_zone = h // 6
+        frame[center_y] = (0, 200, 0)
+        frame[center_y - dead_zone] = (100, 100, 100)
+        frame[center_y + dead_zone] = (100, 100, 100)
+
+    def get_stats(self) -> dict:
+        """返回叠加层耗时统计"""
+        frames = max(self.rendered_frames, 1)
+        return {
+            'frames': self.rendered_frames,
+            'mean_ms': self.render_time / frames * 1000,
+            'sprite_renders': self.sprite_renders,
+        }
@@ -0,0 +1,85 @@
+"""
+帧预处理 - 预分配缓冲区，稳态循环不再分配图像内存
+
+原来每帧：cv2.flip 分配一张图，cv2.cvtColor 再分配一张图。
+现在两张图的缓冲区只在分辨率变化时分配一次，之后全部写进 dst=。
+"""
+
+import tracemalloc
+
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """
+    镜像 + BGR→RGB，复用缓冲区
+
+    用法：
+        pre = FramePreprocessor()
+        display, rgb = pre.process(frame)   # display: 镜像后的 BGR（画 UI），rgb: 送识别
+
+    注意：返回的数组下一帧会被覆盖，需要跨帧保存时自行 copy()
+    """
+
+    def __init__(self, mirror: bool = True):
+        """
+        Args:
+            mirror: 是否水平镜像（自拍视角）
+        """
+        self.mirror = mirror
+        self.allocations = 0   # 缓冲区分配次数（分辨率不变时应该只有 1 次）
+        self._display = None
+        self._rgb = None
+
+    def process(self, frame):
+        """
+        Args:
+            frame: 摄像头原始 BGR 图像
+
+        Returns:
+            (display, rgb): 镜像后的 BGR 图像、对应的 RGB 图像
+        """
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._display = np.empty_like(frame) if self.mirror else None
+            self._rgb = np.empty_like(frame)
+            self.allocations += 1
+
+        if self.mirror:
+            cv2.flip(frame, 1, dst=self._display)
+            display = self._display
+        else:
+            display = frame
+
+        cv2.cvtColor(display, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return display, self._rgb
+
+
+def steady_state_allocation(step, iterations: int = 50, warmup: int = 5) -> int:
+    """
+    用 tracemalloc 测量稳态循环的内存分配
+
+    先跑 warmup 次让缓冲区分配完毕，再跑 iterations 次，
+    返回这期间的峰值新增内存（字节）。
+    每帧分配一张图时峰值至少是一帧的大小；零分配时只有几百字节的解释器开销。
+
+    Args:
+        step: 无参可调用对象，执行一次循环体
+    """
+    for _ in range(warmup):
+        step()
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(iterations):
+            step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return peak - baseline
@@ -0,0 +1,159 @@
+"""
+独立进程预览窗口 - 预览再慢也拖不慢识别
+
+cv2.imshow / waitKey 在某些窗口管理器上要好几毫秒。
+无界面模式下，预览窗口放到子进程里：
+- 主进程把缩小后的画面写进共享内存（按预览帧率限速，不阻塞、不加锁）
+- 子进程自己 imshow / waitKey，按 'q' 或关窗时通知主进程退出
+
+共享内存用顺序锁（seqlock）保护：写之前序号 +1（奇数 = 正在写），写完再 +1。
+读者拷贝前后序号不变且为偶数，才算读到完整的一帧；写者永远不等读者。
+"""
+
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+
+class PreviewProcess:
+    """
+    预览子进程
+
+    用法：
+        preview = PreviewProcess(160, 120, fps=10).start()
+        preview.submit(frame)        # 每帧调用，内部限速
+        if preview.quit_requested: ...
+        preview.stop()
+    """
+
+    def __init__(self, width: int, height: int, fps: float = 10.0,
+                 window_name: str = 'Preview'):
+        """
+        Args:
+            width, height: 预览画面尺寸（主进程会把帧缩小到这个尺寸）
+            fps: 预览帧率上限
+            window_name: 窗口标题
+        """
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / fps
+        self.window_name = window_name
+        self.submitted_frames = 0
+        self._last_submit = None
+        self._shm = None
+        self._buffer = None
+        self._process = None
+        ctx = mp.get_context('spawn')   # GUI 库不能安全地 fork
+        self._ctx = ctx
+        self._seq = ctx.Value('Q', 0, lock=False)
+        self._stop = ctx.Event()
+        self._quit = ctx.Event()
+
+    def start(self):
+        """创建共享内存并启动子进程，返回自身方便链式调用"""
+        shape = (self.height, self.width, 3)
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self._buffer = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._buffer[:] = 0
+        self._process = self._ctx.Process(
+            target=_preview_main,
+            args=(self._shm.name, shape, self._seq, self._stop, self._quit,
+                  self.interval, self.window_name),
+            name='preview',
+            daemon=True,
+        )
+        self._process.start()
+        return self
+
+    def submit(self, frame) -> bool:
+        """
+        提交一帧（BGR，任意尺寸）
+
+        Returns:
+            bool: 本帧是否写入了预览（被限速时返回 False）
+        """
+        now = time.monotonic()
+        if self._last_submit is not None and now - self._last_submit < self.interval:
+            return False
+        self._last_submit = now
+
+        self._seq.value += 1   # 奇数：正在写
+        cv2.resize(frame, (self.width, self.height), dst=self._buffer,
+                   interpolation=cv2.INTER_AREA)
+        self._seq.value += 1   # 偶数：写完
+        self.submitted_frames += 1
+        return True
+
+    @property
+    def quit_requested(self) -> bool:
+        """用户是否在预览窗口里按了 'q' 或关闭了窗口"""
+        return self._quit.is_set()
+
+    def stop(self):
+        """关闭子进程并释放共享内存"""
+        self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._shm is not None:
+            self._buffer = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def read_frame(buffer, seq, out) -> int:
+    """
+    从共享内存读取一帧完整画面（seqlock 读端）
+
+    Returns:
+        int: 读到的帧序号；写者正在写时返回 -1
+    """
+    before = seq.value
+    if before % 2:
+        return -1
+    np.copyto(out, buffer)
+    if seq.value != before:
+        return -1
+    return before
+
+
+def _preview_main(shm_name, shape, seq, stop, quit_event, interval, window_name):
+    """子进程入口：只负责显示"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        frame = np.zeros(shape, dtype=np.uint8)
+        last_seq = 0
+        pinned = False
+        delay_ms = max(1, int(interval * 1000))
+
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, shape[1], shape[0])
+
+        while not stop.is_set():
+            current = read_frame(buffer, seq, frame)
+            if current > last_seq:
+                last_seq = current
+                cv2.imshow(window_name, frame)
+
+            key = cv2.waitKey(delay_ms) & 0xFF
+            if key == ord('q'):
+                quit_event.set()
+                break
+            elif key == ord('p'):
+                pinned = not pinned
+                cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1.0 if pinned else 0.0)
+
+            if last_seq and cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
+                quit_event.set()
+                break
+
+        cv2.destroyAllWindows()
+    finally:
+        shm.close()
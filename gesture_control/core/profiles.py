@@ -0,0 +1,270 @@
+"""
+手势绑定配置 - 每个目标应用一个 JSON / TOML 文件，描述 手势 → 动作类（core/actions.py）
+
+格式（JSON 与 TOML 结构相同）：
+    name = "presentation"
+    [bindings.SWIPE_LEFT]                      # 手势：MediaPipe 名称或 GestureType 名
+    type = "repeat"                            # timed / repeat / position / release / idle
+    hold_time = 0
+    key = "left"
+    description = "Previous slide"
+
+    [bindings.Closed_Fist]
+    type = "timed"
+    thresholds = [[0.3, "b", "Blank screen"], [2.0, "escape", "End show"]]
+
+挥手（SWIPE_*）没有保持时间，只能绑定阈值为 0 的 timed 或 hold_time 为 0 的 repeat。
+
+加载时一次性检查并编译成按 GestureType 编号索引的扁平表，每帧只做一次下标查找。
+ProfileWatcher 定期 stat 文件，修改后重新编译并原子替换表 ——
+识别器、摄像头都不用重启；新文件有错时打印原因并继续用旧表。
+"""
+
+import json
+import os
+import time
+
+from .actions import IdleAction, OnReleaseAction, PositionAction, RepeatKeyAction, TimedAction
+from .gestures import GESTURE_MAP, GestureType
+
+try:
+    import tomllib
+except ImportError:   # Python < 3.11 没有 tomllib，只能用 JSON
+    tomllib = None
+
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'profiles')
+
+
+def _field(spec: dict, name: str, kinds, gesture: str, default=None):
+    """取一个字段并检查类型（bool 不算数字）"""
+    value = spec.get(name, default)
+    if value is None:
+        raise ValueError(f"Binding {gesture}: missing '{name}'")
+    if isinstance(value, bool) or not isinstance(value, kinds):
+        raise ValueError(f"Binding {gesture}: invalid '{name}': {value!r}")
+    return value
+
+
+def _number(spec, name, gesture, default=None):
+    return float(_field(spec, name, (int, float), gesture, default))
+
+
+def _timed(spec, gesture, dispatcher, frame_height, trigger):
+    thresholds = _field(spec, 'thresholds', list, gesture)
+    if not thresholds:
+        raise ValueError(f"Binding {gesture}: 'thresholds' is empty")
+    parsed = []
+    for item in thresholds:
+        if (not isinstance(item, (list, tuple)) or len(item) != 3
+                or not isinstance(item[0], (int, float)) or not isinstance(item[1], str)):
+            raise ValueError(f"Binding {gesture}: thresholds must be [seconds, key, description]")
+        parsed.append((float(item[0]), item[1], str(item[2])))
+    return TimedAction(parsed, dispatcher, trigger=trigger() if trigger is not None else None)
+
+
+def _repeat(spec, gesture, dispatcher, frame_height, trigger):
+    key = _field(spec, 'key', str, gesture)
+    return RepeatKeyAction(_number(spec, 'hold_time', gesture, 0.0), key,
+                           int(_number(spec, 'count', gesture, 1)),
+                           spec.get('description', key), dispatcher)
+
+
+def _position(spec, gesture, dispatcher, frame_height, trigger):
+    return PositionAction(frame_height, dispatcher)
+
+
+def _release(spec, gesture, dispatcher, frame_height, trigger):
+    key = _field(spec, 'key', str, gesture)
+    return OnReleaseAction(_number(spec, 'min_time', gesture), _number(spec, 'max_time', gesture),
+                           key, spec.get('description', key), dispatcher)
+
+
+def _idle(spec, gesture, dispatcher, frame_height, trigger):
+    return IdleAction(_field(spec, 'message', str, gesture))
+
+
+# 挥手是一瞬间的事件：控制器用新的状态机、保持时间 0 执行一次绑定
+SWIPES = (GestureType.SWIPE_LEFT, GestureType.SWIPE_RIGHT,
+          GestureType.SWIPE_UP, GestureType.SWIPE_DOWN)
+
+
+def _check_swipe(action, gesture: str):
+    """挥手绑定必须在保持时间 0 时就能执行，否则加载成功却永远不会触发"""
+    if isinstance(action, TimedAction):
+        if any(seconds > 0 for seconds, _, _ in action.thresholds):
+            raise ValueError(f"Binding {gesture}: swipe thresholds must be 0 (a swipe has no hold)")
+    elif isinstance(action, RepeatKeyAction):
+        if action.hold_time > 0:
+            raise ValueError(f"Binding {gesture}: swipe 'hold_time' must be 0 "
+                             f"(a swipe has no hold)")
+    else:
+        raise ValueError(f"Binding {gesture}: swipe bindings must be 'timed' or 'repeat'")
+
+
+ACTION_TYPES = {
+    'timed': _timed,
+    'repeat': _repeat,
+    'position': _position,
+    'release': _release,
+    'idle': _idle,
+}
+
+
+def parse_gesture(name: str) -> GestureType:
+    """绑定里的手势名 → GestureType（MediaPipe 名称或枚举名，严格匹配）"""
+    gesture = GESTURE_MAP.get(name) or GestureType.__members__.get(name)
+    if gesture is None or gesture == GestureType.NONE:
+        raise ValueError(f"Unknown gesture: {name}")
+    return gesture
+
+
+class Profile:
+    """
+    编译好的绑定表
+
+    table 按 GestureType.value 索引，没有绑定的位置为 None
+    """
+
+    def __init__(self, name: str, table: list, descriptions: dict):
+        self.name = name
+        self.table = table
+        self.descriptions = descriptions   # GestureType → 显示用的描述
+
+    def get(self, gesture: GestureType):
+        """手势对应的动作（GestureAction），没有绑定返回 None"""
+        return self.table[gesture.value]
+
+    def describe(self) -> list:
+        """[(手势名, 描述)]，用于启动时打印"""
+        return [(gesture.name, text) for gesture, text in self.descriptions.items()]
+
+
+def compile_profile(data: dict, dispatcher=None, frame_height: int = 240,
+                    trigger=None) -> Profile:
+    """
+    检查并编译一份配置
+
+    Args:
+        data: 解析后的 JSON / TOML 内容
+        dispatcher: 动作用的 ActionDispatcher（回放时为 RecordingDispatcher）
+        frame_height: 画面高度（PositionAction 的死区按它算）
+        trigger: 可选，无参可调用对象，为每个 timed 绑定创建一个证据触发器（core/trigger.py）
+
+    Raises:
+        ValueError: 格式错误（未知手势、未知类型、缺字段、挥手绑定了保持时间）
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('bindings'), dict):
+        raise ValueError("Profile needs a 'bindings' table")
+    table = [None] * (max(gesture.value for gesture in GestureType) + 1)
+    descriptions = {}
+    for name, spec in data['bindings'].items():
+        gesture = parse_gesture(name)
+        if not isinstance(spec, dict):
+            raise ValueError(f"Binding {name}: expected a table")
+        build = ACTION_TYPES.get(spec.get('type'))
+        if build is None:
+            raise ValueError(f"Binding {name}: unknown type {spec.get('type')!r} "
+                             f"(choose from {', '.join(ACTION_TYPES)})")
+        action = build(spec, name, dispatcher, frame_height, trigger)
+        if gesture in SWIPES:
+            _check_swipe(action, name)
+        table[gesture.value] = action
+        descriptions[gesture] = _description(spec)
+    return Profile(str(data.get('name', 'profile')), table, descriptions)
+
+
+def _description(spec: dict) -> str:
+    if spec['type'] == 'timed':
+        return ' / '.join(f"{text} ({seconds:g}s)" for seconds, _, text in spec['thresholds'])
+    if spec['type'] == 'position':
+        return 'Scroll by finger height'
+    return spec.get('description') or spec.get('message') or spec.get('key', '')
+
+
+def resolve_profile(name: str) -> str:
+    """配置文件路径；不是现有文件时在自带的 profiles/ 目录里按名字找（.json / .toml）"""
+    if os.path.isfile(name):
+        return name
+    for ext in ('', '.json', '.toml'):
+        path = os.path.join(PROFILE_DIR, name + ext)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"Profile not found: {name}")
+
+
+def read_profile(path: str) -> dict:
+    """按扩展名读 JSON / TOML"""
+    if path.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError("TOML profiles need Python 3.11+ (use JSON instead)")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_profile(path: str, dispatcher=None, frame_height: int = 240, trigger=None) -> Profile:
+    """读取并编译一个配置文件（参数同 compile_profile）"""
+    return compile_profile(read_profile(path), dispatcher, frame_height, trigger)
+
+
+class ProfileWatcher:
+    """
+    配置热加载
+
+    poll() 最多每 interval 秒 stat 一次文件，大小或修改时间变了就重新编译；
+    编译好再整体替换 self.profile（一次赋值），识别回调线程里读到的总是完整的表。
+    手势正在保持时换表，新表的动作从下一段手势开始计时。
+    """
+
+    def __init__(self, path: str, dispatcher=None, frame_height: int = 240, trigger=None,
+                 interval: float = 1.0, clock=time.monotonic):
+        """
+        Args:
+            path: 配置文件
+            interval: 检查文件的间隔（秒）
+            clock: 检查间隔用的时钟
+            其余参数同 compile_profile
+        """
+        self.path = path
+        self.dispatcher = dispatcher
+        self.frame_height = frame_height
+        self.trigger = trigger
+        self.interval = interval
+        self.clock = clock
+        self.reloads = 0
+        self.error = None
+        self._stamp = self._stat()
+        self._checked = clock()
+        self.profile = load_profile(path, dispatcher, frame_height, trigger)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self) -> bool:
+        """文件变了就重新加载；返回是否换了新表"""
+        now = self.clock()
+        if now - self._checked < self.interval:
+            return False
+        self._checked = now
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            profile = load_profile(self.path, self.dispatcher, self.frame_height, self.trigger)
+        except (OSError, ValueError) as e:   # JSON / TOML 解析错误也是 ValueError
+            self.error = str(e)
+            print(f"⚠️ Profile {self.path} not reloaded: {e}")
+            return False
+        self.profile = profile
+        self.error = None
+        self.reloads += 1
+        print(f"🔄 Profile reloaded: {profile.name}")
+        return True
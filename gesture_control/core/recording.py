@@ -0,0 +1,182 @@
+"""
+会话录制 - 把每帧的识别结果存成紧凑的 NumPy 文件
+
+只存模型输出（关键点、手势分数、时间戳），不存画面：
+每只手每帧约 0.5KB，压缩后一小时的会话也只有几十 MB。
+回放时不需要摄像头和模型（见 gesture_control.replay）。
+
+文件格式（np.savez_compressed）：
+    version          ()                 格式版本
+    frame_size       (2,)               画面宽、高
+    categories       (C,)               分数列对应的手势名称
+    timestamps_ms    (N,)      int64    帧时间戳
+    num_hands        (N,)      uint8    检测到的手数
+    handedness       (N, H)    int8     0 = Left, 1 = Right, -1 = 无
+    landmarks        (N, H, 21, 3)      整帧归一化关键点 (x, y, z)
+    world_landmarks  (N, H, 21, 3)      世界坐标关键点（米）
+    scores           (N, H, C) float32  每个手势类别的分数（模型没给出的为 0）
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .roi import Landmark
+
+
+FORMAT_VERSION = 1
+NUM_LANDMARKS = 21
+HANDEDNESS_NAMES = ('Left', 'Right')
+
+# 官方手势模型的全部类别（'None' 表示识别到手但不是任何手势）
+CATEGORY_NAMES = (
+    'None', 'Closed_Fist', 'Open_Palm', 'Pointing_Up',
+    'Thumb_Down', 'Thumb_Up', 'Victory', 'ILoveYou',
+)
+
+# 回放时重建的结果对象，字段与 MediaPipe 的同名对象一致
+Category = namedtuple('Category', ['category_name', 'score'])
+ReplayResult = namedtuple('ReplayResult',
+                          ['gestures', 'handedness', 'hand_landmarks', 'hand_world_landmarks'])
+
+
+class SessionRecorder:
+    """
+    录制器 - 数组按倍增预分配，每帧只做几次切片赋值
+
+    用法：
+        recorder = SessionRecorder('session.npz')
+        recorder.record(timestamp_ms, result, hand_landmarks, width, height)
+        recorder.close()   # 写文件
+    """
+
+    def __init__(self, path: str, max_hands: int = 2, categories=CATEGORY_NAMES,
+                 initial_capacity: int = 1024):
+        self.path = path
+        self.max_hands = max_hands
+        self.categories = tuple(categories)
+        self._category_index = {name: i for i, name in enumerate(self.categories)}
+        self.frame_size = (0, 0)
+        self.frames = 0
+        self._allocate(initial_capacity)
+
+    def _allocate(self, capacity: int):
+        h, c = self.max_hands, len(self.categories)
+        new = {
+            'timestamps_ms': np.zeros(capacity, dtype=np.int64),
+            'num_hands': np.zeros(capacity, dtype=np.uint8),
+            'handedness': np.full((capacity, h), -1, dtype=np.int8),
+            'landmarks': np.zeros((capacity, h, NUM_LANDMARKS, 3), dtype=np.float32),
+            'world_landmarks': np.zeros((capacity, h, NUM_LANDMARKS, 3), dtype=np.float32),
+            'scores': np.zeros((capacity, h, c), dtype=np.float32),
+        }
+        if hasattr(self, '_arrays'):
+            for name, array in self._arrays.items():
+                new[name][:self.frames] = array[:self.frames]
+        self._arrays = new
+        self.capacity = capacity
+
+    def record(self, timestamp_ms: int, result, hand_landmarks, frame_width: int,
+               frame_height: int):
+        """
+        记录一帧
+
+        Args:
+            timestamp_ms: 帧时间戳
+            result: 识别结果（用其中的 gestures / handedness / hand_world_landmarks）
+            hand_landmarks: 整帧坐标的关键点（ROI 模式下已映射回整帧）
+            frame_width, frame_height: 画面尺寸
+        """
+        if self.frames == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        i = self.frames
+        a = self._arrays
+        self.frame_size = (frame_width, frame_height)
+        a['timestamps_ms'][i] = timestamp_ms
+
+        hands = min(len(hand_landmarks), self.max_hands)
+        a['num_hands'][i] = hands
+        world = getattr(result, 'hand_world_landmarks', None) or []
+        gestures = getattr(result, 'gestures', None) or []
+        handedness = getattr(result, 'handedness', None) or []
+
+        for hand in range(hands):
+            a['landmarks'][i, hand] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks[hand]]
+            if hand < len(world):
+                a['world_landmarks'][i, hand] = [(lm.x, lm.y, lm.z) for lm in world[hand]]
+            if hand < len(handedness) and handedness[hand]:
+                name = handedness[hand][0].category_name
+                a['handedness'][i, hand] = HANDEDNESS_NAMES.index(name) if name in HANDEDNESS_NAMES else -1
+            if hand < len(gestures):
+                for category in gestures[hand]:
+                    column = self._category_index.get(category.category_name)
+                    if column is not None:
+                        a['scores'][i, hand, column] = category.score
+
+        self.frames += 1
+
+    def save(self):
+        """写文件（只写已录制的部分）"""
+        n = self.frames
+        np.savez_compressed(
+            self.path,
+            version=np.array(FORMAT_VERSION),
+            frame_size=np.array(self.frame_size, dtype=np.int32),
+            categories=np.array(self.categories),
+            **{name: array[:n] for name, array in self._arrays.items()},
+        )
+
+    def close(self):
+        """保存并结束录制"""
+        self.save()
+
+
+class Recording:
+    """加载后的会话录制，可按帧重建识别结果"""
+
+    def __init__(self, arrays: dict):
+        version = int(arrays['version'])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {version}")
+        self.frame_size = tuple(int(v) for v in arrays['frame_size'])
+        self.categories = tuple(str(c) for c in arrays['categories'])
+        self.timestamps_ms = arrays['timestamps_ms']
+        self.num_hands = arrays['num_hands']
+        self.handedness = arrays['handedness']
+        self.landmarks = arrays['landmarks']
+        self.world_landmarks = arrays['world_landmarks']
+        self.scores = arrays['scores']
+
+    def __len__(self):
+        return len(self.timestamps_ms)
+
+    @property
+    def duration(self) -> float:
+        """录制时长（秒）"""
+        if len(self) < 2:
+            return 0.0
+        return (int(self.timestamps_ms[-1]) - int(self.timestamps_ms[0])) / 1000
+
+    def result_at(self, i: int) -> ReplayResult:
+        """重建第 i 帧的识别结果（字段与 MediaPipe GestureRecognizerResult 一致）"""
+        gestures, handedness, landmarks, world = [], [], [], []
+        for hand in range(int(self.num_hands[i])):
+            landmarks.append([Landmark(*p) for p in self.landmarks[i, hand].tolist()])
+            world.append([Landmark(*p) for p in self.world_landmarks[i, hand].tolist()])
+
+            side = int(self.handedness[i, hand])
+            handedness.append([Category(HANDEDNESS_NAMES[side], 1.0)] if side >= 0 else [])
+
+            scores = self.scores[i, hand]
+            order = np.argsort(-scores, kind='stable')
+            gestures.append([Category(self.categories[c], float(scores[c]))
+                             for c in order if scores[c] > 0])
+
+        return ReplayResult(gestures, handedness, landmarks, world)
+
+
+def load_recording(path: str) -> Recording:
+    """加载 SessionRecorder 写出的文件"""
+    with np.load(path, allow_pickle=False) as data:
+        return Recording({name: data[name] for name in data.files})
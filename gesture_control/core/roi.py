@@ -0,0 +1,108 @@
+"""
+手部 ROI 跟踪 - 只把手附近的区域送去识别
+
+上一帧的关键点已经告诉我们手在哪里：
+在它周围取一个带边距的正方形裁剪区域，识别完再把关键点映射回整帧坐标。
+跟丢（裁剪区域里没有手）时下一帧回退到整帧检测。
+"""
+
+from collections import namedtuple
+
+
+# 映射回整帧后的关键点（与 MediaPipe NormalizedLandmark 一样有 x/y/z）
+Landmark = namedtuple('Landmark', ['x', 'y', 'z'])
+
+
+class HandROITracker:
+    """
+    ROI 跟踪器
+
+    区域有 "惯性"：手还在区域内圈时保持区域不动，
+    避免每帧裁剪位置都变 —— MediaPipe 的帧间跟踪也更稳定
+    """
+
+    def __init__(self, padding: float = 0.6, min_size: int = 96,
+                 full_frame_interval: int = 30):
+        """
+        Args:
+            padding: 边距，相对手部包围盒边长的比例（每边）
+            min_size: 裁剪区域最小边长（像素）
+            full_frame_interval: 每隔多少帧强制整帧检测一次（发现画面里的其他手）
+        """
+        self.padding = padding
+        self.min_size = min_size
+        self.full_frame_interval = full_frame_interval
+        self.region = None          # 当前裁剪区域 (x0, y0, x1, y1)，None = 整帧
+        self.frames_since_full = 0
+        self.roi_frames = 0         # 使用裁剪区域的帧数
+        self.full_frames = 0        # 整帧识别的帧数
+
+    def next_region(self):
+        """
+        本帧要识别的区域
+
+        Returns:
+            (x0, y0, x1, y1) 像素坐标，或 None 表示整帧
+        """
+        if self.region is not None and self.frames_since_full < self.full_frame_interval:
+            self.frames_since_full += 1
+            self.roi_frames += 1
+            return self.region
+
+        self.frames_since_full = 0
+        self.full_frames += 1
+        return None
+
+    def to_full_frame(self, landmarks, region, frame_width: int, frame_height: int) -> list:
+        """把裁剪区域内的归一化关键点映射回整帧归一化坐标"""
+        if region is None:
+            return landmarks
+
+        x0, y0, x1, y1 = region
+        sx = (x1 - x0) / frame_width
+        sy = (y1 - y0) / frame_height
+        ox = x0 / frame_width
+        oy = y0 / frame_height
+        return [Landmark(ox + lm.x * sx, oy + lm.y * sy, lm.z * sx) for lm in landmarks]
+
+    def update(self, landmarks, frame_width: int, frame_height: int):
+        """
+        用本帧（整帧坐标的）关键点更新区域
+
+        Args:
+            landmarks: 整帧归一化关键点；None 或空表示跟丢
+        """
+        if not landmarks:
+            self.reset()
+            return
+
+        xs = [lm.x * frame_width for lm in landmarks]
+        ys = [lm.y * frame_height for lm in landmarks]
+        left, right = min(xs), max(xs)
+        top, bottom = min(ys), max(ys)
+
+        # 手还在当前区域的内圈：保持不动
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            margin = (x1 - x0) * self.padding / (1 + 2 * self.padding) / 2
+            if (left >= x0 + margin and right <= x1 - margin and
+                    top >= y0 + margin and bottom <= y1 - margin):
+                return
+
+        size = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        size = int(max(size, self.min_size))
+        if size >= min(frame_width, frame_height):
+            # 区域已经接近整帧，裁剪没有意义
+            self.region = None
+            return
+
+        cx = (left + right) / 2
+        cy = (top + bottom) / 2
+        x0 = int(min(max(cx - size / 2, 0), frame_width - size))
+        y0 = int(min(max(cy - size / 2, 0), frame_height - size))
+        self.region = (x0, y0, x0 + size, y0 + size)
+
+    def reset(self):
+        """跟丢：下一帧回退到整帧"""
+        self.region = None
+        self.frames_since_full = 0
@@ -0,0 +1,102 @@
+"""
+共享内存帧环 - 进程之间传画面不走 pickle
+
+一块共享内存 = 头部 + N 个帧槽：
+    头部  (N,) int64   每个槽当前帧的序号；-1 表示正在写
+    帧槽  (N, H, W, 3) uint8
+
+写端（采集线程）轮流写槽位，写前把序号置 -1，写完再填上帧序号；
+读端（识别进程）拷贝前后序号都等于期望值，才算拿到完整的一帧 ——
+和 preview.py 一样是顺序锁，写端永远不等读端。读端跟不上时旧帧被覆盖，读到的是 "过期"，直接丢掉。
+"""
+
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+
+_HEADER_DTYPE = np.int64
+_WRITING = -1
+
+
+class SharedFrameRing:
+    """
+    固定尺寸的共享内存帧环
+
+    用法：
+        ring = SharedFrameRing((240, 320, 3), slots=4)          # 主进程创建
+        slot, index = ring.write(frame)
+        ...
+        ring = SharedFrameRing.attach(name, (240, 320, 3), 4)   # 子进程打开
+        ok = ring.read(slot, index, out)
+    """
+
+    def __init__(self, shape, slots: int = 4, name: str = None):
+        """
+        Args:
+            shape: 帧形状 (H, W, 3)
+            slots: 槽位数
+            name: 已有共享内存的名字（attach 用）；None 表示新建
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        header_size = slots * np.dtype(_HEADER_DTYPE).itemsize
+        frame_size = int(np.prod(self.shape))
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner,
+                                               size=header_size + slots * frame_size)
+        self.name = self._shm.name
+        self.header = np.ndarray((slots,), dtype=_HEADER_DTYPE, buffer=self._shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf,
+                                 offset=header_size)
+        if self._owner:
+            self.header[:] = _WRITING
+        self.written = 0
+
+    @classmethod
+    def attach(cls, name: str, shape, slots: int):
+        """打开别的进程创建的帧环"""
+        return cls(shape, slots, name=name)
+
+    def write(self, frame) -> tuple:
+        """
+        写入一帧（尺寸不同时缩放到帧环尺寸）
+
+        Returns:
+            (slot, index): 槽位和帧序号（从 1 开始），交给读端
+        """
+        self.written += 1
+        index = self.written
+        slot = index % self.slots
+        self.header[slot] = _WRITING
+        if frame.shape == self.shape:
+            np.copyto(self.frames[slot], frame)
+        else:
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=self.frames[slot],
+                       interpolation=cv2.INTER_AREA)
+        self.header[slot] = index
+        return slot, index
+
+    def read(self, slot: int, index: int, out: np.ndarray) -> bool:
+        """
+        把槽位里的帧拷到 out
+
+        Returns:
+            bool: False 表示这一帧已经被覆盖（或正在被覆盖）
+        """
+        if self.header[slot] != index:
+            return False
+        np.copyto(out, self.frames[slot])
+        return self.header[slot] == index
+
+    def close(self):
+        """断开映射；创建者同时释放共享内存"""
+        if self._shm is None:
+            return
+        self.header = None
+        self.frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
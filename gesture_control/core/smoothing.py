@@ -0,0 +1,152 @@
+"""
+手势平滑 - 把逐帧的原始识别结果变成稳定的 "确认手势"
+
+两种平滑器，接口相同：update(raw, scores=None) → 确认后的手势
+    vote      GestureSmoother：最近 N 帧 top-1 多数投票（原来的做法）
+    evidence  EvidenceSmoother：全部类别的置信度在滑动窗口里累加，带进入/退出迟滞
+
+scores 是本帧一只手的类别分布 {GestureType: 置信度}；不传时按 {raw: 1.0} 处理，
+raw 为 NONE 且没有 scores 表示手不在画面里 —— 两种平滑器都立即重置。
+"""
+
+from collections import Counter, deque
+
+from .gestures import GestureType, gesture_from_name
+
+
+class GestureSmoother:
+    """多帧平滑 - 多数投票（好品味：不要求全部相同）"""
+
+    def __init__(self, window: int = 3):
+        self.window = window
+        self.history = deque(maxlen=window)
+        self.confirmed = GestureType.NONE
+
+    def update(self, raw_gesture: GestureType, scores: dict = None) -> GestureType:
+        """加入一帧原始手势，返回确认后的手势（只看 top-1，scores 不用）"""
+        self.history.append(raw_gesture)
+        if len(self.history) >= self.window:
+            # 统计最常出现的手势
+            most_common_gesture, count = Counter(self.history).most_common(1)[0]
+
+            # 多数投票：至少 2/3 帧相同（3 帧中至少 2 帧）
+            if count >= (self.window * 2 // 3):
+                self.confirmed = most_common_gesture
+
+            # 手离开时快速重置（优先级更高）
+            if raw_gesture == GestureType.NONE:
+                self.confirmed = GestureType.NONE
+        return self.confirmed
+
+    def reset(self):
+        self.history.clear()
+        self.confirmed = GestureType.NONE
+
+
+class EvidenceSmoother:
+    """
+    置信度加权的证据累加 + 迟滞
+
+    每个手势的证据 = 它在自己窗口内各帧置信度之和 / 窗口长度（手刚出现时不足的帧按 0 算）。
+    窗口和按帧增量更新（加上新帧、减去滑出窗口的那一帧），不重新统计历史，
+    每帧的工作量与窗口长度无关。
+    置信度 0.95 的手势两帧就能过 enter=0.6，0.6 左右的要三帧；
+    确认之后证据跌破 exit 才放开，单帧抖动不会来回切换。
+    """
+
+    def __init__(self, window: int = 3, enter: float = 0.6, exit: float = 0.35,
+                 windows: dict = None):
+        """
+        Args:
+            window: 默认窗口帧数
+            enter: 证据达到多少才确认一个新手势
+            exit: 已确认的手势证据低于多少才放开（exit < enter）
+            windows: 单个手势的窗口帧数 {GestureType 或名字: 帧数}，比如让滚动更快确认
+        """
+        if not 0 < exit <= enter:
+            raise ValueError(f"Need 0 < exit <= enter, got enter={enter} exit={exit}")
+        self.window = window
+        self.enter = enter
+        self.exit = exit
+        self.windows = {gesture: window for gesture in GestureType}
+        for key, frames in (windows or {}).items():
+            self.windows[gesture_from_name(key) if isinstance(key, str) else key] = int(frames)
+        self._sizes = sorted(set(self.windows.values()))
+        self._ring = [None] * max(self._sizes)   # 最近的帧：{GestureType: 置信度}
+        self._sums = dict.fromkeys(GestureType, 0.0)
+        self._frames = 0
+        self.confirmed = GestureType.NONE
+
+    def update(self, raw_gesture: GestureType, scores: dict = None) -> GestureType:
+        """加入一帧（raw + 可选的完整类别分布），返回确认后的手势"""
+        if scores is None:
+            scores = {raw_gesture: 1.0} if raw_gesture != GestureType.NONE else None
+        if not scores:
+            self.reset()   # 手离开：立即放开
+            return self.confirmed
+
+        sums, windows, ring = self._sums, self.windows, self._ring
+        # 增量更新：每个手势减去刚滑出它自己窗口的那一帧
+        for size in self._sizes:
+            leaving = ring[(self._frames - size) % len(ring)]
+            if leaving is not None:
+                for gesture, score in leaving.items():
+                    if windows[gesture] == size:
+                        sums[gesture] = max(sums[gesture] - score, 0.0)   # 浮点误差不让证据变负
+        for gesture, score in scores.items():
+            sums[gesture] += score
+        ring[self._frames % len(ring)] = dict(scores)
+        self._frames += 1
+
+        self.confirmed = self._decide()
+        return self.confirmed
+
+    def _decide(self) -> GestureType:
+        current = self.confirmed
+        if current != GestureType.NONE and self.score(current) < self.exit:
+            current = GestureType.NONE
+
+        # NONE 不需要 "进入"：没有别的手势够格时就是 NONE；只看本窗口里出现过的手势
+        best, best_score = None, 0.0
+        for gesture, total in self._sums.items():
+            if total > 0.0 and gesture != GestureType.NONE:
+                score = total / self.windows[gesture]
+                if score > best_score:
+                    best, best_score = gesture, score
+        # 留一点浮点余量：连续三帧 0.6 的平均值算出来是 0.5999...
+        if (best is not None and best != current and best_score >= self.enter - 1e-9
+                and best_score > self.score(current)):
+            current = best
+        return current
+
+    def score(self, gesture: GestureType) -> float:
+        """某个手势当前的证据"""
+        return self._sums[gesture] / self.windows[gesture]
+
+    def reset(self):
+        self._ring = [None] * len(self._ring)
+        self._sums = dict.fromkeys(GestureType, 0.0)
+        self._frames = 0
+        self.confirmed = GestureType.NONE
+
+
+SMOOTHERS = {
+    'vote': GestureSmoother,
+    'evidence': EvidenceSmoother,
+}
+
+
+def create_smoother(kind: str = 'vote', window: int = 3, **options):
+    """
+    按名字创建平滑器
+
+    Args:
+        kind: 'vote' 或 'evidence'
+        window: 窗口帧数
+        options: EvidenceSmoother 的 enter / exit / windows
+    """
+    if kind not in SMOOTHERS:
+        raise ValueError(f"Unknown smoothing: {kind} (choose from {', '.join(SMOOTHERS)})")
+    if kind == 'vote':
+        return GestureSmoother(window)
+    return EvidenceSmoother(window, **options)
@@ -0,0 +1,84 @@
+"""
+启动加速 - 模型加载与打开摄像头并行、启动耗时分解
+
+原来的启动是串行的：import mediapipe → 读模型建识别器 → 打开摄像头 → 第一帧。
+打开摄像头（V4L2 协商格式、曝光稳定）和加载模型都要几百毫秒到一两秒，互不依赖：
+    startup = StartupTimer()
+    camera = startup.background('camera', cv2.VideoCapture, CAMERA_ID)   # 后台线程
+    with startup.stage('recognizer'):
+        recognizer = GestureRecognizer(...)                             # 主线程
+    cap = camera.result()
+第一帧识别完成时 startup.mark('first_result') 并打印 report()，
+里面有延迟导入（core/lazy.py）各模块的耗时、各阶段耗时和到第一帧/第一个结果的时间。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .lazy import IMPORT_TIMES
+
+
+class StartupTimer:
+    """
+    启动计时
+
+    stages 是各阶段自己的耗时（后台阶段与主线程重叠），
+    marks 是从创建计时器起到某个时刻的时间（第一帧、第一个结果）。
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.stages = {}   # 阶段名 → 耗时（秒）
+        self.marks = {}    # 时刻名 → 距离启动的时间（秒）
+        self.parallel = set()   # 在后台线程里跑的阶段
+        self._lock = threading.Lock()
+
+    def timed(self, name: str, func, *args, **kwargs):
+        """计时执行 func(*args, **kwargs)，返回它的结果"""
+        with self.stage(name):
+            return func(*args, **kwargs)
+
+    @contextmanager
+    def stage(self, name: str):
+        """with startup.stage('recognizer'): ..."""
+        t = self.clock()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.clock() - t
+
+    def background(self, name: str, func, *args, **kwargs):
+        """在后台线程里计时执行 func，返回 concurrent.futures.Future（result() 取结果）"""
+        self.parallel.add(name)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        future = executor.submit(self.timed, name, func, *args, **kwargs)
+        executor.shutdown(wait=False)
+        return future
+
+    def mark(self, name: str) -> bool:
+        """记录一个时刻；只记第一次（可以在识别回调线程里调用），第一次返回 True"""
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = self.clock() - self.started
+            return True
+
+    def summary(self) -> dict:
+        """{'imports', 'stages', 'marks'}，单位毫秒"""
+        return {
+            'imports': {name: s * 1000 for name, s in IMPORT_TIMES.items()},
+            'stages': {name: s * 1000 for name, s in self.stages.items()},
+            'marks': {name: s * 1000 for name, s in self.marks.items()},
+        }
+
+    def report(self) -> str:
+        """一行启动耗时分解"""
+        parts = [f"import {name} {s * 1000:.0f}ms" for name, s in IMPORT_TIMES.items()
+                 if s >= 0.001]
+        parts += [f"{name} {s * 1000:.0f}ms" + (" (parallel)" if name in self.parallel else "")
+                  for name, s in self.stages.items()]
+        parts += [f"{name.replace('_', ' ')} {s:.2f}s" for name, s in self.marks.items()]
+        return "Startup: " + " | ".join(parts)
@@ -3,7 +3,7 @@
 单一职责：跟踪当前手势并提供精确的保持时间
 """
 
-import time
+from .clock import MONOTONIC
 from .gestures import GestureType
 
 
@@ -17,7 +17,12 @@ class GestureStateMachine:
     - 自动处理手势切换和重置
     """
 
-    def __init__(self):
+    def __init__(self, clock=None):
+        """
+        Args:
+            clock: 时钟（core/clock.py），默认单调时钟
+        """
+        self.clock = clock if clock is not None else MONOTONIC
         self.current_gesture = GestureType.NONE
         self.start_time = 0.0
         self.executed_thresholds = set()  # 已执行的时间阈值（避免重复触发）
@@ -32,7 +37,7 @@ class GestureStateMachine:
         Returns:
             float: 当前手势已保持的时间（秒）
         """
-        now = time.time()
+        now = self.clock()
 
         # 手势切换：重置状态
         if gesture != self.current_gesture:
@@ -72,7 +77,7 @@ class GestureStateMachine:
             return 0.0
 
         # 如果当前手势刚开始（< 0.1s），返回切换前的时长
-        current_hold = time.time() - self.start_time
+        current_hold = self.clock() - self.start_time
         if current_hold < 0.1 and hasattr(self, '_previous_hold_time'):
             return self._previous_hold_time
 
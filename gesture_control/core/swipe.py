@@ -0,0 +1,124 @@
+"""
+挥手检测 - 动态手势：手腕和五个指尖的轨迹在短时间内朝同一方向大幅移动
+
+静态手势要保持 0.3s，快进/快退这类操作用挥手更自然。
+SwipeDetector 用固定大小的 NumPy 环形缓冲区记录最近 SWIPE_FRAMES 帧的
+6 个跟踪点（core/features.py 的 TRACKED）和时间戳；每帧只写一行、
+取窗口首尾两行相减，位移和速度对 6 个点一次向量化算完，工作量与窗口长度无关。
+
+判定挥手：
+    6 个点的平均位移在主方向上 ≥ threshold（归一化坐标，画面宽/高的比例）
+    主方向位移 ≥ 另一方向的 ratio 倍（斜着移动不算）
+    至少 agreement 比例的点在主方向上都移动了 threshold 的一半（整只手在动，不是单个手指）
+检测到之后清空缓冲区，并在 cooldown 秒内不再触发：
+一次长挥只算一次，挥完把手收回来也不会触发反方向。
+手刚进入画面的 settle 帧不检测（窗口从进场之后才开始）：从画面下边缘伸进来的手不会被当成上挥。
+坐标是镜像后的画面坐标：x 增大是用户的右边，y 增大是向下。
+"""
+
+import numpy as np
+
+from .features import TRACKED
+from .gestures import GestureType
+
+
+class SwipeDetector:
+    """
+    环形缓冲区挥手检测
+
+    用法：
+        swipe = SwipeDetector(threshold=0.15, frames=8)
+        gesture = swipe.update(points.get('tracked'), clock())   # SWIPE_* 或 None
+    """
+
+    def __init__(self, threshold: float = 0.15, frames: int = 8, ratio: float = 2.0,
+                 agreement: float = 0.8, cooldown: float = 0.6, settle: int = None):
+        """
+        Args:
+            threshold: 窗口内平均位移达到多少算挥手（归一化坐标）
+            frames: 窗口帧数（环形缓冲区大小）
+            ratio: 主方向位移至少是另一方向的几倍
+            agreement: 至少多少比例的跟踪点朝同一方向移动
+            cooldown: 触发后多少秒内不再触发（秒）
+            settle: 手出现后忽略的帧数，默认等于 frames
+        """
+        if frames < 2:
+            raise ValueError(f"Swipe window needs at least 2 frames, got {frames}")
+        self.threshold = threshold
+        self.frames = frames
+        self.ratio = ratio
+        self.agreement = agreement
+        self.cooldown = cooldown
+        self.settle = frames if settle is None else settle
+        self._entering = self.settle   # 手出现后还要忽略的帧数
+        self._last_swipe_t = float('-inf')
+        self._xy = np.zeros((frames, len(TRACKED), 2))
+        self._t = np.zeros(frames)
+        self._head = 0       # 下一帧写入的位置
+        self._count = 0      # 缓冲区里的有效帧数
+        self.displacement = np.zeros(2)   # 最近一帧窗口内的平均位移 (dx, dy)
+        self.velocity = np.zeros(2)       # 对应的平均速度（单位/秒）
+
+    def update(self, tracked, t: float):
+        """
+        加入一帧
+
+        Args:
+            tracked: (6, 2) 手腕 + 指尖坐标（points['tracked']），手不在画面里时为 None
+            t: 时间（秒）
+
+        Returns:
+            GestureType.SWIPE_* 或 None
+        """
+        if tracked is None:
+            self.reset()
+            self._entering = self.settle
+            return None
+        if self._entering > 0:
+            # 手刚进入画面：进场的移动不算，窗口从最后一个进场帧重新开始
+            self._entering -= 1
+            self.reset()
+
+        newest = self._head
+        self._xy[newest] = tracked
+        self._t[newest] = t
+        self._head = (newest + 1) % self.frames
+        self._count = min(self._count + 1, self.frames)
+        if self._count < 2:
+            return None
+
+        # 窗口首尾两行：缓冲区满时最老的一行就是下一个写入位置
+        oldest = self._head if self._count == self.frames else 0
+        moved = self._xy[newest] - self._xy[oldest]       # (6, 2)
+        dt = self._t[newest] - self._t[oldest]
+        self.displacement = moved.mean(axis=0)
+        self.velocity = self.displacement / dt if dt > 0 else np.zeros(2)
+
+        axis = int(abs(self.displacement[1]) > abs(self.displacement[0]))
+        distance = self.displacement[axis]
+        if abs(distance) < self.threshold:
+            return None
+        if abs(distance) < self.ratio * abs(self.displacement[1 - axis]):
+            return None
+        if t - self._last_swipe_t < self.cooldown:
+            return None
+        agreeing = np.count_nonzero(moved[:, axis] * np.sign(distance) >= self.threshold / 2)
+        if agreeing < self.agreement * len(TRACKED):
+            return None
+
+        self.reset()
+        self._last_swipe_t = t
+        if axis == 0:
+            return GestureType.SWIPE_RIGHT if distance > 0 else GestureType.SWIPE_LEFT
+        return GestureType.SWIPE_DOWN if distance > 0 else GestureType.SWIPE_UP
+
+    @property
+    def moving(self) -> bool:
+        """手正在快速移动（窗口位移已超过阈值的一半）：这时不应该触发静态手势"""
+        return bool(np.abs(self.displacement).max() >= self.threshold / 2)
+
+    def reset(self):
+        self._head = 0
+        self._count = 0
+        self.displacement = np.zeros(2)
+        self.velocity = np.zeros(2)
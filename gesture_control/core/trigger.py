@@ -0,0 +1,96 @@
+"""
+证据触发 - 识别分数足够可信就立即触发，不必等满固定的保持时间
+
+SimpleGesture.HOLD_TIME、TimedAction 的阈值都是固定等待：模型第一帧就给出 0.99 也要等满。
+SPRTTrigger 对每个手势做序贯概率比检验（Wald SPRT），逐帧累加对数似然比：
+    H1：这个手势确实在做，每帧被识别为它的概率 p_hit
+    H0：没有在做（误检），每帧被识别为它的概率 p_false
+    本帧分数 s 作为 "被识别为它" 的软观测：
+        llr += s · log(p_hit / p_false) + (1 − s) · log((1 − p_hit) / (1 − p_false))
+    llr ≥ log((1 − miss) / false_trigger) → 接受 H1，可以触发
+    llr ≤ log(miss / (1 − false_trigger)) → 接受 H0，从 0 重新开始检验
+false_trigger / miss 就是期望的误触发率和漏检率。
+
+默认参数下 0.99 的分数 4 帧（30fps 约 0.1s）就够，0.8 要 6 帧，
+0.6 左右的分数永远不够 —— 这时仍按原来的保持时间触发（保持时间是上限）。
+"""
+
+import math
+
+from .gestures import GestureType
+
+
+class SPRTTrigger:
+    """
+    每个手势一个 SPRT
+
+    用法：
+        trigger = SPRTTrigger(false_trigger=0.01, miss=0.05)
+        trigger.update(scores)          # 每帧：{GestureType: 分数}，手不在时传 None
+        if trigger.accepted(gesture):   # 证据足够
+            ...
+    """
+
+    def __init__(self, false_trigger: float = 0.01, miss: float = 0.05,
+                 p_hit: float = 0.9, p_false: float = 0.2):
+        """
+        Args:
+            false_trigger: 可接受的误触发率（α）
+            miss: 可接受的漏检率（β）
+            p_hit: 手势确实在做时，每帧识别为它的概率
+            p_false: 手势没在做时，每帧（误）识别为它的概率
+        """
+        if not (0 < false_trigger < 1 and 0 < miss < 1):
+            raise ValueError(f"Rates must be in (0, 1), "
+                             f"got false_trigger={false_trigger} miss={miss}")
+        if not 0 < p_false < p_hit < 1:
+            raise ValueError(f"Need 0 < p_false < p_hit < 1, got p_hit={p_hit} p_false={p_false}")
+        self.false_trigger = false_trigger
+        self.miss = miss
+        self.upper = math.log((1 - miss) / false_trigger)
+        self.lower = math.log(miss / (1 - false_trigger))
+        self._hit = math.log(p_hit / p_false)
+        self._no_hit = math.log((1 - p_hit) / (1 - p_false))
+        self.llr = {}   # 正在检验的手势 → 对数似然比
+
+    def update(self, scores: dict = None):
+        """加入一帧的类别分布；None / 空表示这一帧没有分数（手离开、拍手），全部重新开始"""
+        if not scores:
+            self.llr.clear()
+            return
+        llr = self.llr
+        for gesture in set(llr).union(scores):
+            if gesture == GestureType.NONE:
+                continue
+            s = scores.get(gesture, 0.0)
+            value = llr.get(gesture, 0.0) + s * self._hit + (1.0 - s) * self._no_hit
+            if value <= self.lower:
+                llr.pop(gesture, None)   # 接受 H0：重新开始
+            else:
+                # 封顶：手势结束后几帧之内就跌回阈值以下
+                llr[gesture] = min(value, self.upper)
+
+    def accepted(self, gesture: GestureType) -> bool:
+        """这个手势的证据是否已经足够"""
+        return self.llr.get(gesture, 0.0) >= self.upper
+
+    def reset(self):
+        self.llr.clear()
+
+
+TRIGGERS = ('hold', 'sprt')
+
+
+def create_trigger(kind: str = 'hold', **options):
+    """
+    按名字创建触发器
+
+    Args:
+        kind: 'hold'（只按保持时间，返回 None）或 'sprt'
+        options: SPRTTrigger 的参数
+    """
+    if kind not in TRIGGERS:
+        raise ValueError(f"Unknown trigger: {kind} (choose from {', '.join(TRIGGERS)})")
+    if kind == 'hold':
+        return None
+    return SPRTTrigger(**options)
@@ -0,0 +1,420 @@
+"""
+识别进程池 - 每路视频一个识别进程，画面走共享内存
+
+主进程只做采集和内存拷贝；镜像、颜色转换、推理、平滑都在子进程里，
+各路之间互不抢 GIL，吞吐随 CPU 核数增长。
+
+    主进程                          识别进程（每路一个）
+    write(frame) → SharedFrameRing →  read → 预处理 → GestureRecognizer
+    requests.put((slot, index, ts))   ↓
+                  结果管道 ←───────  (source, ts, 手势名, points)
+
+请求队列只传槽位号，积压时子进程只处理最新一帧（与 ThreadedCapture 一样 "最新帧优先"）。
+识别进程崩溃后由 revive() 重新拉起，帧环沿用原来的共享内存。
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import connection as mp_connection
+
+import numpy as np
+
+from .gestures import GestureType
+from .metrics import DISABLED
+from .shm import SharedFrameRing
+
+
+# 结果队列里的消息类型
+RESULT = 'result'
+READY = 'ready'
+ERROR = 'error'
+
+_STOP = None
+
+
+def create_recognizer(classifier: str = None, **options):
+    """
+    默认的识别器工厂（在子进程里调用）
+
+    Args:
+        classifier: 自定义分类器路径；给出时用 LandmarkRecognizer（options 里带 model_path）
+    """
+    if classifier:
+        from .classifier import CentroidClassifier, LandmarkRecognizer
+        return LandmarkRecognizer(CentroidClassifier.load(classifier), **options)
+    from .gestures import GestureRecognizer
+    return GestureRecognizer(**options)
+
+
+def compact_points(points: dict) -> dict:
+    """
+    去掉 points 里的 HandFeatures（跨进程只传小字段）
+
+    每只手的 gesture 转成名字，方便 pickle。
+    """
+    compact = {key: value for key, value in points.items() if key not in ('features', 'hands')}
+    if 'hands' in points:
+        compact['hands'] = {
+            hand_id: {'gesture': hand['gesture'].name, 'hold_time': hand['hold_time'],
+                      'index_x': hand['index_x'], 'index_y': hand['index_y']}
+            for hand_id, hand in points['hands'].items()
+        }
+    return compact
+
+
+class _Stream:
+    """一路视频：帧环 + 请求队列 + 识别进程 + 结果管道（重启时后三个换新的）"""
+
+    __slots__ = ('ring', 'requests', 'process', 'results')
+
+    def __init__(self, ring, requests, process, results):
+        self.ring = ring
+        self.requests = requests
+        self.process = process
+        self.results = results    # 管道的读端；None 表示子进程已关闭写端（退出了）
+
+
+class RecognizerPool:
+    """
+    多路识别进程池
+
+    每个识别进程有自己的结果管道：共用一个 multiprocessing.Queue 的话，
+    子进程在发送途中崩溃会把队列的锁永远占住，别的进程（包括重启后的）都发不出结果。
+    add_stream / submit 可以在采集线程里调用：streams 的增删和遍历都在 _lock 下进行，
+    重启途中 submit 的帧直接丢掉（旧进程的请求队列已经关闭）。
+
+    用法：
+        pool = RecognizerPool()
+        pool.add_stream('cam0', (240, 320, 3))
+        pool.submit('cam0', frame, timestamp_ms)
+        for message in pool.poll(): ...
+        pool.stop()
+    """
+
+    MAX_RESTARTS = 3   # 重启后还没报告 READY 就又退出，最多连续重启几次
+
+    def __init__(self, factory=create_recognizer, options: dict = None, slots: int = 4,
+                 mirror: bool = True, preprocess: bool = True):
+        """
+        Args:
+            factory: 子进程里创建识别器的函数（必须能被 pickle，即模块级函数）
+            options: 传给 factory 的关键字参数
+            slots: 每路帧环的槽位数
+            mirror: 子进程预处理时是否镜像
+            preprocess: False 表示提交的已经是预处理过的 RGB 帧，子进程直接识别
+        """
+        self.factory = factory
+        self.options = options or {}
+        self.slots = slots
+        self.mirror = mirror
+        self.preprocess = preprocess
+        self._ctx = mp.get_context('spawn')   # MediaPipe 不能安全地 fork
+        self.streams = {}
+        self.ready = set()      # 已报告 READY 的识别进程
+        self.restarts = {}      # source_id → 重启次数
+        self._started = set()   # 报告过 READY 的路（当前进程不一定）：这些路崩溃了才重启
+        self._failures = {}     # source_id → 上次 READY 之后连续重启的次数
+        self._restarting = set()
+        self._errors = []       # 放弃重启的路，下一次 poll() 作为 ERROR 消息交出去
+        self._lock = threading.Lock()
+
+    def add_stream(self, source_id: str, shape):
+        """为一路视频创建帧环并启动识别进程"""
+        stream = self._start(source_id, SharedFrameRing(shape, self.slots))
+        with self._lock:
+            self.restarts[source_id] = 0
+            self.streams[source_id] = stream
+
+    def _snapshot(self) -> list:
+        """[(source_id, _Stream)]，遍历时别的线程可以继续 add_stream"""
+        with self._lock:
+            return list(self.streams.items())
+
+    def _start(self, source_id: str, ring: SharedFrameRing) -> _Stream:
+        requests = self._ctx.Queue()
+        reader, writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(source_id, ring.name, ring.shape, self.slots, requests, writer,
+                  self.factory, self.options, self.mirror if self.preprocess else None),
+            name=f'recognizer-{source_id}',
+            daemon=True,
+        )
+        process.start()
+        writer.close()   # 只留子进程的写端：子进程退出后读端能收到 EOF
+        return _Stream(ring, requests, process, reader)
+
+    def restart(self, source_id: str):
+        """结束（或确认已退出）一路的识别进程并重新拉起；帧环不变"""
+        with self._lock:
+            stream = self.streams[source_id]
+            self._restarting.add(source_id)   # 之后的 submit 不再碰旧的请求队列
+        try:
+            if stream.process.is_alive():
+                stream.process.terminate()
+            stream.process.join(timeout=2.0)
+            _discard(stream)
+            self.ready.discard(source_id)
+            stream = self._start(source_id, stream.ring)
+            with self._lock:
+                self.streams[source_id] = stream
+        finally:
+            with self._lock:
+                self._restarting.discard(source_id)
+        self.restarts[source_id] += 1
+
+    def revive(self) -> list:
+        """
+        重新拉起意外退出的识别进程
+
+        只处理报告过 READY 的路：第一次启动就失败（模型缺失等）会回报 ERROR，重启也没用。
+        重启后还没 READY 就又退出的照样重启，连续 MAX_RESTARTS 次后放弃并回报 ERROR。
+
+        Returns:
+            list: 本次重启的 source_id
+        """
+        dead = [source_id for source_id, stream in self._snapshot()
+                if source_id in self._started and not stream.process.is_alive()]
+        restarted = []
+        for source_id in dead:
+            failures = self._failures.get(source_id, 0)
+            if failures >= self.MAX_RESTARTS:
+                self._started.discard(source_id)
+                error = f"Inference worker exited {failures + 1} times without becoming ready"
+                self._errors.append((ERROR, source_id, error))
+                continue
+            self._failures[source_id] = failures + 1
+            self.restart(source_id)
+            restarted.append(source_id)
+        return restarted
+
+    def submit(self, source_id: str, frame, timestamp_ms: int) -> bool:
+        """把一帧写进共享内存并通知识别进程（立即返回）；正在重启时丢掉这一帧，返回 False"""
+        with self._lock:
+            if source_id in self._restarting:
+                return False
+            stream = self.streams[source_id]
+            slot, index = stream.ring.write(frame)
+            stream.requests.put((slot, index, timestamp_ms))
+        return True
+
+    def poll(self, timeout: float = 0.0) -> list:
+        """
+        取出已到达的消息
+
+        Returns:
+            list: (类型, source_id, ...)；RESULT 消息为
+                  (RESULT, source_id, timestamp_ms, 手势名, 原始手势名, points, 推理耗时秒)
+        """
+        readers = {stream.results: stream for _, stream in self._snapshot()
+                   if stream.results is not None}
+        messages, self._errors = self._errors, []
+        for reader in mp_connection.wait(list(readers), timeout):
+            try:
+                while reader.poll():
+                    messages.append(reader.recv())
+            except (EOFError, OSError):
+                readers[reader].results = None   # 子进程退出了，等 revive() 换新管道
+                reader.close()
+        for message in messages:
+            if message[0] == READY:
+                self.ready.add(message[1])
+                self._started.add(message[1])
+                self._failures[message[1]] = 0
+            elif message[0] == ERROR:
+                self._started.discard(message[1])   # 重启后加载失败：再重启也没用
+        return messages
+
+    def alive(self, source_id: str) -> bool:
+        return self.streams[source_id].process.is_alive()
+
+    def stop(self, timeout: float = 2.0):
+        """停止所有识别进程并释放共享内存"""
+        with self._lock:
+            streams, self.streams = list(self.streams.values()), {}
+        for stream in streams:
+            stream.requests.put(_STOP)
+        for stream in streams:
+            stream.process.join(timeout=timeout)
+            if stream.process.is_alive():
+                stream.process.terminate()
+            _discard(stream)
+            stream.ring.close()
+        self.ready.clear()
+        self._started.clear()
+
+
+def _discard(stream: _Stream):
+    """丢弃一路的请求队列和结果管道（子进程可能死在读写途中，不能再用）"""
+    stream.requests.cancel_join_thread()   # 没人读的队列不要在退出时等它刷完
+    stream.requests.close()
+    if stream.results is not None:
+        stream.results.close()
+        stream.results = None
+
+
+def _worker_main(source_id, ring_name, shape, slots, requests, results, factory, options,
+                 mirror):
+    """识别进程入口（results 是结果管道的写端；mirror 为 None 时不做预处理）"""
+    from .preprocess import FramePreprocessor
+
+    ring = SharedFrameRing.attach(ring_name, shape, slots)
+    try:
+        try:
+            recognizer = factory(**options)
+        except Exception as e:
+            results.send((ERROR, source_id, f"{type(e).__name__}: {e}"))
+            return
+        results.send((READY, source_id))
+        try:
+            preprocessor = FramePreprocessor(mirror=mirror) if mirror is not None else None
+            run_worker(source_id, ring, requests, results.send, recognizer, preprocessor)
+        finally:
+            recognizer.close()
+    finally:
+        ring.close()
+
+
+def run_worker(source_id, ring, requests, send, recognizer, preprocessor):
+    """
+    识别循环：取最新请求 → 读帧 → 识别 → send(结果)
+
+    拆出来单独测试（不需要起进程）。preprocessor 为 None 时帧环里已经是 RGB。
+    """
+    frame = np.empty(ring.shape, dtype=np.uint8)
+    height, width = ring.shape[:2]
+    while True:
+        request = requests.get()
+        # 积压的请求只保留最新一个
+        while request is not _STOP:
+            try:
+                request = requests.get_nowait()
+            except queue.Empty:
+                break
+        if request is _STOP:
+            return
+
+        slot, index, timestamp_ms = request
+        if not ring.read(slot, index, frame):
+            continue   # 已被新帧覆盖
+
+        start = time.perf_counter()
+        rgb = preprocessor.process(frame)[1] if preprocessor is not None else frame
+        gesture, points = recognizer.recognize(rgb, width, height, timestamp_ms, is_rgb=True)
+        elapsed = time.perf_counter() - start
+        raw = getattr(recognizer, 'raw_gesture', gesture)
+        send((RESULT, source_id, timestamp_ms, gesture.name, raw.name, compact_points(points),
+              elapsed))
+
+
+class RemoteRecognizer:
+    """
+    子进程里的 GestureRecognizer，接口与 LIVE_STREAM 模式相同
+
+    主进程只把 RGB 帧写进共享内存；推理、平滑都在识别进程里，
+    不和采集、pyautogui、OpenCV 窗口抢解释器。结果由接收线程送到 on_result，同时更新 latest。
+    识别进程崩溃时自动重启（计入 restarts）。
+
+    用法：
+        recognizer = RemoteRecognizer(options, on_result=on_result).start((480, 640, 3))
+        if not recognizer.wait_ready(): print(recognizer.error)
+        recognizer.recognize_async(rgb, w, h, timestamp_ms, is_rgb=True)
+        recognizer.close()
+
+    画面尺寸与 start() 时不同的帧会被缩放到帧环尺寸，points 也按帧环尺寸计算。
+    """
+
+    live_stream = True
+    recorder = None
+    SOURCE = 'main'
+
+    def __init__(self, options: dict = None, on_result=None, metrics=None,
+                 factory=create_recognizer):
+        """
+        Args:
+            options: 传给 factory 的关键字参数（必须能被 pickle；不能带回调、metrics、recorder）
+            on_result: on_result(gesture, points, timestamp_ms)，在接收线程里调用
+            metrics: 可选的 Metrics，记录子进程里的 inference 耗时
+            factory: 子进程里创建识别器的函数
+        """
+        self.pool = RecognizerPool(factory, options, preprocess=False)
+        self.on_result = on_result
+        self.metrics = metrics if metrics is not None else DISABLED
+        self.latest = (GestureType.NONE, {}, -1)
+        self.raw_gesture = GestureType.NONE
+        self.error = None
+        self._ready = threading.Event()
+        self._running = False
+        self._thread = None
+
+    @property
+    def restarts(self) -> int:
+        return self.pool.restarts.get(self.SOURCE, 0)
+
+    def start(self, shape):
+        """按画面尺寸创建帧环、启动识别进程和接收线程"""
+        if self._thread is not None:
+            return self
+        self.pool.add_stream(self.SOURCE, shape)
+        self._running = True
+        self._thread = threading.Thread(target=self._receive, name='remote-recognizer',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def wait_ready(self, timeout: float = 30.0) -> bool:
+        """等识别进程加载完模型；失败时原因在 self.error"""
+        self._ready.wait(timeout)
+        if not self._ready.is_set() and self.error is None:
+            self.error = f"Inference worker not ready after {timeout:.0f}s"
+        return self.error is None
+
+    def recognize_async(self, frame, frame_width, frame_height, timestamp_ms=None,
+                        is_rgb=False) -> bool:
+        """
+        提交一帧（拷进共享内存后立即返回）；第一帧到达时才启动的话以它的尺寸建帧环
+
+        出错或识别进程正在重启时丢掉这一帧，返回 False。
+        """
+        if self.error is not None:
+            return False
+        if not is_rgb:
+            import cv2
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self._thread is None:
+            self.start(frame.shape)
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        return self.pool.submit(self.SOURCE, frame, timestamp_ms)
+
+    def _receive(self):
+        while self._running:
+            for message in self.pool.poll(timeout=0.1):
+                kind = message[0]
+                if kind == RESULT:
+                    self._on_message(*message[2:])
+                elif kind == READY:
+                    self._ready.set()
+                elif kind == ERROR:
+                    self.error = message[2]
+                    self._ready.set()
+            if self._running and self.pool.revive():
+                print(f"⚠️ Inference worker crashed, restarted ({self.restarts})")
+
+    def _on_message(self, timestamp_ms, name, raw_name, points, elapsed):
+        gesture = GestureType[name]
+        self.metrics.record('inference', elapsed)
+        self.metrics.count('inferences')
+        self.raw_gesture = GestureType[raw_name]
+        self.latest = (gesture, points, timestamp_ms)
+        if self.on_result is not None:
+            self.on_result(gesture, points, timestamp_ms)
+
+    def close(self):
+        """停止接收线程和识别进程"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.pool.stop()
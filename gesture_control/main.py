@@ -3,227 +3,943 @@ Gesture Control Hub - 极简手势控制
 直接触发，无需激活
 """
 
+import argparse
+import os
 import cv2
+import threading
 import time
-import pyautogui
-from .config import CAMERA_ID, WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT
+import numpy as np
+from .config import (
+    CAMERA_ID, WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT,
+    LIVE_STREAM, INFERENCE_PROCESS, ROI_TRACKING, INFERENCE_GOVERNOR, IDLE_INFERENCE_HZ,
+    MOTION_GATE, MOTION_THRESHOLD, PREVIEW_FPS, PREVIEW_SCALE, METRICS_INTERVAL,
+    CLASSIFIER_PATH, LANDMARKER_MODEL, MAX_NUM_HANDS, CLAP_DISTANCE_THRESHOLD,
+    PRIMARY_HAND,
+    SMOOTHING, SMOOTHING_ENTER, SMOOTHING_EXIT, SMOOTHING_WINDOWS,
+    LANDMARK_FILTER, ONE_EURO_MIN_CUTOFF, ONE_EURO_BETA,
+    KALMAN_PROCESS_NOISE, KALMAN_MEASUREMENT_NOISE,
+    TRIGGER, TRIGGER_FALSE_RATE, TRIGGER_MISS_RATE,
+    SWIPE_GESTURES, SWIPE_THRESHOLD, SWIPE_FRAMES, SWIPE_COOLDOWN,
+    PROFILE, PROFILE_RELOAD_INTERVAL,
+    EVENT_SOCKET, EVENT_WS_PORT, EVENT_QUEUE_SIZE, EVENT_LANDMARKS,
+)
+from .core.actions import OnReleaseAction, RepeatKeyAction, TimedAction
+from .core.capture import ThreadedCapture
+from .core.classifier import CentroidClassifier, LandmarkRecognizer
+from .core.clock import MONOTONIC, FrameClock
+from .core.dispatcher import ActionDispatcher
+from .core.events import EventBus, UnixEventServer, WebSocketEventServer
+from .core.governor import InferenceGovernor
+from .core.metrics import Metrics, MetricsExporter
+from .core.motion import MotionDetector
+from .core.overlay import OverlayRenderer
+from .core.preprocess import FramePreprocessor
+from .core.preview import PreviewProcess
+from .core.profiles import ProfileWatcher, resolve_profile
+from .core.recording import CATEGORY_NAMES, SessionRecorder
+from .core.startup import StartupTimer
+from .core.state_machine import GestureStateMachine
+from .core.swipe import SwipeDetector
+from .core.trigger import TRIGGERS, create_trigger
+from .core.worker import RecognizerPool, RemoteRecognizer
 from .core.gestures import GestureRecognizer, GestureType
 
 
 class SimpleGesture:
-    """简单手势检测 - 保持 0.3s 触发"""
+    """简单手势检测 - 保持 0.3s 触发；有证据触发器时证据足够就提前触发"""
 
     HOLD_TIME = 0.3
 
-    def __init__(self):
+    def __init__(self, clock=None, trigger=None):
+        """
+        Args:
+            clock: 计时用的时钟
+            trigger: 可选的 SPRTTrigger（core/trigger.py），HOLD_TIME 仍是触发的上限
+        """
+        self.clock = clock if clock is not None else MONOTONIC
+        self.trigger = trigger
         self.current_gesture = GestureType.NONE
         self.gesture_start = 0
         self.triggered = False
 
-    def update(self, gesture: GestureType) -> str:
-        """返回要执行的动作，或 None"""
-        now = time.time()
+    def update(self, gesture: GestureType, scores: dict = None, replay: bool = False) -> str:
+        """
+        返回要执行的动作，或 None；scores 是本帧的类别分布（points['scores']）
+
+        replay 表示这一帧没有识别、沿用上一次结果：只推进保持时间，不给触发器加证据。
+        """
+        now = self.clock()
+        early = False
+        if self.trigger is not None:
+            if not replay:
+                self.trigger.update(scores)
+            early = self.trigger.accepted(gesture)
 
         # 手势变化，重置
         if gesture != self.current_gesture:
             self.current_gesture = gesture
             self.gesture_start = now
             self.triggered = False
-            return None
+            if not early:
+                return None
 
         # 已触发过，不重复
         if self.triggered:
             return None
 
-        # 检查保持时间
+        # 检查保持时间（证据足够时不用等）
         hold_time = now - self.gesture_start
-        if hold_time < self.HOLD_TIME:
+        if hold_time < self.HOLD_TIME and not early:
             return None
 
         # 触发动作
         self.triggered = True
+        return gesture_action(gesture)
 
-        if gesture == GestureType.FIST:
-            return 'pause'
-        elif gesture == GestureType.OPEN_PALM:
-            return 'play'
-        elif gesture == GestureType.VICTORY:
-            return 'fullscreen'
-        elif gesture == GestureType.THUMB_UP:
-            return 'forward'
-        elif gesture == GestureType.THUMB_DOWN:
-            return 'rewind'
-
-        return None
+    def hold_off(self, gesture: GestureType):
+        """把当前手势当作已经触发过（挥手之后手停下来的姿势不再触发静态动作）"""
+        if gesture != self.current_gesture:
+            self.current_gesture = gesture
+            self.gesture_start = self.clock()
+        self.triggered = True
 
     def get_status(self, gesture: GestureType) -> str:
         """获取显示状态"""
-        if gesture == GestureType.FIST:
-            return "✊ Fist → Pause"
-        elif gesture == GestureType.OPEN_PALM:
-            return "🖐️ Palm → Play"
-        elif gesture == GestureType.VICTORY:
-            return "✌️ Victory → Fullscreen"
-        elif gesture == GestureType.THUMB_UP:
-            return "👍 → Forward"
-        elif gesture == GestureType.THUMB_DOWN:
-            return "👎 → Rewind"
-        elif gesture == GestureType.POINTING_UP:
-            return "☝️ Point → Scroll"
-        elif gesture == GestureType.NONE:
-            return "Ready"
-        return gesture.name
-
-
-def execute_action(action: str):
-    """执行动作"""
-    if action == 'pause':
-        pyautogui.press('space')
-        print("⏸️ Pause")
-    elif action == 'play':
-        pyautogui.press('space')
-        print("▶️ Play")
-    elif action == 'fullscreen':
-        pyautogui.press('f')
-        print("📺 Fullscreen")
-    elif action == 'forward':
-        for _ in range(4):
-            pyautogui.press('right')
-        print("⏩ Forward 20s")
-    elif action == 'rewind':
-        for _ in range(4):
-            pyautogui.press('left')
-        print("⏪ Rewind 20s")
-
-
-def main():
+        return GESTURE_STATUS.get(gesture, gesture.name)
+
+
+# 内置映射（没有指定 --profile 时使用）：手势 → 动作名 → (按键, 次数, 提示)
+GESTURE_ACTIONS = {
+    GestureType.FIST: 'pause',
+    GestureType.OPEN_PALM: 'play',
+    GestureType.VICTORY: 'fullscreen',
+    GestureType.THUMB_UP: 'forward',
+    GestureType.THUMB_DOWN: 'rewind',
+    GestureType.CLAP: 'mute',
+    GestureType.SWIPE_LEFT: 'rewind',
+    GestureType.SWIPE_RIGHT: 'forward',
+    GestureType.SWIPE_UP: 'volume_up',
+    GestureType.SWIPE_DOWN: 'volume_down',
+}
+
+ACTIONS = {
+    'pause': ('space', 1, "⏸️ Pause"),
+    'play': ('space', 1, "▶️ Play"),
+    'fullscreen': ('f', 1, "📺 Fullscreen"),
+    'forward': ('right', 4, "⏩ Forward 20s"),
+    'rewind': ('left', 4, "⏪ Rewind 20s"),
+    'mute': ('m', 1, "🔇 Mute"),
+    'volume_up': ('up', 1, "🔊 Volume Up"),
+    'volume_down': ('down', 1, "🔉 Volume Down"),
+}
+
+GESTURE_STATUS = {
+    GestureType.FIST: "✊ Fist → Pause",
+    GestureType.OPEN_PALM: "🖐️ Palm → Play",
+    GestureType.VICTORY: "✌️ Victory → Fullscreen",
+    GestureType.THUMB_UP: "👍 → Forward",
+    GestureType.THUMB_DOWN: "👎 → Rewind",
+    GestureType.CLAP: "👏 Clap → Mute",
+    GestureType.POINTING_UP: "☝️ Point → Scroll",
+    GestureType.SWIPE_LEFT: "👈 Swipe → Rewind",
+    GestureType.SWIPE_RIGHT: "👉 Swipe → Forward",
+    GestureType.SWIPE_UP: "👆 Swipe → Volume Up",
+    GestureType.SWIPE_DOWN: "👇 Swipe → Volume Down",
+    GestureType.NONE: "Ready",
+}
+
+
+def gesture_action(gesture: GestureType) -> str:
+    """手势 → 动作名（静态手势保持触发，挥手立即触发），没有对应动作返回 None"""
+    return GESTURE_ACTIONS.get(gesture)
+
+
+def execute_action(action: str, dispatcher: ActionDispatcher, verbose: bool = True,
+                   tag: str = None):
+    """执行动作（投递给派发器，立即返回）；tag 是多路模式下的来源标记"""
+    if action not in ACTIONS:
+        return
+    key, count, message = ACTIONS[action]
+    dispatcher.press(key, count)
+    if verbose:
+        print(f"[{tag}] {message}" if tag else message)
+
+
+class GestureController:
+    """
+    平滑后的手势 → 动作
+
+    SimpleGesture 负责保持触发（可选 SPRT 证据提前触发），指向手势负责滚动，
+    可选的 SwipeDetector 负责挥手（动作立即触发，手快速移动时静态手势不计时）。
+    指定了 profile（core/profiles.py 的 ProfileWatcher）时改用配置里的绑定表：
+    每帧先 poll() 检查文件，再按手势查表执行 core/actions.py 的动作；
+    没有绑定的指向手势仍按手指方向滚动。
+    指定了 events（core/events.py 的 EventBus）且有订阅者时，每帧发布手势变化、保持进度、
+    执行的动作和关键点。
+    滚动冷却状态跟着实例走，多个实例（比如回放）互不影响。
+    保持和冷却都按 clock 计时（core/clock.py）。
+    多路模式下每路一个实例，共用同一个派发器，tag 标记动作来自哪一路。
+    """
+
+    SCROLL_COOLDOWN = 0.05  # 50ms 冷却，更灵敏
+
+    def __init__(self, dispatcher: ActionDispatcher, verbose: bool = True, clock=None,
+                 tag: str = None, trigger=None, swipe=None, profile=None, events=None,
+                 landmark_events: bool = True):
+        self.clock = clock if clock is not None else MONOTONIC
+        self.detector = SimpleGesture(self.clock, trigger)
+        self.swipe = swipe
+        self.last_swipe = None   # 本帧检测到的挥手（SWIPE_*），没有为 None
+        self.profile = profile
+        self.machine = GestureStateMachine(self.clock)
+        self._binding = None     # 上一帧执行的绑定（松开触发要在手势结束那一帧再执行一次）
+        self._held_off = None    # 挥完停下的姿势，换手势之前不执行绑定
+        self.dispatcher = dispatcher
+        self.verbose = verbose
+        self.tag = tag
+        self.last_scroll_time = float('-inf')
+        self.events = events
+        self.landmark_events = landmark_events
+        self._event_gesture = GestureType.NONE   # 最近发布的手势
+
+    @property
+    def current_gesture(self) -> GestureType:
+        """正在计时的手势"""
+        if self.profile is not None:
+            return self.machine.current_gesture
+        return self.detector.current_gesture
+
+    def update(self, gesture: GestureType, points: dict, replay: bool = False) -> str:
+        """
+        同步模式在主循环调用，异步模式在识别回调里调用
+
+        replay 为 True 时这一帧没有识别（调节器 / 运动门控跳过），gesture 和 points
+        是上一次的结果：计时照常推进，但不算新的证据（SimpleGesture / TimedAction 的触发器）。
+
+        Returns:
+            str: 本帧触发的动作名（使用配置时为绑定的描述），或 None
+        """
+        scrolling = _is_scrolling(gesture, points)
+        swipe = None
+        if self.swipe is not None:
+            # 指向滚动时手指上下移动不算挥手
+            tracked = points.get('tracked') if points and not scrolling else None
+            swipe = self.swipe.update(tracked, self.clock())
+        self.last_swipe = swipe
+
+        bound = False
+        if self.profile is not None:
+            if replay and points:
+                points = dict(points, replay=True)   # 绑定的触发器据此跳过这一帧
+            action, bound = self._update_profile(gesture, points, swipe)
+        else:
+            if swipe is not None:
+                action = gesture_action(swipe)
+                self.detector.hold_off(gesture)   # 挥完停下的姿势不再触发静态动作
+            else:
+                moving = self.swipe is not None and self.swipe.moving
+                action = self.detector.update(GestureType.NONE if moving else gesture,
+                                              points.get('scores') if points else None, replay)
+            if action:
+                execute_action(action, self.dispatcher, self.verbose, self.tag)
+
+        if scrolling and not bound:
+            self._do_scroll(points)
+
+        if self.events is not None and self.events.active:
+            self._publish(gesture, points, action)
+
+        return action
+
+    def _publish(self, gesture: GestureType, points: dict, action: str):
+        """把本帧的手势变化、保持进度、动作和关键点发到事件总线"""
+        events = self.events
+        ts = int(round(self.clock() * 1000))
+        src = {'src': self.tag} if self.tag else {}
+        if gesture != self._event_gesture:
+            self._event_gesture = gesture
+            events.publish('gesture', ts, g=gesture.name, **src)
+        hold = self._hold_progress()
+        if hold is not None:
+            name, held, progress = hold
+            events.publish('hold', ts, g=name, hold=round(held, 3), p=round(progress, 2), **src)
+        if action:
+            events.publish('action', ts, action=action, **src)
+        if self.landmark_events and points:
+            for hand_id, hand in (points.get('hands') or {}).items():
+                features = hand.get('features')
+                if features is not None:
+                    pts = np.round(features.points[:, :2], 3).ravel().tolist()
+                    events.publish('landmarks', ts, hand=hand_id, pts=pts, **src)
+
+    def _hold_progress(self):
+        """(手势名, 已保持秒数, 进度 0~1)；当前手势没有动作或已经触发过时为 None"""
+        now = self.clock()
+        if self.profile is None:
+            detector = self.detector
+            gesture = detector.current_gesture
+            if detector.triggered or gesture_action(gesture) is None:
+                return None
+            held, threshold = now - detector.gesture_start, detector.HOLD_TIME
+        else:
+            machine = self.machine
+            gesture = machine.current_gesture
+            binding = self.profile.profile.get(gesture)
+            if isinstance(binding, TimedAction):
+                threshold = binding.thresholds[0][0]
+            elif isinstance(binding, RepeatKeyAction):
+                threshold = binding.hold_time
+            else:
+                return None
+            if threshold in machine.executed_thresholds:
+                return None
+            held = now - machine.start_time
+        progress = min(1.0, held / threshold) if threshold > 0 else 1.0
+        return gesture.name, held, progress
+
+    def get_status(self, gesture: GestureType) -> str:
+        """显示状态（使用配置时显示绑定的描述）"""
+        if self.profile is None:
+            return self.detector.get_status(gesture)
+        description = self.profile.profile.descriptions.get(gesture)
+        if description is None:
+            return "Ready" if gesture == GestureType.NONE else gesture.name
+        return f"{gesture.name} → {description}"
+
+    def _update_profile(self, gesture: GestureType, points: dict, swipe):
+        """配置驱动：返回 (本帧执行的动作描述或 None, 当前手势是否有绑定)"""
+        self.profile.poll()
+        profile = self.profile.profile
+        if swipe is not None:
+            self._held_off = gesture
+            # 挥手没有保持时间：用一个新的状态机执行一次
+            machine = GestureStateMachine(self.clock)
+            machine.update(swipe)
+            return self._run_binding(profile.get(swipe), 0.0, machine, points), False
+
+        if gesture == self._held_off or (self.swipe is not None and self.swipe.moving):
+            gesture = GestureType.NONE
+        else:
+            self._held_off = None
+        hold_time = self.machine.update(gesture)
+        binding = profile.get(gesture)
+        action = None
+        previous = self._binding
+        if isinstance(previous, OnReleaseAction) and previous is not binding:
+            action = self._run_binding(previous, hold_time, self.machine, points)
+        self._binding = binding
+        if binding is not None:
+            action = self._run_binding(binding, hold_time, self.machine, points) or action
+        return action, binding is not None
+
+    def _run_binding(self, binding, hold_time: float, machine, points: dict) -> str:
+        """执行一个绑定；这一帧真的按了键时返回动作描述"""
+        if binding is None:
+            return None
+        executed = len(machine.executed_thresholds)
+        status = binding.execute(hold_time, machine, points or {})
+        if isinstance(binding, OnReleaseAction):
+            fired = bool(status)
+        else:
+            fired = len(machine.executed_thresholds) > executed
+        if not fired:
+            return None
+        action = status.removeprefix("✓ ")
+        if self.verbose:
+            print(f"[{self.tag}] {action}" if self.tag else action)
+        return action
+
+    def _do_scroll(self, points: dict):
+        """根据手指方向滚动：向上指=向上滚，向下指=向下滚"""
+        if not points or 'pointing_up' not in points:
+            return
+
+        now = self.clock()
+        if now - self.last_scroll_time < self.SCROLL_COOLDOWN:
+            return
+
+        if points['pointing_up']:
+            # 向上指 → 向上滚动
+            self.dispatcher.scroll(5)
+        else:
+            # 向下指 → 向下滚动
+            self.dispatcher.scroll(-5)
+        self.last_scroll_time = now
+
+
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="Gesture Control Hub")
+    parser.add_argument('--headless', action='store_true',
+                        help="无界面模式：主循环不调用任何 GUI 函数（Ctrl+C 退出）")
+    parser.add_argument('--preview', action='store_true',
+                        help="无界面模式下在独立进程里显示缩小的预览窗口")
+    parser.add_argument('--preview-fps', type=float, default=PREVIEW_FPS,
+                        help=f"预览帧率上限（默认 {PREVIEW_FPS}）")
+    parser.add_argument('--preview-scale', type=float, default=PREVIEW_SCALE,
+                        help=f"预览画面缩放比例（默认 {PREVIEW_SCALE}）")
+    parser.add_argument('--smoothing', choices=('evidence', 'vote'), default=SMOOTHING,
+                        help=f"手势平滑方式（默认 {SMOOTHING}）")
+    parser.add_argument('--filter', dest='landmark_filter', choices=FILTER_CHOICES,
+                        default=str(LANDMARK_FILTER).lower(),
+                        help=f"关键点时域滤波（默认 {LANDMARK_FILTER}）")
+    parser.add_argument('--trigger', choices=TRIGGERS, default=TRIGGER,
+                        help=f"动作触发方式：sprt 证据足够提前触发，hold 固定保持时间（默认 {TRIGGER}）")
+    parser.add_argument('--no-swipe', dest='swipe', action='store_false', default=SWIPE_GESTURES,
+                        help="关闭挥手手势（左右挥快退/快进，上下挥调音量）")
+    parser.add_argument('--profile', metavar='NAME_OR_PATH', default=PROFILE,
+                        help="手势绑定配置：gesture_control/profiles 下的名字（如 presentation）"
+                             "或 JSON/TOML 文件，修改后自动重新加载")
+    parser.add_argument('--classifier', metavar='PATH', default=CLASSIFIER_PATH,
+                        help="自定义手势分类器（train_classifier 训练），改用 HandLandmarker 引擎")
+    parser.add_argument('--inference-process', action='store_true', default=INFERENCE_PROCESS,
+                        help="识别放到子进程（画面走共享内存，崩溃自动重启）")
+    parser.add_argument('--cameras', metavar='SOURCES',
+                        help="多路模式：逗号分隔的摄像头编号或视频文件（如 0,1,clip.mp4），"
+                             "每路一个识别进程，无界面运行")
+    parser.add_argument('--record', metavar='PATH',
+                        help="把每帧的识别结果录制到 .npz 文件（用 gesture_control.replay 回放）")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="定期把分阶段延迟/帧率追加到 JSON Lines 文件")
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help="定期覆盖写 Prometheus 文本格式的指标文件")
+    parser.add_argument('--metrics-interval', type=float, default=METRICS_INTERVAL,
+                        help=f"指标导出周期（秒，默认 {METRICS_INTERVAL}）")
+    parser.add_argument('--events-socket', metavar='PATH', default=EVENT_SOCKET,
+                        help="在 Unix 域套接字上发布手势/保持进度/动作/关键点事件（JSON Lines）")
+    parser.add_argument('--events-ws', metavar='PORT', type=int, default=EVENT_WS_PORT,
+                        help="同样的事件走本机 WebSocket（ws://127.0.0.1:PORT）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """主程序"""
+    args = parse_args(argv)
+    if args.cameras:
+        return run_multistream(args)
+    startup = StartupTimer()
+
     print("=" * 50)
     print("  Gesture Control Hub")
     print("=" * 50)
-    print("\nGestures (0.3s hold):")
-    print("  ✊ Fist     → Pause")
-    print("  🖐️ Palm     → Play")
-    print("  ✌️ Victory  → Fullscreen")
-    print("  👍 Thumb Up → Forward 20s")
-    print("  👎 Thumb Dn → Rewind 20s")
-    print("  ☝️ Point Up → Scroll")
-    print("\nKeys: 'p' = pin | 'q' = quit\n")
+    if not args.profile:
+        hold = "≤0.3s hold, earlier when confident" if args.trigger == 'sprt' else "0.3s hold"
+        print(f"\nGestures ({hold}):")
+        print("  ✊ Fist     → Pause")
+        print("  🖐️ Palm     → Play")
+        print("  ✌️ Victory  → Fullscreen")
+        print("  👍 Thumb Up → Forward 20s")
+        print("  👎 Thumb Dn → Rewind 20s")
+        print("  👏 Clap     → Mute")
+        print("  ☝️ Point Up → Scroll")
+        if args.swipe:
+            print("  👈👉 Swipe  → Rewind / Forward")
+            print("  👆👇 Swipe  → Volume Up / Down")
+    if args.headless:
+        print("\nHeadless mode: Ctrl+C = quit\n")
+    else:
+        print("\nKeys: 'p' = pin | 'q' = quit\n")
 
+    # 分阶段计时：指定了导出文件才开启
+    metrics = Metrics(enabled=bool(args.metrics_json or args.metrics_prom))
+    exporter = None
+    if metrics.enabled:
+        exporter = MetricsExporter(metrics, args.metrics_json, args.metrics_prom,
+                                   args.metrics_interval)
+
+    dispatcher = ActionDispatcher(metrics=metrics).start()
     try:
-        recognizer = GestureRecognizer()
-    except FileNotFoundError as e:
+        # 绑定配置：文件修改后在识别回调里自动重新加载，不用重启识别器和摄像头
+        profile = make_profile(args.profile, dispatcher, args.trigger)
+    except (OSError, ValueError) as e:
         print(f"❌ Error: {e}")
+        dispatcher.stop()
+        return 1
+    if profile is not None:
+        print(f"Profile: {profile.profile.name} ({profile.path})")
+        for name, description in profile.profile.describe():
+            print(f"  {name:<12} → {description}")
+        print()
+    # 保持/冷却跟随帧时间戳：卡顿或系统改时间都不会误触发
+    clock = FrameClock()
+    # 事件总线：开了套接字/WebSocket 才有，识别循环只往有界队列里放
+    events = make_event_bus(args.events_socket, args.events_ws)
+    controller = make_controller(dispatcher, clock, args.trigger, args.swipe, profile,
+                                 events=events, landmark_events=EVENT_LANDMARKS)
+    # 待机/无手时低频识别，看到手掌立即全速
+    governor = (InferenceGovernor(idle_hz=IDLE_INFERENCE_HZ, clock=clock)
+                if INFERENCE_GOVERNOR else None)
+    # 画面静止时跳过识别，沿用上一次结果
+    motion = MotionDetector(threshold=MOTION_THRESHOLD) if MOTION_GATE else None
+
+    feed = ResultFeed(controller, clock)
+
+    def on_result(gesture, points, timestamp_ms):
+        t = metrics.start()
+        feed.update(gesture, points, timestamp_ms)
+        metrics.stop('gesture', t)
+        if startup.mark('first_result'):
+            print(startup.report())
+        if governor is not None:
+            governor.update(bool(points), gesture, recognizer.raw_gesture)
+
+    if args.inference_process and args.record:
+        print("❌ Error: --record is not supported with --inference-process")
+        dispatcher.stop()
         return 1
 
-    detector = SimpleGesture()
+    # 摄像头在后台线程打开，同时在主线程 import MediaPipe、加载模型
+    camera = startup.background('camera', cv2.VideoCapture, CAMERA_ID)
+    try:
+        # 异步模式：结果一到就直接驱动动作层，推理与采集/绘制并行
+        options = dict(live_stream=LIVE_STREAM, on_result=on_result, roi_tracking=ROI_TRACKING,
+                       metrics=metrics, num_hands=MAX_NUM_HANDS,
+                       clap_distance=CLAP_DISTANCE_THRESHOLD, primary_hand=PRIMARY_HAND,
+                       **smoothing_config(args.smoothing, args.landmark_filter))
+        with startup.stage('recognizer'):
+            if args.inference_process:
+                # 子进程识别：模型在子进程里加载，启动后再等它就绪
+                recognizer = RemoteRecognizer(_worker_options(args), on_result=on_result,
+                                              metrics=metrics)
+            elif args.classifier:
+                classifier = CentroidClassifier.load(args.classifier)
+                categories = CATEGORY_NAMES + tuple(
+                    name for name in LandmarkRecognizer.output_names(classifier)
+                    if name not in CATEGORY_NAMES)
+                recorder = (SessionRecorder(args.record, categories=categories)
+                            if args.record else None)
+                recognizer = LandmarkRecognizer(classifier, LANDMARKER_MODEL, recorder=recorder,
+                                                **options)
+            else:
+                recorder = SessionRecorder(args.record) if args.record else None
+                recognizer = GestureRecognizer(recorder=recorder, **options)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        dispatcher.stop()
+        camera.result().release()
+        return 1
 
-    cap = cv2.VideoCapture(CAMERA_ID)
+    cap = camera.result()
     if not cap.isOpened():
         print("❌ Cannot open camera")
+        dispatcher.stop()
+        recognizer.close()
         return 1
-
-    cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL | cv2.WINDOW_GUI_EXPANDED)
-    cv2.resizeWindow(WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT)
-    pinned = False
-
-    while True:
+    if args.inference_process:
+        # 帧环按摄像头实际分辨率建（拿不到时用配置值）
+        shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or CAMERA_HEIGHT,
+                 int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or CAMERA_WIDTH, 3)
+        with startup.stage('worker'):
+            ready = recognizer.start(shape).wait_ready()
+        if not ready:
+            print(f"❌ Error: {recognizer.error}")
+            cap.release()
+            dispatcher.stop()
+            recognizer.close()
+            return 1
+    servers = []
+    if events is not None:
         try:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame = cv2.flip(frame, 1)
-            h, w = frame.shape[:2]
-
-            gesture, points = recognizer.recognize(frame, w, h)
+            servers = start_event_servers(events, args.events_socket, args.events_ws)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            cap.release()
+            dispatcher.stop()
+            recognizer.close()
+            return 1
+    capture = ThreadedCapture(cap).start()
+
+    # 显示方式：主进程窗口 / 独立进程预览 / 不显示
+    window = not args.headless
+    preview = None
+    if window:
+        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL | cv2.WINDOW_GUI_EXPANDED)
+        cv2.resizeWindow(WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT)
+    elif args.preview:
+        preview = PreviewProcess(
+            max(1, int(CAMERA_WIDTH * args.preview_scale)),
+            max(1, int(CAMERA_HEIGHT * args.preview_scale)),
+            fps=args.preview_fps,
+            window_name=WINDOW_NAME,
+        ).start()
 
-            # 检测并执行
-            action = detector.update(gesture)
-            if action:
-                execute_action(action)
-
-            # UI
-            status = detector.get_status(gesture)
-            _draw_status(frame, status)
-
-            # 滚动：官方 Pointing_Up 或检测到单指伸出
-            is_pointing = gesture == GestureType.POINTING_UP
-            single_finger = points.get('single_finger', False) if points else False
-            if (is_pointing or single_finger) and points:
-                _draw_scroll_guides(frame, h, w)
-                _do_scroll(points, h)
+    pinned = False
+    gesture, points = GestureType.NONE, {}
+    preprocessor = FramePreprocessor()
+    overlay = OverlayRenderer()
 
-            if pinned:
-                cv2.putText(frame, "[PIN]", (w - 60, 20),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+    try:
+        while True:
+            try:
+                t = metrics.start()
+                captured = capture.read()
+                metrics.stop('capture', t)
+                if captured is None:
+                    if capture.finished:
+                        break
+                    continue
+                startup.mark('first_frame')
+
+                frame_start = metrics.start()
+                if metrics.enabled:
+                    # 从采集到开始处理的等待时间
+                    metrics.record('frame_age', time.monotonic() - captured.timestamp)
+                    metrics.count('frames')
+                    if exporter is not None:
+                        exporter.maybe_export()
+
+                # 镜像 + 转 RGB，写进复用的缓冲区
+                t = metrics.start()
+                frame, rgb = preprocessor.process(captured.image)
+                h, w = frame.shape[:2]
+                metrics.stop('preprocess', t)
+
+                # 调节器按本帧时间戳判断该不该识别（和保持/冷却是同一个帧时钟）
+                clock.update(captured.timestamp_ms)
+                submitted = False
+                if should_recognize(governor, motion, frame):
+                    if recognizer.live_stream:
+                        # 上一帧还在推理 / 识别进程在重启时提交失败，这一帧当作跳过
+                        submitted = recognizer.recognize_async(rgb, w, h, captured.timestamp_ms,
+                                                               is_rgb=True)
+                    else:
+                        gesture, points = recognizer.recognize(rgb, w, h, captured.timestamp_ms,
+                                                               is_rgb=True)
+                        on_result(gesture, points, captured.timestamp_ms)
+                        submitted = True
+                    record_recognition(governor, motion, submitted)
+                if not submitted:
+                    # 只省掉推理：上一次结果按本帧时间戳再走一遍，静止的手照样累计保持时间
+                    feed.repeat(captured.timestamp_ms)
+                if recognizer.live_stream:
+                    gesture, points, _ = recognizer.latest
+
+                if not window and preview is None:
+                    metrics.stop('frame', frame_start)
+                    continue
+
+                # UI
+                t = metrics.start()
+                status = controller.get_status(gesture)
+                overlay.render(frame, status, _is_scrolling(gesture, points), pinned)
+                metrics.stop('overlay', t)
+
+                if preview is not None:
+                    t = metrics.start()
+                    preview.submit(frame)
+                    metrics.stop('display', t)
+                    metrics.stop('frame', frame_start)
+                    if preview.quit_requested:
+                        break
+                    continue
+
+                t = metrics.start()
+                cv2.imshow(WINDOW_NAME, frame)
+
+                if cv2.getWindowProperty(WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
+                    break
+
+                key = cv2.waitKey(1) & 0xFF
+                metrics.stop('display', t)
+                metrics.stop('frame', frame_start)
+                if key == ord('q'):
+                    break
+                elif key == ord('p'):
+                    pinned = not pinned
+                    cv2.setWindowProperty(WINDOW_NAME, cv2.WND_PROP_TOPMOST, 1.0 if pinned else 0.0)
+            except Exception as e:
+                print(f"Error: {e}")
+                import traceback
+                traceback.print_exc()
+    except KeyboardInterrupt:
+        pass
+
+    capture.stop()
+    dispatcher.stop()
+    if window:
+        cv2.destroyAllWindows()
+    if preview is not None:
+        preview.stop()
+    recognizer.close()
+    for server in servers:
+        server.stop()
+    if args.record:
+        print(f"Recorded {recognizer.recorder.frames} frames → {args.record}")
+    if exporter is not None:
+        exporter.export()
+    stats = capture.get_stats()
+    print(f"\nFrames: {stats['captured']} captured, {stats['dropped']} dropped")
+    if governor is not None:
+        stats = governor.get_stats()
+        print(f"Inference: {stats['processed']} run, {stats['skipped']} skipped (idle)")
+    if motion is not None:
+        stats = motion.get_stats()
+        print(f"Motion gate: {stats['processed']} passed, {stats['skipped']} skipped (static)")
+    if args.inference_process and recognizer.restarts:
+        print(f"Inference worker restarts: {recognizer.restarts}")
+    if overlay.rendered_frames:
+        stats = overlay.get_stats()
+        print(f"Overlay: {stats['mean_ms']:.3f} ms/frame")
+    if events is not None:
+        print(f"Events: {events.published} published, {events.dropped} dropped")
+    print("Bye!")
+    return 0
 
-            cv2.imshow(WINDOW_NAME, frame)
 
-            if cv2.getWindowProperty(WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
-                break
+class ResultFeed:
+    """
+    把识别结果送进 GestureController（异步识别回调线程和主循环都会调用，加锁）
+
+    调节器 / 运动门控跳过的帧调用 repeat()，按本帧时间戳重放上一次结果：
+    跳过的只是推理，保持计时、冷却和指向滚动照常按帧推进；重放的帧不算触发器的证据。
+    """
+
+    def __init__(self, controller, clock):
+        self.controller = controller
+        self.clock = clock
+        self.gesture = GestureType.NONE
+        self.points = {}
+        self._lock = threading.Lock()
+
+    def update(self, gesture: GestureType, points: dict, timestamp_ms: int):
+        """新的识别结果，返回执行的动作"""
+        with self._lock:
+            self.gesture, self.points = gesture, points
+            self.clock.update(timestamp_ms)
+            return self.controller.update(gesture, points)
+
+    def repeat(self, timestamp_ms: int):
+        """这一帧没有识别：沿用上一次结果"""
+        with self._lock:
+            self.clock.update(timestamp_ms)
+            return self.controller.update(self.gesture, self.points, replay=True)
+
+
+def should_recognize(governor, motion, frame) -> bool:
+    """
+    这一帧要不要跑识别：频率调节器和运动门控都放行才跑
+
+    放行之后按是否真的送去识别调用 record_recognition()。
+    """
+    if governor is not None and not governor.due():
+        return False
+    if motion is not None and not motion.has_motion(frame):
+        return False
+    return True
+
+
+def record_recognition(governor, motion, submitted: bool):
+    """
+    should_recognize 放行的帧送出去没有
+
+    送出去了才占调节器的低频名额（被运动门控挡下、识别器忙都不算）；
+    没送出去时运动门控换回原来的参考帧，下一帧仍和上一次识别的画面比较。
+    """
+    if submitted:
+        if governor is not None:
+            governor.record_run()
+    elif motion is not None:
+        motion.cancel()
+
+
+def parse_sources(spec: str) -> dict:
+    """'0,1,clip.mp4' → {'cam0': 0, 'cam1': 1, 'clip': 'clip.mp4'}（数字是摄像头编号）"""
+    sources = {}
+    for item in (part.strip() for part in spec.split(',')):
+        if not item:
+            continue
+        if item.isdigit():
+            name, source = f"cam{item}", int(item)
+        else:
+            name, source = os.path.splitext(os.path.basename(item))[0], item
+        while name in sources:
+            name += "'"
+        sources[name] = source
+    return sources
+
+
+FILTER_CHOICES = ('one_euro', 'kalman', 'none')
+
+
+def smoothing_config(smoothing: str = SMOOTHING, landmark_filter: str = LANDMARK_FILTER) -> dict:
+    """GestureRecognizer 的平滑和关键点滤波参数（config.py 里的阈值、窗口和滤波系数）"""
+    if landmark_filter == 'none':
+        landmark_filter = None
+    filter_options = None
+    if landmark_filter == 'one_euro':
+        filter_options = dict(min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA)
+    elif landmark_filter == 'kalman':
+        filter_options = dict(process_noise=KALMAN_PROCESS_NOISE,
+                              measurement_noise=KALMAN_MEASUREMENT_NOISE)
+    return dict(smoothing=smoothing,
+                smoothing_options=dict(enter=SMOOTHING_ENTER, exit=SMOOTHING_EXIT,
+                                       windows=dict(SMOOTHING_WINDOWS)),
+                landmark_filter=landmark_filter, filter_options=filter_options)
+
+
+def make_trigger(kind: str = TRIGGER):
+    """GestureController 的触发器（误触发率和漏检率取 config.py）；'hold' 返回 None"""
+    if kind == 'sprt':
+        return create_trigger(kind, false_trigger=TRIGGER_FALSE_RATE, miss=TRIGGER_MISS_RATE)
+    return create_trigger(kind)
+
+
+def make_swipe(enabled: bool = SWIPE_GESTURES):
+    """GestureController 的挥手检测（阈值、窗口和冷却取 config.py）；关闭时返回 None"""
+    if not enabled:
+        return None
+    return SwipeDetector(SWIPE_THRESHOLD, SWIPE_FRAMES, cooldown=SWIPE_COOLDOWN)
 
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('p'):
-                pinned = not pinned
-                cv2.setWindowProperty(WINDOW_NAME, cv2.WND_PROP_TOPMOST, 1.0 if pinned else 0.0)
-        except Exception as e:
-            print(f"Error: {e}")
-            import traceback
-            traceback.print_exc()
-
-    cap.release()
-    cv2.destroyAllWindows()
-    recognizer.close()
-    print("\nBye!")
-    return 0
 
+def make_profile(name: str, dispatcher, trigger: str = TRIGGER,
+                 frame_height: int = CAMERA_HEIGHT, interval: float = PROFILE_RELOAD_INTERVAL):
+    """
+    GestureController 的绑定配置（ProfileWatcher，每隔 interval 秒检查文件）
 
-# ===== UI 函数 =====
+    name 为 None 时返回 None（用内置映射）；timed 绑定按 trigger 创建证据触发器。
+    找不到文件抛 FileNotFoundError，格式错误抛 ValueError。
+    """
+    if name is None:
+        return None
+    return ProfileWatcher(resolve_profile(name), dispatcher, frame_height,
+                          trigger=lambda: make_trigger(trigger), interval=interval)
 
-def _draw_status(frame, text: str):
-    """显示状态文本"""
-    h, w = frame.shape[:2]
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (0, 0), (w, 35), (40, 40, 40), -1)
-    cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
-    cv2.putText(frame, text, (10, 23),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 220, 0), 2)
 
+def make_controller(dispatcher, clock, trigger: str = TRIGGER, swipe: bool = SWIPE_GESTURES,
+                    profile=None, **options):
+    """
+    与 main 相同配置的 GestureController（replay / benchmark 也用它，结果才能对得上）
 
-def _draw_scroll_guides(frame, h: int, w: int):
-    """绘制滚动辅助线"""
-    center_y = h // 2
-    dead_zone = h // 6
-    cv2.line(frame, (0, center_y), (w, center_y), (0, 200, 0), 1)
-    cv2.line(frame, (0, center_y - dead_zone), (w, center_y - dead_zone), (100, 100, 100), 1)
-    cv2.line(frame, (0, center_y + dead_zone), (w, center_y + dead_zone), (100, 100, 100), 1)
+    trigger、swipe 同命令行的 --trigger / --no-swipe；profile 是 make_profile 的结果；
+    其余参数（verbose、tag、events ...）原样传给 GestureController。
+    """
+    return GestureController(dispatcher, clock=clock, trigger=make_trigger(trigger),
+                             swipe=make_swipe(swipe), profile=profile, **options)
 
 
-# 滚动冷却
-_last_scroll_time = 0
+def make_event_bus(socket_path: str = EVENT_SOCKET, ws_port: int = EVENT_WS_PORT):
+    """GestureController 的事件总线；两种传输都没开时返回 None（不构造任何事件）"""
+    if socket_path is None and ws_port is None:
+        return None
+    return EventBus(queue_size=EVENT_QUEUE_SIZE)
 
-def _do_scroll(points: dict, frame_height: int):
-    """根据手指方向滚动：向上指=向上滚，向下指=向下滚"""
-    global _last_scroll_time
 
-    if not points or 'pointing_up' not in points:
-        return
+def start_event_servers(bus, socket_path: str = EVENT_SOCKET, ws_port: int = EVENT_WS_PORT):
+    """
+    开始在 Unix 域套接字 / 本机 WebSocket 上发布 bus 的事件，返回服务器列表
 
-    now = time.time()
-    if now - _last_scroll_time < 0.05:  # 50ms 冷却，更灵敏
-        return
+    绑定失败抛 OSError（已经开始的会先停掉）。
+    """
+    servers = []
+    try:
+        if socket_path is not None:
+            servers.append(UnixEventServer(bus, socket_path).start())
+            print(f"Events: unix:{socket_path}")
+        if ws_port is not None:
+            server = WebSocketEventServer(bus, ws_port).start()
+            servers.append(server)
+            print(f"Events: ws://{server.host}:{server.port}")
+    except OSError:
+        for server in servers:
+            server.stop()
+        raise
+    return servers
+
+
+def _worker_options(args) -> dict:
+    """识别进程里 create_recognizer 的参数（只放能 pickle 的值）"""
+    options = dict(roi_tracking=ROI_TRACKING, num_hands=MAX_NUM_HANDS,
+                   clap_distance=CLAP_DISTANCE_THRESHOLD, primary_hand=PRIMARY_HAND,
+                   **smoothing_config(args.smoothing, args.landmark_filter))
+    if args.classifier:
+        options.update(classifier=args.classifier, model_path=LANDMARKER_MODEL)
+    return options
+
+
+def run_multistream(args):
+    """多路模式：每路一个识别进程，动作按时间顺序合并到同一个派发器"""
+    from .core.multistream import MultiStreamRunner
+
+    sources = parse_sources(args.cameras)
+    if not sources:
+        print("❌ No sources")
+        return 1
+    try:
+        make_profile(args.profile, None)   # 打开摄像头之前先检查一遍配置
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
 
-    if points['pointing_up']:
-        # 向上指 → 向上滚动
-        pyautogui.scroll(5)
-        _last_scroll_time = now
-    else:
-        # 向下指 → 向下滚动
-        pyautogui.scroll(-5)
-        _last_scroll_time = now
+    captures = {}
+    for name, source in sources.items():
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            print(f"❌ Cannot open {source}")
+            for capture in captures.values():
+                capture.stop()
+            return 1
+        captures[name] = ThreadedCapture(cap).start()
+
+    # 各路共用一个事件总线，事件带 src
+    events = make_event_bus(args.events_socket, args.events_ws)
+    servers = []
+    if events is not None:
+        try:
+            servers = start_event_servers(events, args.events_socket, args.events_ws)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            for capture in captures.values():
+                capture.stop()
+            return 1
+
+    pool = RecognizerPool(options=_worker_options(args))
+
+    dispatcher = ActionDispatcher().start()
+    runner = MultiStreamRunner(
+        captures, lambda name, clock: make_controller(
+            dispatcher, clock, args.trigger, args.swipe,
+            make_profile(args.profile, dispatcher, args.trigger),
+            tag=name, events=events, landmark_events=EVENT_LANDMARKS),
+        pool=pool).start()
+    print(f"Multi-stream: {', '.join(f'{name}={source}' for name, source in sources.items())}")
+    print("Ctrl+C = quit\n")
+
+    status = 0
+    try:
+        # 输入都结束后，再等识别进程把手上的最后几帧做完
+        while not (runner.finished and not runner.starting and runner.idle_time > 1.0):
+            runner.step()
+            if runner.errors:
+                for name, error in runner.errors.items():
+                    print(f"❌ [{name}] {error}")
+                status = 1
+                break
+    except KeyboardInterrupt:
+        pass
+
+    runner.stop()
+    dispatcher.stop()
+    for server in servers:
+        server.stop()
+    for name, capture in captures.items():
+        captured = capture.get_stats()['captured']
+        stats = runner.stats[name]
+        restarts = pool.restarts.get(name, 0)
+        print(f"[{name}] {captured} captured, {stats['submitted']} submitted, "
+              f"{stats['results']} recognized" + (f", {restarts} restarts" if restarts else ""))
+    if runner.merger.late:
+        print(f"Out-of-order events: {runner.merger.late}")
+    if events is not None:
+        print(f"Events: {events.published} published, {events.dropped} dropped")
+    print("Bye!")
+    return status
+
+
+def _is_scrolling(gesture: GestureType, points: dict) -> bool:
+    """滚动：官方 Pointing_Up 或检测到单指伸出"""
+    if not points:
+        return False
+    return gesture == GestureType.POINTING_UP or points.get('single_finger', False)
 
 
 if __name__ == "__main__":
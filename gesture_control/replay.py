@@ -0,0 +1,267 @@
+"""
+会话回放 - 不开摄像头、不跑模型，把录制的识别结果重新走一遍后处理
+
+录制（main.py --record）保存的是模型输出，回放把它依次送进：
+    平滑（GestureRecognizer.process_result）
+    → SimpleGesture 或绑定配置（--profile）/ 指向滚动（GestureController）
+    → ActivationManager
+    → 可选的 GestureStateMachine + 动作表（core/actions.py）
+所有计时都用录制的帧时间戳，所以结果是确定的，而且比实时快几个数量级。
+
+用法：
+    python -m gesture_control.replay session.npz
+    python -m gesture_control.replay session.npz --hold-time 0.2 --smoothing-frames 2 --json out.json
+    python -m gesture_control.replay session.npz --smoothing vote   # 与多数投票对比
+    python -m gesture_control.replay session.npz --filter none      # 不做关键点滤波
+    python -m gesture_control.replay a.npz b.npz --trigger hold     # 对比固定保持时间的触发延迟
+    python -m gesture_control.replay session.npz --profile presentation   # 试一份绑定配置
+"""
+
+import argparse
+import json
+import math
+import time
+from collections import Counter
+
+from .config import LANDMARK_FILTER, SMOOTHING, SWIPE_GESTURES, TRIGGER
+from .core.activation import ActivationManager
+from .core.clock import FrameClock
+from .core.gestures import GestureRecognizer, GestureType
+from .core.recording import Recording, load_recording
+from .core.state_machine import GestureStateMachine
+from .core.trigger import TRIGGERS
+from .main import FILTER_CHOICES, make_controller, make_profile, smoothing_config
+
+
+class RecordingDispatcher:
+    """
+    同步的 "派发器"：不真正按键，只把按键事件记下来（带回放时间戳）
+
+    接口与 ActionDispatcher 一致，可以直接传给 GestureController 和动作类
+    """
+
+    def __init__(self, events: list):
+        self.events = events
+        self.timestamp_ms = 0
+
+    def press(self, key: str, count: int = 1):
+        self.events.append((self.timestamp_ms, 'press', f'{key}x{count}'))
+
+    def scroll(self, amount: int):
+        self.events.append((self.timestamp_ms, 'scroll', amount))
+
+    def call(self, func):
+        func()
+
+
+class ReplayEngine:
+    """
+    回放引擎
+
+    每次 run() 都新建全部组件，同一份录制多次回放结果完全相同
+    """
+
+    def __init__(self, recording: Recording, bindings=None, hold_time: float = None,
+                 smoothing_frames: int = None, activation_time: float = None,
+                 smoothing: str = SMOOTHING, landmark_filter: str = LANDMARK_FILTER,
+                 trigger: str = TRIGGER, swipe: bool = SWIPE_GESTURES, profile: str = None):
+        """
+        Args:
+            recording: load_recording() 的结果
+            bindings: 可选，bindings(dispatcher) → {GestureType: GestureAction}，
+                      用于回放表驱动的动作（GestureStateMachine + core/actions.py），
+                      动作的按键同样记录为 press / scroll 事件
+            hold_time: 覆盖 SimpleGesture.HOLD_TIME
+            smoothing_frames: 覆盖 GestureRecognizer.SMOOTHING_FRAMES
+            activation_time: 覆盖 ActivationManager.ACTIVATION_TIME
+            smoothing: 平滑方式 'evidence' / 'vote'（阈值和单手势窗口取 config.py）
+            landmark_filter: 关键点滤波 'one_euro' / 'kalman' / None（用录制的时间戳）
+            trigger: 动作触发 'sprt'（证据足够提前触发）/ 'hold'（只按保持时间）
+            swipe: 是否检测挥手（阈值和窗口取 config.py）
+            profile: 可选，绑定配置的名字或路径（core/profiles.py），动作名为绑定的描述
+        """
+        self.recording = recording
+        self.bindings = bindings
+        self.hold_time = hold_time
+        self.smoothing_frames = smoothing_frames
+        self.activation_time = activation_time
+        self.smoothing = smoothing
+        self.landmark_filter = landmark_filter
+        self.trigger = trigger
+        self.swipe = swipe
+        self.profile = profile
+
+    def run(self) -> dict:
+        """
+        回放整段录制
+
+        Returns:
+            dict: {'frames', 'duration_s', 'elapsed_s', 'speedup', 'counts', 'events',
+                   'trigger_latency', 'trigger_latencies_ms'}
+                  events 为 (timestamp_ms, 类型, 值) 列表，类型有
+                  gesture / action / press / scroll / activated / deactivated；
+                  trigger_latency 是动作相对原始手势第一次出现的延迟统计（latency_summary）
+        """
+        events = []
+        dispatcher = RecordingDispatcher(events)
+
+        recognizer = GestureRecognizer(model_path=None, smoothing_frames=self.smoothing_frames,
+                                       **smoothing_config(self.smoothing, self.landmark_filter))
+
+        # 所有计时组件共用一个帧时钟，时间只随录制的时间戳前进
+        clock = FrameClock()
+        # 回放不热加载：配置只在开始时读一次
+        profile = make_profile(self.profile, dispatcher, self.trigger,
+                               self.recording.frame_size[1], interval=float('inf'))
+        controller = make_controller(dispatcher, clock, self.trigger, self.swipe, profile,
+                                     verbose=False)
+        if self.hold_time is not None:
+            controller.detector.HOLD_TIME = self.hold_time
+
+        activation = ActivationManager(clock)
+        if self.activation_time is not None:
+            activation.ACTIVATION_TIME = self.activation_time
+
+        state_machine = GestureStateMachine(clock)
+        bindings = self.bindings(dispatcher) if self.bindings is not None else {}
+
+        recording = self.recording
+        width, height = recording.frame_size
+        last_gesture = GestureType.NONE
+        last_raw = GestureType.NONE
+        onsets = {}       # 原始手势 → 这一段第一次出现的时间戳
+        latencies = []
+        was_activated = False
+        start = time.perf_counter()
+
+        for i in range(len(recording)):
+            timestamp_ms = int(recording.timestamps_ms[i])
+            clock.update(timestamp_ms)
+            dispatcher.timestamp_ms = timestamp_ms
+
+            result = recording.result_at(i)
+            gesture, points = recognizer.process_result(result, width, height,
+                                                        timestamp_ms=timestamp_ms)
+            if gesture != last_gesture:
+                events.append((timestamp_ms, 'gesture', gesture.name))
+                last_gesture = gesture
+            if recognizer.raw_gesture != last_raw:
+                last_raw = recognizer.raw_gesture
+                onsets[last_raw] = timestamp_ms
+
+            action = controller.update(gesture, points)
+            if action:
+                events.append((timestamp_ms, 'action', action))
+                onset = onsets.get(controller.current_gesture)
+                if onset is not None and controller.last_swipe is None:   # 挥手没有保持时间
+                    latencies.append(timestamp_ms - onset)
+
+            state = activation.update(bool(points), gesture)
+            if state['activated'] != was_activated:
+                was_activated = state['activated']
+                events.append((timestamp_ms, 'activated' if was_activated else 'deactivated', ''))
+
+            if bindings:
+                hold_time = state_machine.update(gesture)
+                binding = bindings.get(gesture)
+                if binding is not None:
+                    binding.execute(hold_time, state_machine, points)
+
+        elapsed = time.perf_counter() - start
+        duration = recording.duration
+        return {
+            'frames': len(recording),
+            'duration_s': duration,
+            'elapsed_s': elapsed,
+            'speedup': duration / elapsed if elapsed > 0 else float('inf'),
+            'counts': dict(Counter(kind for _, kind, _ in events)),
+            'events': events,
+            'trigger_latency': latency_summary(latencies),
+            'trigger_latencies_ms': latencies,
+        }
+
+
+def latency_summary(latencies_ms: list) -> dict:
+    """触发延迟统计：{'count', 'mean_ms', 'p95_ms', 'max_ms'}（p95 取最近秩）"""
+    if not latencies_ms:
+        return {'count': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    ordered = sorted(latencies_ms)
+    return {
+        'count': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered),
+        'p95_ms': float(ordered[max(1, math.ceil(len(ordered) * 0.95)) - 1]),
+        'max_ms': float(ordered[-1]),
+    }
+
+
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="回放录制的手势会话")
+    parser.add_argument('recordings', nargs='+', help="main.py --record 录制的 .npz 文件")
+    parser.add_argument('--hold-time', type=float, help="覆盖 SimpleGesture.HOLD_TIME（秒）")
+    parser.add_argument('--smoothing-frames', type=int, help="覆盖平滑窗口帧数")
+    parser.add_argument('--smoothing', choices=('evidence', 'vote'), default=SMOOTHING,
+                        help=f"平滑方式（默认 {SMOOTHING}）")
+    parser.add_argument('--filter', dest='landmark_filter', choices=FILTER_CHOICES,
+                        default=str(LANDMARK_FILTER).lower(),
+                        help=f"关键点时域滤波（默认 {LANDMARK_FILTER}）")
+    parser.add_argument('--trigger', choices=TRIGGERS, default=TRIGGER,
+                        help=f"动作触发方式（默认 {TRIGGER}）")
+    parser.add_argument('--no-swipe', dest='swipe', action='store_false', default=SWIPE_GESTURES,
+                        help="不检测挥手")
+    parser.add_argument('--profile', metavar='NAME_OR_PATH',
+                        help="按绑定配置（gesture_control/profiles 下的名字或文件）回放动作")
+    parser.add_argument('--activation-time', type=float, help="覆盖激活所需手掌保持时间（秒）")
+    parser.add_argument('--events', action='store_true', help="打印全部事件")
+    parser.add_argument('--json', metavar='PATH', help="把回放结果写成 JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """回放命令入口"""
+    args = parse_args(argv)
+    reports = {}
+    latencies = []
+
+    for path in args.recordings:
+        engine = ReplayEngine(
+            load_recording(path),
+            hold_time=args.hold_time,
+            smoothing_frames=args.smoothing_frames,
+            activation_time=args.activation_time,
+            smoothing=args.smoothing,
+            landmark_filter=args.landmark_filter,
+            trigger=args.trigger,
+            swipe=args.swipe,
+            profile=args.profile,
+        )
+        report = engine.run()
+        reports[path] = report
+        latencies += report['trigger_latencies_ms']
+
+        print(f"{path}: {report['frames']} frames, {report['duration_s']:.1f}s recorded, "
+              f"replayed in {report['elapsed_s']:.3f}s ({report['speedup']:.0f}x)")
+        for kind, n in sorted(report['counts'].items()):
+            print(f"  {kind:<12} {n}")
+        latency = report['trigger_latency']
+        if latency['count']:
+            print(f"  trigger latency ({args.trigger}): mean {latency['mean_ms']:.0f}ms, "
+                  f"p95 {latency['p95_ms']:.0f}ms, max {latency['max_ms']:.0f}ms")
+        if args.events:
+            for timestamp_ms, kind, value in report['events']:
+                print(f"  {timestamp_ms:>10} {kind:<12} {value}")
+
+    if len(args.recordings) > 1 and latencies:
+        latency = latency_summary(latencies)
+        print(f"all sessions: {latency['count']} actions, trigger latency ({args.trigger}) "
+              f"mean {latency['mean_ms']:.0f}ms, p95 {latency['p95_ms']:.0f}ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,88 @@
+"""
+训练自定义手势分类器 - 从录制的会话算出每个手势的质心
+
+每段录制（main.py --record）可以标一个手势，也可以不标：
+    fist.npz:FIST        整段都算握拳
+    clap.npz:CLAP        模型没有的手势：GestureType 里有这个名字就能直接触发
+    mixed.npz            不标：用录制时官方识别器的结果做标签
+
+标签必须是 GestureType 的名字（或 MediaPipe 官方名称），其他名字报错退出 ——
+识别结果按 GestureType 查动作，全新的手势要先在 GestureType 里加一项。
+
+用法：
+    python -m gesture_control.train_classifier gestures.npz fist.npz:FIST palm.npz:OPEN_PALM
+    python run.py  # config.CLASSIFIER_PATH = 'gestures.npz'
+"""
+
+import argparse
+
+import numpy as np
+
+from .core.classifier import CentroidClassifier, samples_from_recording
+from .core.recording import load_recording
+
+
+def parse_source(source: str):
+    """'path.npz:LABEL' → (path, label)；没有标签时 label 为 None"""
+    path, sep, label = source.rpartition(':')
+    if not sep or not label or '/' in label or '\\' in label:
+        return source, None
+    return path, label
+
+
+def evaluate(vectors: np.ndarray, labels: np.ndarray) -> float:
+    """隔帧交叉验证：偶数帧训练、奇数帧测试，返回准确率"""
+    if len(vectors) < 2:
+        return float('nan')
+    classifier = CentroidClassifier.fit(vectors[::2], labels[::2])
+    predicted = [classifier.predict(v)[0] for v in vectors[1::2]]
+    return float(np.mean(np.array(predicted) == labels[1::2]))
+
+
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="从录制会话训练自定义手势分类器")
+    parser.add_argument('output', help="输出的分类器文件（.npz）")
+    parser.add_argument('recordings', nargs='+',
+                        help="录制文件，可写成 path.npz:LABEL；LABEL 必须是 GestureType 的名字"
+                             "（如 FIST、CLAP），自定义手势要先加进 GestureType")
+    parser.add_argument('--min-score', type=float, default=0.5,
+                        help="不标注时，官方识别器分数低于此值的帧不参与训练（默认 0.5）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """训练命令入口"""
+    args = parse_args(argv)
+
+    all_vectors, all_labels = [], []
+    for source in args.recordings:
+        path, label = parse_source(source)
+        try:
+            vectors, labels = samples_from_recording(load_recording(path), label, args.min_score)
+        except ValueError as e:
+            print(f"❌ {path}: {e}")
+            return 1
+        print(f"{path}: {len(vectors)} samples" + (f" → {label}" if label else ""))
+        all_vectors.append(vectors)
+        all_labels.append(labels)
+
+    vectors = np.concatenate(all_vectors)
+    labels = np.concatenate(all_labels)
+    if not len(vectors):
+        print("❌ No hand frames in recordings")
+        return 1
+
+    classifier = CentroidClassifier.fit(vectors, labels)
+    classifier.save(args.output)
+
+    names, counts = np.unique(labels, return_counts=True)
+    for name, n in zip(names, counts):
+        print(f"  {name:<12} {n}")
+    print(f"Held-out accuracy: {evaluate(vectors, labels) * 100:.1f}%")
+    print(f"Saved {len(classifier.labels)} classes → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
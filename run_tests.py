@@ -5,12 +5,44 @@
 不需要 pytest，直接运行测试
 """
 
+import importlib
 import sys
 import os
 
 # 添加当前目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# 测试套件表：(显示名称, tests 下的模块名)
+TEST_SUITES = [
+    ("GestureStateMachine", "test_state_machine"),
+    ("Clock", "test_clock"),
+    ("Actions", "test_actions"),
+    ("ThreadedCapture", "test_capture"),
+    ("ActionDispatcher", "test_dispatcher"),
+    ("GestureRecognizer", "test_gestures"),
+    ("HandFeatures", "test_features"),
+    ("LandmarkClassifier", "test_classifier"),
+    ("HandTracker", "test_hands"),
+    ("Smoothing", "test_smoothing"),
+    ("LandmarkFilters", "test_filters"),
+    ("Trigger", "test_trigger"),
+    ("SwipeDetector", "test_swipe"),
+    ("Profiles", "test_profiles"),
+    ("Startup", "test_startup"),
+    ("EventBus", "test_events"),
+    ("HandROITracker", "test_roi"),
+    ("InferenceGovernor", "test_governor"),
+    ("MotionDetector", "test_motion"),
+    ("FramePreprocessor", "test_preprocess"),
+    ("OverlayRenderer", "test_overlay"),
+    ("PreviewProcess", "test_preview"),
+    ("Metrics", "test_metrics"),
+    ("Recording / Replay", "test_recording"),
+    ("Benchmark", "test_benchmark"),
+    ("MultiStream", "test_multistream"),
+    ("RemoteRecognizer", "test_worker"),
+]
+
 
 def run_tests():
     """运行所有测试"""
@@ -21,34 +53,17 @@ def run_tests():
 
     all_passed = True
 
-    # 运行 state_machine 测试
-    print("[1/2] 测试 GestureStateMachine...")
-    try:
-        from tests import test_state_machine
-        test_state_machine.test_initial_state()
-        test_state_machine.test_gesture_tracking()
-        test_state_machine.test_gesture_switch()
-        test_state_machine.test_should_execute()
-        test_state_machine.test_multiple_thresholds()
-        test_state_machine.test_reset()
-        print("      ✓ 所有 GestureStateMachine 测试通过\n")
-    except Exception as e:
-        print(f"      ✗ 测试失败: {e}\n")
-        all_passed = False
-
-    # 运行 actions 测试
-    print("[2/2] 测试 Actions 系统...")
-    try:
-        from tests import test_actions
-        test_actions.test_timed_action_basic()
-        test_actions.test_timed_action_no_repeat()
-        test_actions.test_repeat_key_action()
-        test_actions.test_idle_action()
-        test_actions.test_position_action()
-        print("      ✓ 所有 Actions 测试通过\n")
-    except Exception as e:
-        print(f"      ✗ 测试失败: {e}\n")
-        all_passed = False
+    for index, (name, module_name) in enumerate(TEST_SUITES, 1):
+        print(f"[{index}/{len(TEST_SUITES)}] 测试 {name}...")
+        try:
+            module = importlib.import_module(f"tests.{module_name}")
+            for attr in dir(module):
+                if attr.startswith("test_"):
+                    getattr(module, attr)()
+            print(f"      ✓ 所有 {name} 测试通过\n")
+        except Exception as e:
+            print(f"      ✗ 测试失败: {e}\n")
+            all_passed = False
 
     # 总结
     print("=" * 60)
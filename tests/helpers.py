@@ -0,0 +1,102 @@
+"""
+测试共用的假对象和构造函数
+
+- FakeRecognizer / create_fake / create_broken / frame_with：子进程识别和多路模式
+  （工厂函数在模块顶层，spawn 出来的进程按名字导入）
+- make_result / make_hands：GestureRecognizerResult 形状的识别结果
+- make_recognizer：MediaPipe 模型用 Mock 代替的识别器
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from gesture_control.core.gestures import GestureRecognizer, GestureType
+
+SHAPE = (24, 32, 3)
+CRASH = 99   # 画面像素为这个值时假识别器让进程崩溃
+
+
+class FakeRecognizer:
+    """
+    按画面左上角像素值给出手势（0 → NONE，其他 → FIST），记录收到的帧
+
+    raw_gesture 总是 OPEN_PALM（看得出主/原始手势分别回传）；
+    像素值为 CRASH 且 crash_marker 文件还不存在时让进程崩溃（只崩一次）。
+    """
+
+    def __init__(self, crash_marker=None, **options):
+        self.crash_marker = crash_marker
+        self.options = options
+        self.raw_gesture = GestureType.OPEN_PALM
+        self.frames = []
+        self.closed = False
+
+    def recognize(self, frame, width, height, timestamp_ms=None, is_rgb=False):
+        value = int(frame[0, 0, 0])
+        if value == CRASH and self.crash_marker and not os.path.exists(self.crash_marker):
+            open(self.crash_marker, 'w').close()
+            os._exit(1)
+        self.frames.append((value, width, height, timestamp_ms, is_rgb))
+        gesture = GestureType.FIST if value else GestureType.NONE
+        return gesture, {'index_x': width, 'index_y': height, 'features': object()}
+
+    def close(self):
+        self.closed = True
+
+
+def create_fake(**options):
+    return FakeRecognizer(**options)
+
+
+def create_broken(**options):
+    raise FileNotFoundError("Model not found: model.task")
+
+
+def frame_with(value, shape=SHAPE):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def make_landmarks(tip=(0.5, 0.2)):
+    """一只手的 21 个关键点：手腕在下方，食指尖在 tip"""
+    landmarks = [SimpleNamespace(x=0.5, y=0.6, z=0.01 * i) for i in range(21)]
+    landmarks[8] = SimpleNamespace(x=tip[0], y=tip[1], z=0.0)
+    return landmarks
+
+
+def make_hands(*hands):
+    """hands: [(左右手, [(类别名, 分数), ...], 关键点), ...]，按检测顺序"""
+    return SimpleNamespace(
+        gestures=[[SimpleNamespace(category_name=name, score=score) for name, score in categories]
+                  for _, categories, _ in hands],
+        handedness=[[SimpleNamespace(category_name=side, score=0.95)] for side, _, _ in hands],
+        hand_landmarks=[landmarks for _, _, landmarks in hands],
+        hand_world_landmarks=[landmarks for _, _, landmarks in hands],
+    )
+
+
+def make_result(name=None, score=0.9, categories=None, tip=(0.5, 0.2)):
+    """
+    单手（右手）识别结果，name 和 categories 都没给表示没有手
+
+    Args:
+        name, score: top-1 类别，其余分数归 'None' 类
+        categories: [(类别名, 分数), ...] 直接给出完整分布（代替 name / score）
+        tip: 食指尖的归一化坐标
+    """
+    if categories is None:
+        if name is None:
+            return make_hands()
+        categories = [(name, score), ('None', 1 - score)]
+    return make_hands(('Right', categories, make_landmarks(tip)))
+
+
+def make_recognizer(*args, engine=GestureRecognizer, **kwargs):
+    """创建识别器（engine 也可以是 LandmarkRecognizer），MediaPipe 模型用 Mock 代替"""
+    with patch('gesture_control.core.gestures.os.path.exists', return_value=True), \
+            patch('gesture_control.core.gestures.python'), \
+            patch('gesture_control.core.gestures.vision'), \
+            patch('gesture_control.core.classifier.vision'):
+        return engine(*args, **kwargs)
@@ -63,6 +63,23 @@ def test_timed_action_no_repeat():
         assert mock_gui.press.call_count == 1
 
 
+def test_timed_action_multiple_thresholds():
+    """测试时间触发动作 - 保持超过两档：两档各执行一次"""
+    with patch('gesture_control.core.actions.pyautogui') as mock_gui:
+        action = TimedAction([
+            (0.3, 'b', 'Blank screen'),
+            (2.0, 'escape', 'End show'),
+        ])
+
+        sm = GestureStateMachine()
+        sm.update(GestureType.FIST)
+
+        results = [action.execute(i * 0.1, sm, {}) for i in range(31)]
+        assert [c.args[0] for c in mock_gui.press.call_args_list] == ['b', 'escape']
+        assert results[10] == '✓ Blank screen'
+        assert results[-1] == '✓ End show'
+
+
 def test_repeat_key_action():
     """测试重复按键动作 - Victory → 4 次左键"""
     with patch('gesture_control.core.actions.pyautogui') as mock_gui:
@@ -131,6 +148,9 @@ if __name__ == "__main__":
     test_timed_action_no_repeat()
     print("✓ test_timed_action_no_repeat")
 
+    test_timed_action_multiple_thresholds()
+    print("✓ test_timed_action_multiple_thresholds")
+
     test_repeat_key_action()
     print("✓ test_repeat_key_action")
 
@@ -0,0 +1,167 @@
+"""
+测试 benchmark - 素材读取与基准流水线
+
+运行方式：
+    python -m pytest tests/test_benchmark.py -v
+"""
+
+import sys
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.benchmark import BenchmarkPipeline, iter_frames, peak_rss_mb, source_fps
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.metrics import DISABLED
+from gesture_control.core.swipe import SwipeDetector
+from gesture_control.core.trigger import SPRTTrigger
+from gesture_control.main import parse_args
+
+
+class FakeRecognizer:
+    """固定返回握拳，记录收到的时间戳"""
+
+    def __init__(self, gesture=GestureType.FIST):
+        self.gesture = gesture
+        self.metrics = DISABLED
+        self.timestamps = []
+
+    def recognize(self, frame, frame_width, frame_height, timestamp_ms=None, is_rgb=False):
+        t = self.metrics.start()
+        self.timestamps.append(timestamp_ms)
+        self.metrics.stop('inference', t)
+        return self.gesture, {'index_x': frame_width // 2, 'index_y': frame_height // 2}
+
+
+def make_frames(n, w=160, h=120):
+    return [np.full((h, w, 3), i * 10 % 256, dtype=np.uint8) for i in range(n)]
+
+
+def test_iter_frames_image_dir():
+    """测试图片目录按文件名顺序读取，跳过非图片文件"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, frame in enumerate(make_frames(3)):
+            cv2.imwrite(os.path.join(tmp, f'{2 - i:03d}.png'), frame)
+        open(os.path.join(tmp, 'notes.txt'), 'w').close()
+
+        frames = list(iter_frames(tmp))
+        assert len(frames) == 3
+        assert frames[0][0, 0, 0] == 20   # 000.png 是最后写的那张
+        assert source_fps(tmp, default=25.0) == 25.0
+
+
+def test_iter_frames_video():
+    """测试读取视频文件和帧率"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 15, (160, 120))
+        if not writer.isOpened():
+            return   # 这台机器的 OpenCV 没有编码器，跳过
+        for frame in make_frames(5):
+            writer.write(frame)
+        writer.release()
+
+        assert len(list(iter_frames(path))) == 5
+        assert abs(source_fps(path) - 15) < 0.5
+
+
+def test_iter_frames_missing():
+    """测试不存在的素材报错"""
+    try:
+        next(iter_frames('/nonexistent/clip.mp4'))
+        assert False, "应该抛出 FileNotFoundError"
+    except FileNotFoundError:
+        pass
+
+
+def test_pipeline_report():
+    """测试基准报告：帧数、分阶段统计、动作计数"""
+    recognizer = FakeRecognizer()
+    pipeline = BenchmarkPipeline(recognizer)
+    result = pipeline.run(make_frames(30), fps=30.0)
+
+    assert result['frames'] == 30
+    assert result['fps'] > 0 and result['cpu_ms_per_frame'] >= 0
+    for stage in ('decode', 'preprocess', 'inference', 'gesture', 'overlay', 'frame'):
+        assert result['stages'][stage]['count'] == 30
+    # 握拳保持 1 秒：触发一次暂停（按一次空格）
+    assert result['counts'] == {'press': 1}
+    # 时间戳按帧率合成
+    assert recognizer.timestamps[:3] == [0, 33, 67]
+
+
+def test_pipeline_warmup_and_limit():
+    """测试预热帧不计入统计，limit 限制处理帧数，时间戳跨素材递增"""
+    recognizer = FakeRecognizer()
+    pipeline = BenchmarkPipeline(recognizer, overlay=False)
+
+    result = pipeline.run(make_frames(20), fps=10.0, limit=8, warmup=5)
+    assert result['frames'] == 8
+    assert result['stages']['inference']['count'] == 8
+    assert 'overlay' not in result['stages']
+    assert len(recognizer.timestamps) == 13
+
+    pipeline.run(make_frames(3), fps=10.0)
+    assert recognizer.timestamps == sorted(set(recognizer.timestamps))
+
+
+def test_pipeline_controller_matches_main():
+    """测试默认的控制器与 main 一致（证据触发、挥手检测），--trigger hold / --no-swipe 可以关掉"""
+    args = parse_args([])
+    pipeline = BenchmarkPipeline(FakeRecognizer(), overlay=False)
+    assert args.trigger == 'sprt' and args.swipe
+    assert isinstance(pipeline.controller.detector.trigger, SPRTTrigger)
+    assert isinstance(pipeline.controller.swipe, SwipeDetector)
+
+    pipeline = BenchmarkPipeline(FakeRecognizer(), overlay=False, trigger='hold', swipe=False)
+    assert pipeline.controller.detector.trigger is None
+    assert pipeline.controller.swipe is None
+
+
+def test_pipeline_overlay_uses_profile_status():
+    """测试加载了配置时叠加层显示绑定的描述，与 main 的状态栏一致"""
+    pipeline = BenchmarkPipeline(FakeRecognizer(), profile='presentation')
+    pipeline.run(make_frames(5), fps=30.0)
+    status = pipeline.controller.get_status(GestureType.FIST)
+    assert status == 'FIST → Blank screen (0.3s) / End show (2s)'
+    assert [key[0] for key in pipeline.overlay._sprites] == [status]
+
+
+def test_peak_rss():
+    """测试峰值内存（支持的平台上是正数）"""
+    rss = peak_rss_mb()
+    assert rss is None or rss > 0
+
+
+if __name__ == "__main__":
+    print("Running benchmark tests...")
+
+    test_iter_frames_image_dir()
+    print("✓ test_iter_frames_image_dir")
+
+    test_iter_frames_video()
+    print("✓ test_iter_frames_video")
+
+    test_iter_frames_missing()
+    print("✓ test_iter_frames_missing")
+
+    test_pipeline_report()
+    print("✓ test_pipeline_report")
+
+    test_pipeline_warmup_and_limit()
+    print("✓ test_pipeline_warmup_and_limit")
+
+    test_pipeline_controller_matches_main()
+    print("✓ test_pipeline_controller_matches_main")
+
+    test_pipeline_overlay_uses_profile_status()
+    print("✓ test_pipeline_overlay_uses_profile_status")
+
+    test_peak_rss()
+    print("✓ test_peak_rss")
+
+    print("\n所有基准测试通过！")
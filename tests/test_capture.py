@@ -0,0 +1,119 @@
+"""
+测试 ThreadedCapture - 后台采集与最新帧缓冲
+
+运行方式：
+    python -m pytest tests/test_capture.py -v
+"""
+
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.capture import ThreadedCapture
+
+
+class FakeCapture:
+    """模拟 cv2.VideoCapture：按顺序返回给定帧，读完返回失败"""
+
+    def __init__(self, frames, gate=None):
+        self.frames = list(frames)
+        self.gate = gate  # 每次 read 前等待的信号量（控制采集节奏）
+        self.released = False
+
+    def read(self):
+        if self.gate is not None:
+            self.gate.acquire()
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+    def release(self):
+        self.released = True
+
+
+def test_read_returns_frames_with_timestamps():
+    """测试帧按顺序带时间戳返回"""
+    gate = threading.Semaphore(0)
+    capture = ThreadedCapture(FakeCapture(['a', 'b'], gate)).start()
+
+    gate.release()
+    first = capture.read()
+    assert first.image == 'a'
+    assert first.index == 1
+
+    gate.release()
+    second = capture.read()
+    assert second.image == 'b'
+    assert second.timestamp >= first.timestamp
+
+    gate.release()  # 第三次 read 失败 → 采集结束
+    assert capture.read() is None
+    assert capture.finished
+
+    capture.stop()
+    assert capture.cap.released
+
+
+def test_latest_frame_wins():
+    """测试消费者跟不上时只拿最新帧，并统计丢帧"""
+    capture = ThreadedCapture(FakeCapture(['a', 'b', 'c'])).start()
+    capture._thread.join(timeout=1.0)  # 等待全部读完
+
+    frame = capture.read()
+    assert frame.image == 'c'
+    assert frame.index == 3
+    assert capture.get_stats() == {'captured': 3, 'dropped': 2}
+
+    # 同一帧不会返回两次
+    assert capture.read(timeout=0.05) is None
+    capture.stop()
+
+
+def test_read_timeout():
+    """测试没有新帧时超时返回 None"""
+    gate = threading.Semaphore(0)
+    capture = ThreadedCapture(FakeCapture(['a'], gate)).start()
+
+    assert capture.read(timeout=0.05) is None
+    assert not capture.finished
+
+    gate.release()
+    gate.release()
+    capture.stop()
+
+
+def test_stop_while_read_blocked():
+    """测试线程卡在 read() 里时 stop() 不释放摄像头，线程退出时再释放"""
+    gate = threading.Semaphore(0)
+    capture = ThreadedCapture(FakeCapture(['a'], gate)).start()
+    capture.STOP_TIMEOUT = 0.05
+    thread = capture._thread
+
+    capture.stop()
+    assert thread.is_alive()
+    assert not capture.cap.released      # read() 还没返回
+
+    gate.release()                       # read() 返回后线程看到停止标志退出
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert capture.cap.released
+
+
+if __name__ == "__main__":
+    print("Running capture tests...")
+
+    test_read_returns_frames_with_timestamps()
+    print("✓ test_read_returns_frames_with_timestamps")
+
+    test_latest_frame_wins()
+    print("✓ test_latest_frame_wins")
+
+    test_read_timeout()
+    print("✓ test_read_timeout")
+
+    test_stop_while_read_blocked()
+    print("✓ test_stop_while_read_blocked")
+
+    print("\n所有采集测试通过！")
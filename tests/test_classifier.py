@@ -0,0 +1,221 @@
+"""
+测试自定义手势分类器 - 特征归一化、训练/预测、录制取样、识别引擎
+
+运行方式：
+    python -m pytest tests/test_classifier.py -v
+"""
+
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.classifier import (
+    CentroidClassifier, LandmarkRecognizer, hand_vector, samples_from_recording,
+)
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.recording import SessionRecorder, load_recording
+from gesture_control.core.roi import Landmark
+from gesture_control import train_classifier
+from tests.helpers import make_recognizer
+
+
+def make_hand(folded=(), rng=None, noise=0.003, offset=(0.0, 0.0, 0.0), scale=1.0):
+    """世界坐标的手（米）：手指竖直，folded 里的手指从 PIP 折回"""
+    points = [(0.0, 0.0, 0.0)]
+    for finger in range(5):
+        x = -0.03 + finger * 0.015
+        for joint in range(4):
+            if finger in folded and joint >= 2:
+                y, z = -0.07 + (joint - 1) * 0.02, -0.02 * (joint - 1)
+            else:
+                y, z = -0.05 - joint * 0.025, 0.0
+            points.append((x, y, z))
+    points = np.array(points) * scale + offset
+    if rng is not None:
+        points += rng.normal(0, noise, points.shape)
+    return [Landmark(*p) for p in points]
+
+
+FIST = (1, 2, 3, 4)
+POINT = (2, 3, 4)
+
+
+def make_dataset(rng, n=40):
+    vectors, labels = [], []
+    for label, folded in (('FIST', FIST), ('OPEN_PALM', ()), ('POINTING_UP', POINT)):
+        for _ in range(n):
+            vectors.append(hand_vector(make_hand(folded, rng)))
+            labels.append(label)
+    return np.array(vectors), np.array(labels)
+
+
+def test_hand_vector_invariance():
+    """测试特征与位置、大小无关，左手镜像后与右手一致"""
+    base = hand_vector(make_hand(FIST))
+    moved = hand_vector(make_hand(FIST, offset=(0.1, -0.2, 0.05), scale=1.3))
+    assert base.shape == (63,)
+    assert np.allclose(base, moved, atol=1e-5)
+
+    mirrored = [Landmark(-p.x, p.y, p.z) for p in make_hand(FIST)]
+    assert np.allclose(hand_vector(mirrored, is_left=True), base, atol=1e-6)
+
+
+def test_fit_and_predict():
+    """测试训练后能分清三类，离得太远的拒识为 NONE"""
+    rng = np.random.default_rng(0)
+    vectors, labels = make_dataset(rng)
+    classifier = CentroidClassifier.fit(vectors, labels)
+    assert classifier.labels == ('FIST', 'OPEN_PALM', 'POINTING_UP')
+
+    test_vectors, test_labels = make_dataset(rng, n=10)
+    for vector, label in zip(test_vectors, test_labels):
+        predicted, score, scores = classifier.predict(vector)
+        assert predicted == label
+        assert 0.5 < score <= 1.0 and abs(scores.sum() - 1.0) < 1e-5
+
+    weird = hand_vector(make_hand(FIST)) + rng.normal(0, 0.5, 63).astype(np.float32)
+    assert classifier.predict(weird)[0] == 'NONE'
+
+
+def test_save_load():
+    """测试分类器保存/加载"""
+    vectors, labels = make_dataset(np.random.default_rng(1), n=5)
+    classifier = CentroidClassifier.fit(vectors, labels)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gestures.npz')
+        classifier.save(path)
+        loaded = CentroidClassifier.load(path)
+
+    assert loaded.labels == classifier.labels
+    assert np.allclose(loaded.centroids, classifier.centroids)
+    assert loaded.predict(vectors[0])[0] == classifier.predict(vectors[0])[0]
+
+
+def record(path, hands):
+    """录制：hands 为 [(world 关键点或 None, 官方类别名, 左右手), ...]"""
+    recorder = SessionRecorder(path)
+    for i, (hand, name, side) in enumerate(hands):
+        if hand is None:
+            result = SimpleNamespace(gestures=[], handedness=[], hand_world_landmarks=[])
+            recorder.record(i * 33, result, [], 320, 240)
+            continue
+        result = SimpleNamespace(
+            gestures=[[SimpleNamespace(category_name=name, score=0.9)]],
+            handedness=[[SimpleNamespace(category_name=side, score=1.0)]],
+            hand_world_landmarks=[hand],
+        )
+        recorder.record(i * 33, result, [hand], 320, 240)
+    recorder.close()
+    return load_recording(path)
+
+
+def test_samples_from_recording():
+    """测试录制取样：整段标注 / 用官方识别结果做标签，左手镜像；未知标签报错"""
+    fist = make_hand(FIST)
+    left_fist = [Landmark(-p.x, p.y, p.z) for p in fist]
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = record(os.path.join(tmp, 's.npz'), [
+            (fist, 'Closed_Fist', 'Right'),
+            (None, None, None),
+            (left_fist, 'Closed_Fist', 'Left'),
+            (make_hand(), 'Open_Palm', 'Right'),
+        ])
+
+    vectors, labels = samples_from_recording(recording, label='CLAP')
+    assert labels.tolist() == ['CLAP'] * 3
+    assert samples_from_recording(recording, label='Victory')[1].tolist() == ['VICTORY'] * 3
+    try:
+        samples_from_recording(recording, label='CUSTOM')     # 不是 GestureType：不能悄悄变成 NONE
+    except ValueError as e:
+        assert 'CUSTOM' in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+    vectors, labels = samples_from_recording(recording)
+    assert labels.tolist() == ['FIST', 'FIST', 'OPEN_PALM']
+    assert np.allclose(vectors[0], vectors[1], atol=1e-5)
+    assert np.allclose(vectors[0], hand_vector(fist), atol=1e-5)
+
+
+def test_train_classifier_command():
+    """测试训练命令：标注的录制 → 分类器文件"""
+    rng = np.random.default_rng(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        fist = record(os.path.join(tmp, 'fist.npz'),
+                      [(make_hand(FIST, rng), 'None', 'Right') for _ in range(20)])
+        palm = record(os.path.join(tmp, 'palm.npz'),
+                      [(make_hand((), rng), 'None', 'Right') for _ in range(20)])
+        assert len(fist) == len(palm) == 20
+
+        output = os.path.join(tmp, 'gestures.npz')
+        assert train_classifier.main([output, os.path.join(tmp, 'fist.npz') + ':FIST',
+                                      os.path.join(tmp, 'palm.npz:OPEN_PALM')]) == 0
+        assert CentroidClassifier.load(output).labels == ('FIST', 'OPEN_PALM')
+
+        assert train_classifier.main([output, os.path.join(tmp, 'fist.npz:WAVE')]) == 1
+
+    assert train_classifier.parse_source('a/b.npz:CLAP') == ('a/b.npz', 'CLAP')
+    assert train_classifier.parse_source('C:\\data\\b.npz') == ('C:\\data\\b.npz', None)
+
+
+def test_landmark_recognizer_contract():
+    """测试引擎返回与 GestureRecognizer 相同的 (GestureType, points)"""
+    vectors, labels = make_dataset(np.random.default_rng(3))
+    recognizer = make_recognizer(CentroidClassifier.fit(vectors, labels), engine=LandmarkRecognizer)
+    assert 'HandLandmarker.create_from_options()' in repr(recognizer.recognizer)
+
+    image_hand = [Landmark(0.5, 0.5, 0.0) for _ in range(21)]
+    result = SimpleNamespace(hand_landmarks=[image_hand], hand_world_landmarks=[make_hand(FIST)],
+                             handedness=[[SimpleNamespace(category_name='Right', score=1.0)]])
+    recognizer.recognizer.detect_for_video.return_value = result
+
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    for i in range(3):
+        gesture, points = recognizer.recognize(frame, 320, 240, timestamp_ms=i * 33)
+    assert gesture == GestureType.FIST
+    assert points['index_x'] == 160
+    assert recognizer.recognizer.detect_for_video.call_count == 3
+
+    empty = SimpleNamespace(hand_landmarks=[], hand_world_landmarks=[], handedness=[])
+    recognizer.recognizer.detect_for_video.return_value = empty
+    assert recognizer.recognize(frame, 320, 240, timestamp_ms=200) == (GestureType.NONE, {})
+
+    assert LandmarkRecognizer.output_names(recognizer.classifier) == (
+        'Closed_Fist', 'Open_Palm', 'Pointing_Up', 'None')
+
+    custom = CentroidClassifier.fit(vectors, np.where(labels == 'FIST', 'CUSTOM', labels))
+    try:
+        make_recognizer(custom, engine=LandmarkRecognizer)   # CUSTOM 识别出来也触发不了动作
+    except ValueError as e:
+        assert 'CUSTOM' in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    print("Running classifier tests...")
+
+    test_hand_vector_invariance()
+    print("✓ test_hand_vector_invariance")
+
+    test_fit_and_predict()
+    print("✓ test_fit_and_predict")
+
+    test_save_load()
+    print("✓ test_save_load")
+
+    test_samples_from_recording()
+    print("✓ test_samples_from_recording")
+
+    test_train_classifier_command()
+    print("✓ test_train_classifier_command")
+
+    test_landmark_recognizer_contract()
+    print("✓ test_landmark_recognizer_contract")
+
+    print("\n所有分类器测试通过！")
@@ -0,0 +1,115 @@
+"""
+测试时钟 - 计时组件在手动 / 帧时钟下的行为
+
+运行方式：
+    python -m pytest tests/test_clock.py -v
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.activation import ActivationManager
+from gesture_control.core.clock import FrameClock, ManualClock, MONOTONIC
+from gesture_control.core.gestures import GestureType
+from gesture_control.main import GestureController, SimpleGesture
+from gesture_control.replay import RecordingDispatcher
+
+
+def test_clocks():
+    """测试三种时钟的基本行为"""
+    t1 = MONOTONIC()
+    assert MONOTONIC() >= t1
+
+    clock = ManualClock(5.0)
+    assert clock() == 5.0
+    assert clock.advance(0.25) == 5.25
+    clock.set(1.0)
+    assert clock() == 1.0
+
+    frames = FrameClock()
+    frames.update(1500)
+    assert frames() == 1.5
+    frames.update(1000)   # 倒退的时间戳被忽略
+    assert frames() == 1.5
+
+
+def test_simple_gesture_hold():
+    """测试保持触发只看时钟，不需要 sleep"""
+    clock = ManualClock()
+    detector = SimpleGesture(clock)
+
+    assert detector.update(GestureType.FIST) is None
+    clock.advance(0.29)
+    assert detector.update(GestureType.FIST) is None
+    clock.advance(0.01)
+    assert detector.update(GestureType.FIST) == 'pause'
+    clock.advance(10)
+    assert detector.update(GestureType.FIST) is None   # 不重复触发
+
+
+def test_scroll_cooldown():
+    """测试滚动冷却跟随时钟"""
+    clock = ManualClock(100.0)
+    events = []
+    controller = GestureController(RecordingDispatcher(events), verbose=False, clock=clock)
+    points = {'pointing_up': True, 'single_finger': True}
+
+    controller.update(GestureType.POINTING_UP, points)
+    controller.update(GestureType.POINTING_UP, points)      # 冷却中
+    clock.advance(controller.SCROLL_COOLDOWN + 0.01)
+    controller.update(GestureType.POINTING_UP, points)
+    assert [e[2] for e in events if e[1] == 'scroll'] == [5, 5]
+
+
+def test_activation_timing():
+    """测试激活 / 自动退出计时"""
+    clock = ManualClock()
+    activation = ActivationManager(clock)
+
+    activation.update(True, GestureType.OPEN_PALM)
+    clock.advance(0.5)
+    assert activation.update(True, GestureType.OPEN_PALM)['activation_progress'] == 0.5
+    clock.advance(0.5)
+    assert activation.update(True, GestureType.OPEN_PALM)['just_activated']
+
+    activation.update(False, GestureType.NONE)
+    clock.advance(activation.DEACTIVATION_TIME - 0.1)
+    assert activation.update(False, GestureType.NONE)['activated']
+    clock.advance(0.1)
+    assert not activation.update(False, GestureType.NONE)['activated']
+
+
+def test_simulation_speed():
+    """测试模拟 10 分钟的握拳/松开循环远快于实时"""
+    clock = ManualClock()
+    detector = SimpleGesture(clock)
+    triggered = 0
+    for frame in range(10 * 60 * 30):
+        gesture = GestureType.FIST if (frame // 30) % 2 == 0 else GestureType.NONE
+        if detector.update(gesture):
+            triggered += 1
+        clock.advance(1 / 30)
+    assert triggered == 300
+
+
+if __name__ == "__main__":
+    print("Running clock tests...")
+
+    test_clocks()
+    print("✓ test_clocks")
+
+    test_simple_gesture_hold()
+    print("✓ test_simple_gesture_hold")
+
+    test_scroll_cooldown()
+    print("✓ test_scroll_cooldown")
+
+    test_activation_timing()
+    print("✓ test_activation_timing")
+
+    test_simulation_speed()
+    print("✓ test_simulation_speed")
+
+    print("\n所有时钟测试通过！")
@@ -0,0 +1,102 @@
+"""
+测试 ActionDispatcher - 后台派发与按键合并
+
+运行方式：
+    python -m pytest tests/test_dispatcher.py -v
+"""
+
+import sys
+import os
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.dispatcher import ActionDispatcher, coalesce, PRESS, SCROLL, CALL
+from gesture_control.core.actions import RepeatKeyAction
+from gesture_control.core.state_machine import GestureStateMachine
+from gesture_control.core.gestures import GestureType
+
+
+def test_coalesce_merges_adjacent_commands():
+    """测试相邻相同按键合并、滚动相加"""
+    commands = [
+        (PRESS, 'right', 4),
+        (PRESS, 'right', 4),
+        (PRESS, 'space', 1),
+        (SCROLL, None, 5),
+        (SCROLL, None, 5),
+        (SCROLL, None, -3),
+        (PRESS, 'right', 1),
+    ]
+    assert coalesce(commands) == [
+        (PRESS, 'right', 8),
+        (PRESS, 'space', 1),
+        (SCROLL, None, 7),
+        (PRESS, 'right', 1),
+    ]
+
+    # 互相抵消的滚动直接丢弃；call 从不合并
+    func = Mock()
+    assert coalesce([(SCROLL, None, 5), (SCROLL, None, -5)]) == []
+    assert coalesce([(CALL, func, 0), (CALL, func, 0)]) == [(CALL, func, 0), (CALL, func, 0)]
+
+
+def test_dispatcher_executes_on_worker():
+    """测试派发器在工作线程执行并用一次调用完成连按"""
+    backend = Mock()
+    dispatcher = ActionDispatcher(backend).start()
+
+    dispatcher.press('right', 4)
+    dispatcher.scroll(-5)
+    dispatcher.flush()
+
+    backend.press.assert_called_once_with('right', presses=4, interval=0)
+    backend.scroll.assert_called_once_with(-5)
+
+    dispatcher.stop()
+
+
+def test_dispatcher_survives_backend_error():
+    """测试单个动作出错不影响后续动作"""
+    backend = Mock()
+    backend.press.side_effect = [RuntimeError('fail-safe'), None]
+    dispatcher = ActionDispatcher(backend).start()
+
+    dispatcher.press('space')
+    dispatcher.flush()
+    dispatcher.press('f')
+    dispatcher.flush()
+
+    assert backend.press.call_count == 2
+    assert dispatcher.executed == 1
+    dispatcher.stop()
+
+
+def test_action_uses_dispatcher():
+    """测试 RepeatKeyAction 设置派发器后只投递一条命令"""
+    dispatcher = Mock()
+    action = RepeatKeyAction(0.5, 'left', 4, 'Rewind 20s', dispatcher=dispatcher)
+
+    sm = GestureStateMachine()
+    sm.update(GestureType.VICTORY)
+    action.execute(0.6, sm, {})
+
+    dispatcher.press.assert_called_once_with('left', 4)
+
+
+if __name__ == "__main__":
+    print("Running dispatcher tests...")
+
+    test_coalesce_merges_adjacent_commands()
+    print("✓ test_coalesce_merges_adjacent_commands")
+
+    test_dispatcher_executes_on_worker()
+    print("✓ test_dispatcher_executes_on_worker")
+
+    test_dispatcher_survives_backend_error()
+    print("✓ test_dispatcher_survives_backend_error")
+
+    test_action_uses_dispatcher()
+    print("✓ test_action_uses_dispatcher")
+
+    print("\n所有派发器测试通过！")
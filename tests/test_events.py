@@ -0,0 +1,312 @@
+"""
+测试手势事件总线 - 丢最老、批量、Unix 套接字、慢订阅者不阻塞、WebSocket 握手和分帧、控制器发布
+
+运行方式：
+    python -m pytest tests/test_events.py -v
+"""
+
+import sys
+import os
+import json
+import socket
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.clock import FrameClock
+from gesture_control.core.events import (
+    WS_CLOSE, WS_PING, WS_PONG, EventBus, UnixEventServer, WebSocketEventServer,
+    read_websocket_frame, websocket_accept, websocket_frame,
+)
+from gesture_control.core.gestures import GestureType
+from gesture_control.main import GestureController
+from gesture_control.replay import RecordingDispatcher
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _read_lines(conn, count: int) -> list:
+    data = b''
+    while data.count(b'\n') < count:
+        chunk = conn.recv(65536)
+        assert chunk, "connection closed"
+        data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def test_subscription_drops_oldest():
+    """测试队列满了丢最老的；一次取走全部积攒的事件；消息是紧凑的 JSON Lines"""
+    bus = EventBus(queue_size=3)
+    bus.publish('gesture', 0, g='FIST')     # 没有订阅者：不编码、不计数
+    assert not bus.active and bus.published == 0
+
+    sub = bus.subscribe()
+    for i in range(5):
+        bus.publish('hold', i, g='FIST', p=i / 4)
+    batch = sub.get_batch(timeout=0)
+    assert [json.loads(m)['ts'] for m in batch] == [2, 3, 4]
+    assert batch[0] == b'{"e":"hold","ts":2,"g":"FIST","p":0.5}\n'
+    assert sub.get_batch(timeout=0) == []
+    assert sub.dropped == bus.dropped == 2 and bus.published == 5
+
+    bus.unsubscribe(sub)
+    assert not bus.active and sub.closed
+    assert bus.dropped == 2     # 断开之后仍然计数
+
+
+def test_unix_socket_server():
+    """测试 Unix 域套接字：连上后收到 JSON Lines；停止后删除套接字文件"""
+    bus = EventBus()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)            # 上次没正常退出留下的套接字（没人监听）
+        stale.close()
+        server = UnixEventServer(bus, path).start()
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(path)
+            _wait(lambda: server.clients == 1)
+            bus.publish('gesture', 100, g='FIST')
+            bus.publish('action', 400, action='pause', src='cam0')
+            client.settimeout(5)
+            assert _read_lines(client, 2) == [
+                {'e': 'gesture', 'ts': 100, 'g': 'FIST'},
+                {'e': 'action', 'ts': 400, 'action': 'pause', 'src': 'cam0'},
+            ]
+        finally:
+            client.close()
+            server.stop()
+        assert not os.path.exists(path)
+        _wait(lambda: not bus.active)
+
+
+def test_unix_socket_in_use():
+    """测试路径上的套接字还有实例在监听时拒绝启动，不抢走它；不是套接字的文件也不删"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.sock')
+        first = UnixEventServer(EventBus(), path).start()
+        try:
+            for target in (path, os.path.join(tmp, 'notes.txt')):
+                if not os.path.exists(target):
+                    open(target, 'w').close()
+                try:
+                    UnixEventServer(EventBus(), target).start()
+                except OSError:
+                    pass
+                else:
+                    raise AssertionError("expected OSError")
+                assert os.path.exists(target)
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(path)    # 第一个实例还在
+            _wait(lambda: first.clients == 1)
+            client.close()
+        finally:
+            first.stop()
+
+
+def test_slow_subscriber_does_not_block():
+    """测试不读数据的订阅者：发布照常很快，它的队列丢最老的"""
+    bus = EventBus(queue_size=16)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.sock')
+        server = UnixEventServer(bus, path).start()
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        try:
+            client.connect(path)
+            _wait(lambda: server.clients == 1)
+            pts = [0.5] * 42
+            t = time.perf_counter()
+            for i in range(5000):
+                bus.publish('landmarks', i, hand='Right', pts=pts)
+            elapsed = time.perf_counter() - t
+            assert elapsed < 2.0, elapsed
+            assert bus.published == 5000
+            assert bus.dropped > 0
+        finally:
+            client.close()
+            server.stop()
+
+
+def _ws_connect(port, first_frames=b''):
+    """first_frames: 和握手请求一起（一次 sendall）发出去的帧"""
+    client = socket.create_connection(('127.0.0.1', port), timeout=5)
+    client.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+                   b'Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n'
+                   b'Sec-WebSocket-Version: 13\r\n\r\n' + first_frames)
+    response = b''
+    while b'\r\n\r\n' not in response:
+        response += client.recv(1)    # 逐字节读：握手之后的帧留在套接字里
+    assert response.startswith(b'HTTP/1.1 101')
+    return client
+
+
+def _client_frame(payload: bytes, opcode: int) -> bytes:
+    """客户端 → 服务端的帧（必须带掩码）"""
+    mask = b'\x01\x02\x03\x04'
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return bytes((0x80 | opcode, 0x80 | len(payload))) + mask + masked
+
+
+def test_websocket_ping_and_close():
+    """测试 ping 回 pong（同样的内容），close 回同一个状态码并断开、退订"""
+    bus = EventBus()
+    server = WebSocketEventServer(bus, 0).start()
+    try:
+        client = _ws_connect(server.port)
+        _wait(lambda: server.clients == 1)
+        client.sendall(_client_frame(b'keepalive', WS_PING))
+        assert read_websocket_frame(client) == (WS_PONG, b'keepalive')
+
+        client.sendall(_client_frame((1000).to_bytes(2, 'big') + b'bye', WS_CLOSE))
+        assert read_websocket_frame(client) == (WS_CLOSE, (1000).to_bytes(2, 'big'))
+        assert client.recv(1024) == b''       # 服务端关闭了连接
+        _wait(lambda: server.clients == 0 and not bus.active)
+        client.close()
+    finally:
+        server.stop()
+
+
+def test_websocket_handshake_edges():
+    """测试紧跟握手发来的帧不丢；握手超时断开；stop() 也断开还在握手的连接"""
+    bus = EventBus()
+    server = WebSocketEventServer(bus, 0)
+    server.HANDSHAKE_TIMEOUT = 0.2
+    server.start()
+    try:
+        client = _ws_connect(server.port, _client_frame(b'early', WS_PING))
+        assert read_websocket_frame(client) == (WS_PONG, b'early')
+        client.close()
+
+        silent = socket.create_connection(('127.0.0.1', server.port), timeout=5)
+        silent.sendall(b'GET / HTTP/1.1\r\n')          # 请求没发完
+        assert silent.recv(1024) == b''                # 超时后服务端关掉
+        silent.close()
+
+        server.HANDSHAKE_TIMEOUT = 30
+        stuck = socket.create_connection(('127.0.0.1', server.port), timeout=5)
+        stuck.sendall(b'GET / HTTP/1.1\r\n')
+        _wait(lambda: len(server._conns) == 1)
+    finally:
+        server.stop()
+    assert stuck.recv(1024) == b''                     # 不用等 30 秒
+    stuck.close()
+
+
+def test_websocket_server():
+    """测试 WebSocket：RFC 6455 的握手样例；每个文本帧是一批 JSON Lines；没有 key 回 400"""
+    assert websocket_accept('dGhlIHNhbXBsZSBub25jZQ==') == 's3pPLMBiTxaQ9kYGzzhZRbK+xOo='
+    assert websocket_frame(b'x' * 200)[:4] == bytes((0x81, 126, 0, 200))
+
+    bus = EventBus()
+    server = WebSocketEventServer(bus, 0).start()
+    assert server.port > 0
+    try:
+        client = socket.create_connection(('127.0.0.1', server.port), timeout=5)
+        client.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+                       b'Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n'
+                       b'Sec-WebSocket-Version: 13\r\n\r\n')
+        response = b''
+        while b'\r\n\r\n' not in response:
+            response += client.recv(1024)
+        head, _, rest = response.partition(b'\r\n\r\n')
+        assert head.startswith(b'HTTP/1.1 101')
+        assert b'Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=' in head
+        _wait(lambda: server.clients == 1)
+
+        bus.publish('gesture', 100, g='VICTORY')
+        data = rest
+        while len(data) < 2 or len(data) < 2 + data[1]:
+            data += client.recv(1024)
+        assert data[0] == 0x81
+        payload = data[2:2 + data[1]]
+        assert [json.loads(line) for line in payload.splitlines()] == [
+            {'e': 'gesture', 'ts': 100, 'g': 'VICTORY'}]
+        client.close()
+
+        bad = socket.create_connection(('127.0.0.1', server.port), timeout=5)
+        bad.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        assert bad.recv(1024).startswith(b'HTTP/1.1 400')
+        bad.close()
+    finally:
+        server.stop()
+
+
+def test_controller_publishes_events():
+    """测试控制器发布手势变化、保持进度、动作和关键点；没有订阅者时什么也不发"""
+    bus = EventBus()
+    clock = FrameClock()
+    controller = GestureController(RecordingDispatcher([]), verbose=False, clock=clock,
+                                   tag='cam0', trigger=None, events=bus)
+    hand = {'features': SimpleNamespace(points=np.full((21, 3), 0.12345))}
+    points = {'pointing_up': False, 'single_finger': False, 'hands': {'Right': hand}}
+
+    clock.update(0)
+    controller.update(GestureType.FIST, points)
+    assert bus.published == 0
+
+    sub = bus.subscribe()
+    for frame in range(1, 15):
+        clock.update(frame * 33)
+        controller.update(GestureType.FIST, points)
+    events = [json.loads(m) for m in sub.get_batch(timeout=0)]
+    assert all(e['src'] == 'cam0' for e in events)
+    kinds = [e['e'] for e in events]
+    assert kinds[0] == 'gesture' and events[0]['g'] == 'FIST'
+    assert kinds.count('gesture') == 1 and kinds.count('action') == 1
+    actions = [e for e in events if e['e'] == 'action']
+    assert actions[0]['action'] == 'pause'
+
+    holds = [e for e in events if e['e'] == 'hold']
+    progress = [e['p'] for e in holds]
+    assert progress == sorted(progress) and 0 < progress[0] < 1
+    assert all(e['ts'] < actions[0]['ts'] for e in holds)   # 触发之后不再发保持进度
+
+    landmarks = [e for e in events if e['e'] == 'landmarks']
+    assert len(landmarks) == 14 and landmarks[0]['hand'] == 'Right'
+    assert landmarks[0]['pts'] == [0.123] * 42
+
+    clock.update(15 * 33)
+    controller.update(GestureType.NONE, {})
+    events = [json.loads(m) for m in sub.get_batch(timeout=0)]
+    assert events == [{'e': 'gesture', 'ts': 495, 'g': 'NONE', 'src': 'cam0'}]
+
+
+if __name__ == "__main__":
+    print("Running event bus tests...")
+
+    test_subscription_drops_oldest()
+    print("✓ test_subscription_drops_oldest")
+
+    test_unix_socket_server()
+    print("✓ test_unix_socket_server")
+
+    test_unix_socket_in_use()
+    print("✓ test_unix_socket_in_use")
+
+    test_slow_subscriber_does_not_block()
+    print("✓ test_slow_subscriber_does_not_block")
+
+    test_websocket_server()
+    print("✓ test_websocket_server")
+
+    test_websocket_ping_and_close()
+    print("✓ test_websocket_ping_and_close")
+
+    test_websocket_handshake_edges()
+    print("✓ test_websocket_handshake_edges")
+
+    test_controller_publishes_events()
+    print("✓ test_controller_publishes_events")
+
+    print("\n所有事件总线测试通过！")
@@ -0,0 +1,144 @@
+"""
+测试关键点特征 - 向量化特征与逐点计算结果一致
+
+运行方式：
+    python -m pytest tests/test_features.py -v
+"""
+
+import sys
+import os
+import math
+import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.features import (
+    INDEX, MIDDLE, TIP, MCP, extract_features, landmarks_to_array,
+)
+from gesture_control.core.roi import Landmark
+
+
+def make_hand(folded=(), spread=0.04):
+    """
+    手掌朝向摄像头、手指竖直向上的手（图像坐标，y 向下）
+
+    Args:
+        folded: 收起的手指编号（0-4），收起的手指从 PIP 开始折回手掌
+    """
+    points = [Landmark(0.5, 0.8, 0.0)]
+    for finger in range(5):
+        x = 0.42 + finger * spread
+        base_y = 0.65
+        for joint in range(4):
+            if finger in folded and joint >= 2:
+                # PIP 之后折回：DIP 和指尖往下、往摄像头方向
+                y = base_y - 0.05 + (joint - 1) * 0.03
+                z = -0.03 * (joint - 1)
+            else:
+                y = base_y - joint * 0.05
+                z = 0.0
+            points.append(Landmark(x, y, z))
+    return points
+
+
+def legacy_points(landmarks):
+    """原 GestureRecognizer 里逐点计算的 pointing_up / single_finger"""
+    def distance(p1, p2):
+        return ((p1.x - p2.x)**2 + (p1.y - p2.y)**2) ** 0.5
+
+    index_tip, index_base, wrist = landmarks[8], landmarks[5], landmarks[0]
+    pointing_up = index_tip.y < index_base.y
+    index_extended = distance(index_tip, wrist) > distance(index_base, wrist) * 1.1
+    middle_folded = distance(landmarks[12], wrist) < distance(landmarks[9], wrist) * 1.5
+    return pointing_up, index_extended and middle_folded
+
+
+def test_landmarks_to_array():
+    """测试关键点转数组，可复用缓冲区"""
+    hand = make_hand()
+    array = landmarks_to_array(hand)
+    assert array.shape == (21, 3)
+    assert array[8, 1] == hand[8].y
+
+    out = np.zeros((21, 3))
+    assert landmarks_to_array(hand, out) is out
+    assert np.array_equal(out, array)
+
+
+def test_open_hand():
+    """测试张开的手：全部伸出、不弯曲、朝上"""
+    features = extract_features(make_hand())
+
+    assert features.extended_fingers().all()
+    assert np.allclose(features.curl, 0.0, atol=1e-6)
+    assert abs(features.orientation - math.pi / 2) < 0.1
+    assert abs(abs(features.palm_normal[2]) - 1.0) < 1e-6   # 手掌平面是 x-y 平面
+    assert features.pointing_up
+
+
+def test_folded_fingers():
+    """测试收起的手指：弯曲度高、伸展度低"""
+    features = extract_features(make_hand(folded=(2, 3, 4)))
+
+    assert features.curl[MIDDLE] > 0.3
+    assert features.curl[INDEX] < 0.01
+    assert features.extension[MIDDLE] < features.extension[INDEX]
+    assert features.single_finger
+
+
+def test_world_landmarks_used_for_curl():
+    """测试有世界坐标时弯曲度用世界坐标计算"""
+    image = make_hand()
+    world = make_hand(folded=(1,))
+    features = extract_features(image, world)
+
+    assert features.world is not None
+    assert features.curl[INDEX] > 0.3
+    assert features.extension[INDEX] > 1.1   # 距离仍然按图像坐标
+
+
+def test_matches_legacy_heuristics():
+    """测试随机关键点下 pointing_up / single_finger 与原逐点算法一致"""
+    rng = random.Random(0)
+    for _ in range(500):
+        hand = [Landmark(rng.random(), rng.random(), rng.uniform(-0.1, 0.1)) for _ in range(21)]
+        features = extract_features(hand)
+        assert (features.pointing_up, features.single_finger) == legacy_points(hand)
+
+
+def test_pinch():
+    """测试捏合距离按手掌大小归一化"""
+    hand = make_hand()
+    hand[TIP[0]] = Landmark(hand[TIP[1]].x, hand[TIP[1]].y, 0.0)
+    assert extract_features(hand).pinch < 1e-9
+
+    features = extract_features(make_hand())
+    palm = abs(make_hand()[MCP[MIDDLE]].y - 0.8)
+    assert abs(features.palm_size - math.hypot(0.0, palm)) < 1e-9
+    assert features.pinch > 0.2
+
+
+if __name__ == "__main__":
+    print("Running feature tests...")
+
+    test_landmarks_to_array()
+    print("✓ test_landmarks_to_array")
+
+    test_open_hand()
+    print("✓ test_open_hand")
+
+    test_folded_fingers()
+    print("✓ test_folded_fingers")
+
+    test_world_landmarks_used_for_curl()
+    print("✓ test_world_landmarks_used_for_curl")
+
+    test_matches_legacy_heuristics()
+    print("✓ test_matches_legacy_heuristics")
+
+    test_pinch()
+    print("✓ test_pinch")
+
+    print("\n所有特征测试通过！")
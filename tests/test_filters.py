@@ -0,0 +1,146 @@
+"""
+测试关键点滤波 - One Euro / 卡尔曼的降噪与滞后、时间戳、按手重置、与识别器的集成
+
+运行方式：
+    python -m pytest tests/test_filters.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.filters import (
+    KalmanFilter, LandmarkFilter, OneEuroFilter, create_filter,
+)
+from tests.helpers import make_recognizer, make_result
+
+FPS = 30.0
+NOISE = 0.003   # 关键点抖动（归一化坐标，约 1 像素）
+
+
+def run(filter_, speed=0.0, frames=300, seed=0):
+    """21 个点以 speed（单位/秒）匀速移动并加噪声，返回稳定后的 (抖动, 平均滞后)"""
+    rng = np.random.default_rng(seed)
+    errors = []
+    for i in range(frames):
+        t = i / FPS
+        true = np.full((21, 3), 0.2 + speed * t)
+        out = filter_.filter(true + rng.normal(0, NOISE, true.shape), t)
+        assert out.shape == (21, 3)
+        if i >= 60:
+            errors.append(out - true)
+    errors = np.array(errors)
+    return errors.std(), -errors.mean()
+
+
+def test_reduces_jitter_at_rest():
+    """测试静止的手：One Euro 把抖动压到一半以下，卡尔曼（更偏向跟手）压掉四分之一，都没有偏移"""
+    for filter_, limit in ((OneEuroFilter(), 0.5), (KalmanFilter(), 0.75)):
+        jitter, bias = run(filter_)
+        assert jitter < NOISE * limit, (type(filter_).__name__, jitter)
+        assert abs(bias) < NOISE / 10
+
+
+def test_small_lag_when_moving():
+    """测试匀速移动时滞后很小（One Euro 的截止频率随速度升高，卡尔曼有速度项）"""
+    speed = 0.5   # 半个画面宽 / 秒
+    slow_lag = run(OneEuroFilter(beta=0.0), speed)[1]
+    euro_lag = run(OneEuroFilter(), speed)[1]
+    kalman_lag = run(KalmanFilter(), speed)[1]
+    assert euro_lag < speed * 0.02          # < 20ms
+    assert euro_lag < slow_lag / 5           # 比固定截止频率的低通跟手得多
+    assert abs(kalman_lag) < speed * 0.005
+
+
+def test_uses_real_timestamps():
+    """测试按时间戳而不是帧数滤波：同样的输入，帧间隔越长跟得越多；重复时间戳不更新"""
+    def after_step(dt):
+        filter_ = OneEuroFilter(beta=0.0)
+        filter_.filter(np.zeros(3), 0.0)
+        return filter_.filter(np.ones(3), dt)[0]
+
+    assert 0 < after_step(1 / 60) < after_step(1 / 15) < 1
+
+    filter_ = KalmanFilter()
+    first = filter_.filter(np.zeros(3), 1.0)
+    assert np.array_equal(filter_.filter(np.ones(3), 1.0), first)
+
+
+def test_elementwise():
+    """测试逐元素独立：一个点的移动不影响其他点，结果与单独滤波一致"""
+    batch = OneEuroFilter()
+    single = OneEuroFilter()
+    rng = np.random.default_rng(1)
+    for i in range(30):
+        points = rng.random((21, 3))
+        out = batch.filter(points, i / FPS)
+        assert np.allclose(out[8], single.filter(points[8], i / FPS))
+
+
+def test_landmark_filter_per_hand():
+    """测试每只手各自的滤波状态，重置一只手不影响另一只"""
+    landmark_filter = LandmarkFilter('kalman')
+    left, right = np.zeros((21, 3)), np.ones((21, 3))
+    for i in range(5):
+        assert np.allclose(landmark_filter.filter('Left', left, i / FPS), 0)
+        assert np.allclose(landmark_filter.filter('Right', right, i / FPS), 1)
+    landmark_filter.reset('Left')
+    assert np.allclose(landmark_filter.filter('Left', right, 1.0), 1)   # 重新开始，不拖尾
+    assert landmark_filter.filter('Right', right + 1, 1.0)[0, 0] < 2
+
+    assert isinstance(create_filter('one_euro'), OneEuroFilter)
+    try:
+        LandmarkFilter('median')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_recognizer_filters_points():
+    """测试识别器输出的指尖坐标经过滤波，手离开后重新开始"""
+    recognizer = make_recognizer(landmark_filter='one_euro')
+    raw = make_recognizer()
+
+    rng = np.random.default_rng(2)
+    filtered_y, raw_y = [], []
+    for i in range(60):
+        y = 0.3 + rng.normal(0, NOISE)
+        result = make_result('Pointing_Up', tip=(0.5, y))
+        _, points = recognizer.process_result(result, 320, 240, timestamp_ms=int(i * 1000 / FPS))
+        filtered_y.append(points['features'].points[8, 1])
+        raw_y.append(raw.process_result(result, 320, 240)[1]['features'].points[8, 1])
+        assert points['hands']['Right']['features'] is points['features']
+    assert np.std(filtered_y[10:]) < np.std(raw_y[10:]) / 2
+
+    recognizer.process_result(make_result(), 320, 240, timestamp_ms=3000)
+    result = make_result('Pointing_Up', tip=(0.5, 0.9))
+    _, points = recognizer.process_result(result, 320, 240, timestamp_ms=3033)
+    assert points['index_y'] == int(0.9 * 240)   # 重新出现的手不从旧位置滑过来
+
+
+if __name__ == "__main__":
+    print("Running landmark filter tests...")
+
+    test_reduces_jitter_at_rest()
+    print("✓ test_reduces_jitter_at_rest")
+
+    test_small_lag_when_moving()
+    print("✓ test_small_lag_when_moving")
+
+    test_uses_real_timestamps()
+    print("✓ test_uses_real_timestamps")
+
+    test_elementwise()
+    print("✓ test_elementwise")
+
+    test_landmark_filter_per_hand()
+    print("✓ test_landmark_filter_per_hand")
+
+    test_recognizer_filters_points()
+    print("✓ test_recognizer_filters_points")
+
+    print("\n所有关键点滤波测试通过！")
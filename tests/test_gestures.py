@@ -0,0 +1,130 @@
+"""
+测试 GestureRecognizer - 结果解析、平滑与时间戳（不加载模型）
+
+运行方式：
+    python -m pytest tests/test_gestures.py -v
+"""
+
+import sys
+import os
+from unittest.mock import Mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.gestures import GestureType
+from tests.helpers import make_recognizer, make_result
+
+
+def test_smoothing_majority_vote():
+    """测试多帧平滑：3 帧中 2 帧相同才确认，手离开立即重置"""
+    recognizer = make_recognizer()
+
+    gesture, _ = recognizer.process_result(make_result('Closed_Fist'), 320, 240)
+    assert gesture == GestureType.NONE
+
+    recognizer.process_result(make_result('Closed_Fist'), 320, 240)
+    gesture, points = recognizer.process_result(make_result('Victory'), 320, 240)
+    assert gesture == GestureType.FIST
+    assert points['index_y'] == 48
+    assert points['pointing_up'] is True
+
+    gesture, points = recognizer.process_result(make_result(), 320, 240)
+    assert gesture == GestureType.NONE
+    assert points == {}
+
+
+def test_timestamps_follow_capture_and_stay_monotonic():
+    """测试使用采集时间戳，且重复/倒退的时间戳会被顺延"""
+    recognizer = make_recognizer()
+    recognizer.recognizer.recognize_for_video.return_value = make_result()
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    recognizer.recognize(frame, 320, 240, timestamp_ms=1000)
+    recognizer.recognize(frame, 320, 240, timestamp_ms=1000)
+    recognizer.recognize(frame, 320, 240, timestamp_ms=1067)
+
+    stamps = [c.args[1] for c in recognizer.recognizer.recognize_for_video.call_args_list]
+    assert stamps == [1000, 1001, 1067]
+
+
+def test_live_stream_delivers_results_to_callback():
+    """测试异步模式：结果通过回调送达，在途时跳过新帧"""
+    on_result = Mock()
+    recognizer = make_recognizer(live_stream=True, on_result=on_result)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    assert recognizer.recognize_async(frame, 320, 240, timestamp_ms=1000) is True
+    assert recognizer.recognize_async(frame, 320, 240, timestamp_ms=1033) is False
+    assert recognizer.skipped_frames == 1
+
+    recognizer._on_live_result(make_result('Open_Palm'), None, 1000)
+    on_result.assert_called_once()
+    gesture, points, timestamp_ms = recognizer.latest
+    assert timestamp_ms == 1000
+    assert points['index_x'] == 160
+
+    # 结果到达后可以提交下一帧
+    assert recognizer.recognize_async(frame, 320, 240, timestamp_ms=1066) is True
+
+
+def test_live_stream_late_result_after_timeout():
+    """测试在途帧超时后提交新帧：旧帧迟到的结果直接丢掉，不清掉新帧的尺寸"""
+    on_result = Mock()
+    recognizer = make_recognizer(live_stream=True, on_result=on_result)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    assert recognizer.recognize_async(frame, 320, 240, timestamp_ms=1000)
+    recognizer._submitted_at -= recognizer.PENDING_TIMEOUT     # 结果迟迟不来
+    assert recognizer.recognize_async(frame, 320, 240, timestamp_ms=2000)
+
+    recognizer._on_live_result(make_result('Open_Palm'), None, 1000)
+    on_result.assert_not_called()
+    recognizer._on_live_result(make_result('Open_Palm'), None, 2000)
+    gesture, points, timestamp_ms = on_result.call_args.args
+    assert timestamp_ms == 2000 and points['index_x'] == 160
+    assert recognizer._pending == {}
+
+def test_roi_tracking_crops_and_maps_back():
+    """测试 ROI：找到手后只识别裁剪区域，关键点映射回整帧"""
+    recognizer = make_recognizer(roi_tracking=True)
+    recognizer.recognizer.recognize_for_video.return_value = make_result('Closed_Fist')
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    recognizer.recognize(frame, 640, 480, timestamp_ms=0)
+    full_image = recognizer.recognizer.recognize_for_video.call_args.args[0]
+    assert (full_image.width, full_image.height) == (640, 480)
+
+    # 第二帧：假结果的关键点全在 (0.5, 0.5)，只有食指尖在 (0.5, 0.2)
+    _, points = recognizer.recognize(frame, 640, 480, timestamp_ms=33)
+    x0, y0, x1, y1 = recognizer.roi.region
+    crop_image = recognizer.recognizer.recognize_for_video.call_args.args[0]
+    assert (crop_image.width, crop_image.height) == (x1 - x0, y1 - y0)
+    assert points['index_x'] == int((x0 + 0.5 * (x1 - x0)) / 640 * 640)
+
+    # 跟丢：回退到整帧
+    recognizer.recognizer.recognize_for_video.return_value = make_result()
+    recognizer.recognize(frame, 640, 480, timestamp_ms=66)
+    assert recognizer.roi.region is None
+
+
+if __name__ == "__main__":
+    print("Running gesture recognizer tests...")
+
+    test_smoothing_majority_vote()
+    print("✓ test_smoothing_majority_vote")
+
+    test_timestamps_follow_capture_and_stay_monotonic()
+    print("✓ test_timestamps_follow_capture_and_stay_monotonic")
+
+    test_live_stream_delivers_results_to_callback()
+    print("✓ test_live_stream_delivers_results_to_callback")
+
+    test_live_stream_late_result_after_timeout()
+    print("✓ test_live_stream_late_result_after_timeout")
+
+    test_roi_tracking_crops_and_maps_back()
+    print("✓ test_roi_tracking_crops_and_maps_back")
+
+    print("\n所有识别器测试通过！")
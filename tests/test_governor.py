@@ -0,0 +1,152 @@
+"""
+测试 InferenceGovernor - 待机低频 / 激活全速
+
+运行方式：
+    python -m pytest tests/test_governor.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.clock import FrameClock, ManualClock
+from gesture_control.core.governor import InferenceGovernor
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.motion import MotionDetector
+from gesture_control.main import record_recognition, should_recognize
+
+
+def run_frames(governor, clock, count, fps=30):
+    """按 fps 推进 count 帧，返回实际识别的帧数"""
+    ran = 0
+    for _ in range(count):
+        clock.advance(1.0 / fps)
+        ran += governor.should_run()
+    return ran
+
+
+def test_idle_runs_at_low_rate():
+    """测试待机无手时只按 idle_hz 识别"""
+    clock = ManualClock()
+    governor = InferenceGovernor(idle_hz=4, clock=clock)
+
+    ran = run_frames(governor, clock, 30)
+    assert 3 <= ran <= 5
+    assert governor.get_stats()['skipped'] == 30 - ran
+
+
+def test_palm_switches_to_full_rate():
+    """测试看到张开手掌立即全速，手离开后回到低频"""
+    clock = ManualClock()
+    governor = InferenceGovernor(idle_hz=4, clock=clock)
+
+    # 有手但不是手掌：仍是低频
+    governor.update(True, GestureType.FIST)
+    assert not governor.full_rate
+
+    # 单帧原始结果是手掌就切全速
+    governor.update(True, GestureType.NONE, GestureType.OPEN_PALM)
+    assert governor.full_rate
+    assert run_frames(governor, clock, 30) == 30
+
+    # 手离开：回到低频
+    governor.update(False, GestureType.NONE)
+    assert not governor.full_rate
+    assert run_frames(governor, clock, 30) <= 5
+
+
+def test_activated_hand_keeps_full_rate():
+    """测试已激活状态下有手就保持全速"""
+    governor = InferenceGovernor(idle_hz=4, clock=ManualClock())
+    governor.activation.is_activated = True
+
+    governor.update(True, GestureType.FIST)
+    assert governor.full_rate
+
+
+def test_motion_gate_does_not_use_idle_budget():
+    """测试调节器放行、运动门控挡下的帧不算识别：下一帧还能识别，计数和实际识别一致"""
+    clock = ManualClock()
+    governor = InferenceGovernor(idle_hz=4, clock=clock)
+    motion = MotionDetector(max_skip_frames=15)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    ran = 0
+    for _ in range(60):
+        clock.advance(1.0 / 30)
+        if should_recognize(governor, motion, frame):
+            record_recognition(governor, motion, True)
+            ran += 1
+    stats = governor.get_stats()
+    assert stats['processed'] == motion.get_stats()['processed'] == ran
+    assert stats['skipped'] + motion.get_stats()['skipped'] == 60 - ran
+
+    # 画面一动：调节器的名额还在，这一帧马上识别
+    frame[:] = 255
+    clock.advance(1.0 / 30)
+    assert should_recognize(governor, motion, frame)
+
+
+def test_dropped_submit_is_not_counted():
+    """测试放行后识别器忙、没送出去的帧：不占调节器名额，运动门控的参考帧换回上一次识别的画面"""
+    clock = ManualClock()
+    governor = InferenceGovernor(idle_hz=4, clock=clock)
+    motion = MotionDetector()
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    assert should_recognize(governor, motion, frame)
+    record_recognition(governor, motion, True)
+
+    frame[:] = 255
+    clock.advance(0.3)
+    assert should_recognize(governor, motion, frame)
+    record_recognition(governor, motion, False)       # 上一帧还在推理
+    assert governor.get_stats()['processed'] == motion.get_stats()['processed'] == 1
+    assert motion.get_stats()['skipped'] == 1
+
+    # 同样的画面：仍和上一次真正识别的画面比较，所以还是放行
+    assert should_recognize(governor, motion, frame)
+    record_recognition(governor, motion, True)
+    assert governor.get_stats()['processed'] == motion.get_stats()['processed'] == 2
+    clock.advance(0.3)
+    assert not should_recognize(governor, motion, frame)
+
+
+def test_governor_follows_injected_clock():
+    """测试调节器和它的激活状态都按传入的帧时钟计时（回放录像时不受墙上时间影响）"""
+    clock = FrameClock()
+    governor = InferenceGovernor(idle_hz=4, clock=clock)
+    assert governor.activation.clock is clock
+
+    ran = 0
+    for i in range(60):       # 2 秒的素材，跑得再快也只识别 2 秒 × 4 次
+        clock.update(i * 33)
+        if governor.should_run():
+            ran += 1
+    assert 7 <= ran <= 9
+
+
+if __name__ == "__main__":
+    print("Running governor tests...")
+
+    test_idle_runs_at_low_rate()
+    print("✓ test_idle_runs_at_low_rate")
+
+    test_palm_switches_to_full_rate()
+    print("✓ test_palm_switches_to_full_rate")
+
+    test_activated_hand_keeps_full_rate()
+    print("✓ test_activated_hand_keeps_full_rate")
+
+    test_motion_gate_does_not_use_idle_budget()
+    print("✓ test_motion_gate_does_not_use_idle_budget")
+
+    test_dropped_submit_is_not_counted()
+    print("✓ test_dropped_submit_is_not_counted")
+
+    test_governor_follows_injected_clock()
+    print("✓ test_governor_follows_injected_clock")
+
+    print("\n所有调节器测试通过！")
@@ -0,0 +1,149 @@
+"""
+测试多手跟踪 - 每只手独立平滑/计时、左右手 ID 分配、拍手识别
+
+运行方式：
+    python -m pytest tests/test_hands.py -v
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.features import extract_features
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.hands import HandTracker
+from gesture_control.core.roi import Landmark
+from gesture_control.core.smoothing import GestureSmoother
+from tests.helpers import make_hands, make_recognizer
+
+
+def make_landmarks(center_x, center_y=0.5):
+    """以 (center_x, center_y) 为手掌中心的一只手（手指朝上）"""
+    points = [Landmark(center_x, center_y + 0.1, 0.0)]
+    for finger in range(5):
+        x = center_x - 0.04 + finger * 0.02
+        for joint in range(4):
+            points.append(Landmark(x, center_y - joint * 0.04, 0.0))
+    return points
+
+
+def hand(side, gesture, center_x, confidence=0.9):
+    return (side, gesture, confidence, extract_features(make_landmarks(center_x)))
+
+
+def make_result(*hands):
+    """hands: [(handedness, 类别名, 手掌中心 x), ...]"""
+    return make_hands(*[(side, [(name, 0.9)], make_landmarks(x)) for side, name, x in hands])
+
+
+def test_smoother():
+    """测试多数投票：3 帧中 2 帧相同才确认，手离开立即重置"""
+    smoother = GestureSmoother(3)
+    assert smoother.update(GestureType.FIST) == GestureType.NONE
+    assert smoother.update(GestureType.FIST) == GestureType.NONE
+    assert smoother.update(GestureType.VICTORY) == GestureType.FIST
+    assert smoother.update(GestureType.NONE) == GestureType.NONE
+
+
+def test_per_hand_state():
+    """测试两只手各自平滑、各自计时"""
+    tracker = HandTracker(smoothing_frames=3)
+    for i in range(4):
+        tracks = tracker.update([hand('Left', GestureType.FIST, 0.3),
+                                 hand('Right', GestureType.OPEN_PALM, 0.7)], i * 100)
+    assert [t.hand_id for t in tracks] == ['Left', 'Right']
+
+    left, right = tracker.tracks['Left'], tracker.tracks['Right']
+    assert left.gesture == GestureType.FIST and right.gesture == GestureType.OPEN_PALM
+    assert abs(left.hold_time - 0.1) < 1e-9
+
+    # 右手离开：右手重置，左手继续计时
+    tracker.update([hand('Left', GestureType.FIST, 0.3)], 400)
+    assert not right.present and right.gesture == GestureType.NONE
+    assert left.present and abs(left.hold_time - 0.2) < 1e-9
+
+
+def test_duplicate_handedness_uses_position():
+    """测试两只手被标成同一边时按上一帧位置分配 ID"""
+    tracker = HandTracker()
+    tracker.update([hand('Left', GestureType.FIST, 0.3), hand('Right', GestureType.NONE, 0.7)])
+
+    # 检测顺序颠倒，且都标成 Right：仍然按位置对上
+    tracks = tracker.update([hand('Right', GestureType.NONE, 0.68),
+                             hand('Right', GestureType.FIST, 0.32)])
+    assert [t.hand_id for t in tracks] == ['Right', 'Left']
+
+    # 没有历史位置：画面左边的是左手
+    tracks = HandTracker().update([hand(None, GestureType.NONE, 0.8),
+                                   hand(None, GestureType.NONE, 0.2)])
+    assert [t.hand_id for t in tracks] == ['Right', 'Left']
+
+
+def test_recognizer_multi_hand_points():
+    """测试识别器：主手势来自右手（primary_hand），points['hands'] 按左右手给出每只手的状态"""
+    recognizer = make_recognizer(num_hands=2)
+    result = make_result(('Right', 'Closed_Fist', 0.75), ('Left', 'Victory', 0.25))
+    for i in range(4):
+        gesture, points = recognizer.process_result(result, 320, 240, timestamp_ms=i * 50)
+
+    assert gesture == GestureType.FIST
+    assert set(points['hands']) == {'Left', 'Right'}
+    assert points['hands']['Left']['gesture'] == GestureType.VICTORY
+    assert points['hands']['Right']['index_x'] == points['index_x']
+    # 第 3 帧确认握拳，第 4 帧已保持 50ms
+    assert abs(points['hands']['Right']['hold_time'] - 0.05) < 1e-9
+
+
+def test_primary_hand_ignores_detection_order():
+    """测试两只手的检测顺序每帧互换：主手势始终来自 primary_hand，保持时间不被重置"""
+    for primary, expected in (('Right', GestureType.OPEN_PALM), ('Left', GestureType.FIST)):
+        recognizer = make_recognizer(num_hands=2, primary_hand=primary)
+        left, right = ('Left', 'Closed_Fist', 0.25), ('Right', 'Open_Palm', 0.75)
+        gestures, raw = [], []
+        for i in range(8):
+            result = make_result(left, right) if i % 2 else make_result(right, left)
+            gesture, points = recognizer.process_result(result, 320, 240, timestamp_ms=i * 50)
+            gestures.append(gesture)
+            raw.append(recognizer.raw_gesture)
+            assert points['scores'][expected] == 0.9
+        assert raw == [expected] * 8
+        assert gestures[2:] == [expected] * 6
+
+
+def test_clap():
+    """测试双手掌心靠拢时识别为拍手，分开后恢复"""
+    recognizer = make_recognizer(num_hands=2, clap_distance=0.2)
+    close = make_result(('Right', 'Open_Palm', 0.55), ('Left', 'Open_Palm', 0.45))
+    for _ in range(3):
+        gesture, _ = recognizer.process_result(close, 320, 240)
+    assert gesture == GestureType.CLAP
+
+    apart = make_result(('Right', 'Open_Palm', 0.8), ('Left', 'Open_Palm', 0.2))
+    for _ in range(3):
+        gesture, _ = recognizer.process_result(apart, 320, 240)
+    assert gesture == GestureType.OPEN_PALM
+
+
+if __name__ == "__main__":
+    print("Running multi-hand tests...")
+
+    test_smoother()
+    print("✓ test_smoother")
+
+    test_per_hand_state()
+    print("✓ test_per_hand_state")
+
+    test_duplicate_handedness_uses_position()
+    print("✓ test_duplicate_handedness_uses_position")
+
+    test_recognizer_multi_hand_points()
+    print("✓ test_recognizer_multi_hand_points")
+
+    test_primary_hand_ignores_detection_order()
+    print("✓ test_primary_hand_ignores_detection_order")
+
+    test_clap()
+    print("✓ test_clap")
+
+    print("\n所有多手测试通过！")
@@ -0,0 +1,107 @@
+"""
+测试 Metrics - 延迟直方图、开关与导出
+
+运行方式：
+    python -m pytest tests/test_metrics.py -v
+"""
+
+import json
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.metrics import (
+    LatencyHistogram, Metrics, MetricsExporter, format_prometheus,
+)
+
+
+def test_histogram_percentiles():
+    """测试分位数误差在一个桶（约 12%）以内，max 精确"""
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):           # 1ms ~ 100ms 均匀分布
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 100
+    assert abs(histogram.percentile(50) - 0.050) <= 0.050 * 0.13
+    assert abs(histogram.percentile(95) - 0.095) <= 0.095 * 0.13
+    assert histogram.percentile(100) == 0.100
+    assert histogram.snapshot()['max_ms'] == 100.0
+
+    # 内存固定：桶数不随记录次数变化
+    buckets = len(histogram.counts)
+    for _ in range(1000):
+        histogram.record(20.0)          # 超出范围的值进最后一个桶
+    assert len(histogram.counts) == buckets
+
+
+def test_disabled_metrics_record_nothing():
+    """测试关闭时不记录任何数据"""
+    metrics = Metrics(enabled=False)
+    t = metrics.start()
+    metrics.stop('inference', t)
+    metrics.count('frames')
+    assert t == 0.0
+    assert metrics.stages == {} and metrics.counters == {}
+
+
+def test_snapshot_and_rates():
+    """测试快照包含各阶段统计和计数速率"""
+    metrics = Metrics(enabled=True)
+    metrics.record('inference', 0.010)
+    metrics.record('inference', 0.020)
+    metrics.count('frames', 30)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['stages']['inference']['count'] == 2
+    assert snapshot['counters'] == {'frames': 30}
+    assert snapshot['rates']['frames'] > 0
+
+    # 速率按两次快照之间计算
+    assert metrics.snapshot()['rates']['frames'] == 0
+
+
+def test_exporter_writes_json_lines_and_prometheus():
+    """测试导出 JSON Lines 和 Prometheus 文本"""
+    metrics = Metrics(enabled=True)
+    metrics.record('overlay', 0.001)
+    metrics.count('frames')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'metrics.jsonl')
+        prom_path = os.path.join(tmp, 'metrics.prom')
+        exporter = MetricsExporter(metrics, json_path, prom_path, interval=60)
+        exporter.export()
+        exporter.export()
+
+        with open(json_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 2
+        assert lines[0]['stages']['overlay']['count'] == 1
+
+        with open(prom_path) as f:
+            text = f.read()
+        assert 'gesture_stage_latency_seconds{stage="overlay",quantile="0.99"}' in text
+        assert 'gesture_events_total{event="frames"} 1' in text
+        assert not os.path.exists(prom_path + '.tmp')
+
+    assert format_prometheus(metrics.snapshot()).endswith('\n')
+
+
+if __name__ == "__main__":
+    print("Running metrics tests...")
+
+    test_histogram_percentiles()
+    print("✓ test_histogram_percentiles")
+
+    test_disabled_metrics_record_nothing()
+    print("✓ test_disabled_metrics_record_nothing")
+
+    test_snapshot_and_rates()
+    print("✓ test_snapshot_and_rates")
+
+    test_exporter_writes_json_lines_and_prometheus()
+    print("✓ test_exporter_writes_json_lines_and_prometheus")
+
+    print("\n所有指标测试通过！")
@@ -0,0 +1,158 @@
+"""
+测试 MotionDetector - 帧差运动门控
+
+运行方式：
+    python -m pytest tests/test_motion.py -v
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.clock import FrameClock
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.motion import MotionDetector
+from gesture_control.core.profiles import ProfileWatcher
+from gesture_control.core.trigger import SPRTTrigger
+from gesture_control.main import GestureController, ResultFeed, should_recognize
+from gesture_control.replay import RecordingDispatcher
+
+
+def make_frame(value=0):
+    """纯色 BGR 帧"""
+    return np.full((240, 320, 3), value, dtype=np.uint8)
+
+
+def test_static_scene_is_skipped():
+    """测试静止画面只识别第一帧，并统计跳过数"""
+    detector = MotionDetector(threshold=4.0, max_skip_frames=100)
+    frame = make_frame(50)
+
+    assert detector.has_motion(frame) is True
+    assert [detector.has_motion(frame) for _ in range(5)] == [False] * 5
+    assert detector.get_stats() == {'processed': 1, 'skipped': 5}
+
+
+def test_change_is_detected():
+    """测试画面变化被放行，变化后以新画面为参考"""
+    detector = MotionDetector(threshold=4.0)
+    detector.has_motion(make_frame(50))
+
+    moved = make_frame(50)
+    moved[60:180, 80:240] = 200   # 画面中间出现一只 "手"
+    assert detector.has_motion(moved) is True
+    assert detector.last_score >= 4.0
+    assert detector.has_motion(moved) is False
+
+
+def test_slow_drift_accumulates():
+    """测试缓慢变化相对参考帧累积，最终被放行"""
+    detector = MotionDetector(threshold=4.0, max_skip_frames=100)
+    detector.has_motion(make_frame(50))
+
+    results = [detector.has_motion(make_frame(50 + i)) for i in range(1, 6)]
+    assert results[:3] == [False, False, False]
+    assert True in results
+
+
+def test_forced_refresh():
+    """测试连续跳过 max_skip_frames 帧后强制识别一次"""
+    detector = MotionDetector(max_skip_frames=3)
+    frame = make_frame(50)
+    results = [detector.has_motion(frame) for _ in range(6)]
+    assert results == [True, False, False, False, True, False]
+
+
+def test_skipped_frames_keep_hold_timing():
+    """测试静止的握拳：大部分帧被门控跳过，重放上一次结果，仍在保持 0.3s 时触发"""
+    events = []
+    dispatcher = RecordingDispatcher(events)
+    clock = FrameClock()
+    feed = ResultFeed(GestureController(dispatcher, verbose=False, clock=clock), clock)
+    detector = MotionDetector(threshold=4.0, max_skip_frames=15)
+    frame = make_frame(50)
+    points = {'pointing_up': False, 'single_finger': False}
+
+    fired = []
+    for i in range(30):
+        dispatcher.timestamp_ms = i * 33
+        if should_recognize(None, detector, frame):
+            action = feed.update(GestureType.FIST, points, i * 33)
+        else:
+            action = feed.repeat(i * 33)
+        if action:
+            fired.append((i * 33, action))
+    assert detector.get_stats()['processed'] == 2     # 只识别了第一帧和强制刷新的一帧
+    assert fired == [(330, 'pause')]                   # 第一个 ≥ 0.3s 的帧，而不是强制刷新时
+    assert len(events) == 1
+
+
+def first_action(controller, clock, gated: bool):
+    """握拳 0.95 的分数；gated 时只有第一帧真的识别，其余帧重放。返回第一个动作的时间戳"""
+    feed = ResultFeed(controller, clock)
+    points = {'pointing_up': False, 'single_finger': False,
+              'scores': {GestureType.FIST: 0.95}}
+    for i in range(30):
+        if i == 0 or not gated:
+            action = feed.update(GestureType.FIST, points, i * 33)
+        else:
+            action = feed.repeat(i * 33)
+        if action:
+            return i * 33
+    return None
+
+
+def test_skipped_frames_add_no_evidence():
+    """测试重放的帧不给证据触发器加证据：只识别了一帧时仍等满保持时间（内置映射和配置绑定）"""
+    def builtin():
+        clock = FrameClock()
+        return GestureController(RecordingDispatcher([]), verbose=False, clock=clock,
+                                 trigger=SPRTTrigger()), clock
+
+    assert first_action(*builtin(), gated=False) == 99      # 4 帧真实的高分就够了
+    assert first_action(*builtin(), gated=True) == 330      # 只有 1 帧：按 0.3s 的保持时间
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.json')
+        with open(path, 'w') as f:
+            json.dump({'bindings': {
+                'FIST': {'type': 'timed', 'thresholds': [[0.5, 'space', 'Play']]}}}, f)
+
+        def bound():
+            clock = FrameClock()
+            dispatcher = RecordingDispatcher([])
+            watcher = ProfileWatcher(path, dispatcher, trigger=SPRTTrigger, interval=0.0)
+            return GestureController(dispatcher, verbose=False, clock=clock,
+                                     profile=watcher), clock
+
+        assert first_action(*bound(), gated=False) == 99
+        assert first_action(*bound(), gated=True) == 528
+
+
+if __name__ == "__main__":
+    print("Running motion tests...")
+
+    test_static_scene_is_skipped()
+    print("✓ test_static_scene_is_skipped")
+
+    test_change_is_detected()
+    print("✓ test_change_is_detected")
+
+    test_slow_drift_accumulates()
+    print("✓ test_slow_drift_accumulates")
+
+    test_forced_refresh()
+    print("✓ test_forced_refresh")
+
+    test_skipped_frames_keep_hold_timing()
+    print("✓ test_skipped_frames_keep_hold_timing")
+
+    test_skipped_frames_add_no_evidence()
+    print("✓ test_skipped_frames_add_no_evidence")
+
+    print("\n所有运动门控测试通过！")
@@ -0,0 +1,269 @@
+"""
+测试多路模式 - 共享内存帧环、识别循环、事件归并、进程池
+
+运行方式：
+    python -m pytest tests/test_multistream.py -v
+"""
+
+import sys
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.multistream import EventMerger, GestureEvent, MultiStreamRunner
+from gesture_control.core.preprocess import FramePreprocessor
+from gesture_control.core.shm import SharedFrameRing
+from gesture_control.core.worker import (
+    ERROR, RESULT, RecognizerPool, compact_points, run_worker, _STOP, _Stream,
+)
+from tests.helpers import FakeRecognizer, create_broken, create_fake, frame_with
+
+
+def test_ring_roundtrip():
+    """测试写入/读取、覆盖后的过期检测和尺寸不符时缩放"""
+    ring = SharedFrameRing((24, 32, 3), slots=2)
+    try:
+        reader = SharedFrameRing.attach(ring.name, ring.shape, ring.slots)
+        out = np.empty(ring.shape, dtype=np.uint8)
+
+        slot, index = ring.write(frame_with(7))
+        assert reader.read(slot, index, out)
+        assert out[0, 0, 0] == 7
+
+        ring.write(frame_with(8))
+        ring.write(frame_with(9))   # 两个槽位：第一帧已被覆盖
+        assert not reader.read(slot, index, out)
+
+        slot, index = ring.write(frame_with(5, (48, 64, 3)))
+        assert reader.read(slot, index, out)
+        assert out.shape == (24, 32, 3) and out[0, 0, 0] == 5
+        reader.close()
+    finally:
+        ring.close()
+
+
+def test_run_worker_keeps_newest():
+    """测试识别循环：积压的请求只处理最新一帧，结果去掉 HandFeatures"""
+    ring = SharedFrameRing((24, 32, 3), slots=4)
+    try:
+        requests, results = queue.Queue(), queue.Queue()
+        for value, ts in ((1, 100), (2, 133), (6, 166)):
+            slot, index = ring.write(frame_with(value))
+            requests.put((slot, index, ts))
+
+        recognizer = FakeRecognizer()
+        worker = threading.Thread(target=run_worker, args=(
+            'cam0', ring, requests, results.put, recognizer, FramePreprocessor(mirror=False)))
+        worker.start()
+        kind, source, ts, name, raw, points, elapsed = results.get(timeout=5)
+        requests.put(_STOP)
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+
+        assert (kind, source, ts, name, raw) == (RESULT, 'cam0', 166, 'FIST', 'OPEN_PALM')
+        assert points == {'index_x': 32, 'index_y': 24}
+        assert elapsed >= 0
+        assert recognizer.frames == [(6, 32, 24, 166, True)]
+        assert results.empty()
+    finally:
+        ring.close()
+
+
+def test_run_worker_skips_overwritten():
+    """测试请求对应的槽位已被新帧覆盖时跳过，不识别错误的画面"""
+    ring = SharedFrameRing((24, 32, 3), slots=2)
+    try:
+        requests, results = queue.Queue(), queue.Queue()
+        slot, index = ring.write(frame_with(1))
+        ring.write(frame_with(2))
+        ring.write(frame_with(3))
+        requests.put((slot, index, 100))
+        requests.put(_STOP)
+        recognizer = FakeRecognizer()
+        run_worker('cam0', ring, requests, results.put, recognizer, FramePreprocessor(mirror=False))
+        assert recognizer.frames == [] and results.empty()
+    finally:
+        ring.close()
+
+
+def test_compact_points_hands():
+    """测试每只手的手势转成名字，HandFeatures 不跨进程"""
+    points = {'index_x': 1, 'features': object(), 'hands': {
+        'Right': {'index_x': 1, 'index_y': 2, 'gesture': GestureType.FIST, 'hold_time': 0.5,
+                  'features': object()}}}
+    assert compact_points(points) == {'index_x': 1, 'hands': {
+        'Right': {'index_x': 1, 'index_y': 2, 'gesture': 'FIST', 'hold_time': 0.5}}}
+
+
+def event(source, ts, gesture=GestureType.FIST):
+    return GestureEvent(source, ts, gesture, {})
+
+
+def test_merger_orders_across_sources():
+    """测试多路事件按时间戳归并：慢的一路没跟上前不放出更晚的事件"""
+    merger = EventMerger(['a', 'b'], max_delay_ms=100)
+    merger.push(event('a', 100))
+    merger.push(event('a', 150))
+    assert merger.pop_ready(160) == []       # b 还没有结果（最多等 100ms）
+
+    merger.push(event('b', 120))
+    assert [(e.source, e.timestamp_ms) for e in merger.pop_ready(160)] == [('a', 100), ('b', 120)]
+
+    merger.push(event('b', 180))
+    assert [(e.source, e.timestamp_ms) for e in merger.pop_ready(190)] == [('a', 150)]
+    assert [(e.source, e.timestamp_ms) for e in merger.flush()] == [('b', 180)]
+    assert merger.late == 0
+
+
+def test_merger_stalled_source():
+    """测试某路卡住超过 max_delay 后不再等它，恢复后迟到的事件计数"""
+    merger = EventMerger(['a', 'b'], max_delay_ms=100)
+    merger.push(event('a', 100))
+    merger.push(event('b', 100))
+    merger.push(event('a', 200))
+    assert [e.timestamp_ms for e in merger.pop_ready(150)] == [100, 100]
+
+    # b 在 100 之后再没有结果：250ms 时已超过 max_delay，只按 a 的进度放出
+    merger.push(event('a', 250))
+    assert [e.timestamp_ms for e in merger.pop_ready(250)] == [200, 250]
+
+    merger.push(event('b', 220))
+    assert merger.late == 1
+    assert [e.timestamp_ms for e in merger.flush()] == [220]
+
+
+class FakeCapture:
+    """按顺序吐出预先给定的帧"""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.stopped = False
+
+    def read(self, timeout=1.0):
+        from gesture_control.core.capture import CapturedFrame
+        if not self.frames:
+            return None
+        image, timestamp = self.frames.pop(0)
+        time.sleep(0.01)
+        return CapturedFrame(image, timestamp, 0)
+
+    @property
+    def finished(self):
+        return not self.frames
+
+    def stop(self):
+        self.stopped = True
+
+
+class RecordingController:
+    def __init__(self, source, clock, log):
+        self.source, self.clock, self.log = source, clock, log
+
+    def update(self, gesture, points):
+        self.log.append((self.source, self.clock(), gesture))
+        return None
+
+
+def test_pool_and_runner():
+    """测试真实子进程：每路一个识别进程，结果按时间顺序交给各自的动作层"""
+    log = []
+    captures = {
+        'cam0': FakeCapture([(frame_with(1), 10.0)]),
+        'cam1': FakeCapture([(frame_with(0), 10.05)]),
+    }
+    pool = RecognizerPool(factory=create_fake, mirror=False)
+    runner = MultiStreamRunner(
+        captures, lambda source, clock: RecordingController(source, clock, log), pool=pool,
+        max_delay_ms=100, clock=lambda: 10.06).start()
+    try:
+        deadline = time.monotonic() + 30
+        while (sum(s['results'] for s in runner.stats.values()) < 2
+               and time.monotonic() < deadline):
+            runner.step(timeout=0.1)
+        assert pool.ready == {'cam0', 'cam1'}
+        assert not runner.errors
+        # cam1 的结果是最新的：等别的路追上（或退出）才放出
+        assert log == [('cam0', 10.0, GestureType.FIST)]
+    finally:
+        runner.stop()
+    assert all(capture.stopped for capture in captures.values())
+    assert log == [('cam0', 10.0, GestureType.FIST), ('cam1', 10.05, GestureType.NONE)]
+
+
+def test_pool_reports_factory_error():
+    """测试识别器创建失败时回报 ERROR，而不是让主进程一直等"""
+    pool = RecognizerPool(factory=create_broken)
+    try:
+        pool.add_stream('cam0', (24, 32, 3))
+        messages = []
+        deadline = time.monotonic() + 30
+        while not messages and time.monotonic() < deadline:
+            messages = pool.poll(timeout=0.1)
+        assert messages[0][:2] == (ERROR, 'cam0')
+        assert 'model.task' in messages[0][2]
+    finally:
+        pool.stop()
+
+
+def test_pool_add_stream_during_revive():
+    """测试采集线程在 revive() 遍历途中 add_stream：不会 "dictionary changed size" """
+    pool = RecognizerPool(factory=create_fake)
+
+    class Process:
+        def __init__(self, on_check=None):
+            self.on_check = on_check
+
+        def is_alive(self):
+            if self.on_check is not None:
+                self.on_check()     # 模拟另一路的采集线程正好在这时收到第一帧
+            return True
+
+    pool._start = lambda source_id, ring: _Stream(ring, None, Process(), None)
+    pool.add_stream('cam0', (24, 32, 3))
+    pool.streams['cam0'].process.on_check = lambda: pool.add_stream('cam1', (24, 32, 3))
+    pool._started.add('cam0')     # 报告过 READY
+    try:
+        assert pool.revive() == []
+        assert set(pool.streams) == {'cam0', 'cam1'}
+    finally:
+        for stream in pool.streams.values():
+            stream.ring.close()
+
+
+if __name__ == "__main__":
+    print("Running multi-stream tests...")
+
+    test_ring_roundtrip()
+    print("✓ test_ring_roundtrip")
+
+    test_run_worker_keeps_newest()
+    print("✓ test_run_worker_keeps_newest")
+
+    test_run_worker_skips_overwritten()
+    print("✓ test_run_worker_skips_overwritten")
+
+    test_compact_points_hands()
+    print("✓ test_compact_points_hands")
+
+    test_merger_orders_across_sources()
+    print("✓ test_merger_orders_across_sources")
+
+    test_merger_stalled_source()
+    print("✓ test_merger_stalled_source")
+
+    test_pool_and_runner()
+    print("✓ test_pool_and_runner")
+
+    test_pool_reports_factory_error()
+    print("✓ test_pool_reports_factory_error")
+
+    test_pool_add_stream_during_revive()
+    print("✓ test_pool_add_stream_during_revive")
+
+    print("\n所有多路测试通过！")
@@ -0,0 +1,101 @@
+"""
+测试 OverlayRenderer - 与原绘制结果一致、文字只渲染一次、缓存区分颜色
+
+运行方式：
+    python -m pytest tests/test_overlay.py -v
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.overlay import OverlayRenderer
+
+
+def legacy_render(frame, text, scrolling, pinned):
+    """原来 main.py 里的绘制方式（对照组）"""
+    h, w = frame.shape[:2]
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, 0), (w, 35), (40, 40, 40), -1)
+    cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
+    cv2.putText(frame, text, (10, 23), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 220, 0), 2)
+    if scrolling:
+        center_y = h // 2
+        dead_zone = h // 6
+        cv2.line(frame, (0, center_y), (w, center_y), (0, 200, 0), 1)
+        cv2.line(frame, (0, center_y - dead_zone), (w, center_y - dead_zone), (100, 100, 100), 1)
+        cv2.line(frame, (0, center_y + dead_zone), (w, center_y + dead_zone), (100, 100, 100), 1)
+    if pinned:
+        cv2.putText(frame, "[PIN]", (w - 60, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
+
+def make_frame():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+
+def test_matches_legacy_drawing():
+    """测试输出与原来的绘制一致（文字抗锯齿边缘允许 ±2 的舍入误差）"""
+    renderer = OverlayRenderer()
+    for scrolling, pinned in [(False, False), (True, True)]:
+        expected = make_frame()
+        legacy_render(expected, "Ready", scrolling, pinned)
+
+        actual = make_frame()
+        renderer.render(actual, "Ready", scrolling, pinned)
+        diff = np.abs(actual.astype(int) - expected.astype(int))
+        assert diff.max() <= 2
+
+
+def test_text_rendered_once_per_status():
+    """测试相同状态文字只光栅化一次，变化时才重新渲染"""
+    renderer = OverlayRenderer()
+    frame = make_frame()
+
+    for _ in range(10):
+        renderer.render(frame, "Ready")
+    assert renderer.sprite_renders == 1
+
+    renderer.render(frame, "Hold 0.2s")
+    renderer.render(frame, "Ready")
+    assert renderer.sprite_renders == 2
+
+    stats = renderer.get_stats()
+    assert stats['frames'] == 12
+    assert stats['mean_ms'] > 0
+
+
+def test_sprite_cache_keyed_by_color():
+    """测试同样的文字换了颜色要重新渲染，不能沿用旧颜色的缓存"""
+    renderer = OverlayRenderer()
+    green = make_frame()
+    renderer.render(green, "Ready")
+
+    renderer.TEXT_COLOR = (0, 0, 220)
+    red = make_frame()
+    renderer.render(red, "Ready")
+    assert renderer.sprite_renders == 2
+
+    expected = make_frame()
+    legacy_render(expected, "Ready", False, False)
+    assert np.abs(green.astype(int) - expected.astype(int)).max() <= 2
+    assert np.abs(red.astype(int) - expected.astype(int)).max() > 100
+
+
+if __name__ == "__main__":
+    print("Running overlay tests...")
+
+    test_matches_legacy_drawing()
+    print("✓ test_matches_legacy_drawing")
+
+    test_text_rendered_once_per_status()
+    print("✓ test_text_rendered_once_per_status")
+
+    test_sprite_cache_keyed_by_color()
+    print("✓ test_sprite_cache_keyed_by_color")
+
+    print("\n所有叠加层测试通过！")
@@ -0,0 +1,109 @@
+"""
+测试 FramePreprocessor - 镜像/颜色转换结果与零分配（含识别器送进 mp.Image 之前的裁剪和转换）
+
+运行方式：
+    python -m pytest tests/test_preprocess.py -v
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.preprocess import FramePreprocessor, steady_state_allocation
+from gesture_control.core.motion import MotionDetector
+from tests.helpers import make_recognizer
+
+
+def make_frame():
+    """随机 BGR 帧"""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+
+def test_matches_flip_and_cvtcolor():
+    """测试输出与原来的 flip + cvtColor 完全一致"""
+    frame = make_frame()
+    display, rgb = FramePreprocessor().process(frame)
+
+    expected = cv2.flip(frame, 1)
+    assert np.array_equal(display, expected)
+    assert np.array_equal(rgb, cv2.cvtColor(expected, cv2.COLOR_BGR2RGB))
+
+
+def test_buffers_are_reused():
+    """测试分辨率不变时缓冲区只分配一次"""
+    pre = FramePreprocessor()
+    frame = make_frame()
+
+    first = pre.process(frame)
+    second = pre.process(frame)
+    assert first[0] is second[0] and first[1] is second[1]
+    assert pre.allocations == 1
+
+    pre.process(frame[:240])
+    assert pre.allocations == 2
+
+
+def test_steady_state_allocates_no_frames():
+    """测试稳态循环不分配图像内存（tracemalloc）"""
+    frame = make_frame()
+    pre = FramePreprocessor()
+
+    # 对照组：原来的写法每帧至少分配一帧大小
+    naive = steady_state_allocation(
+        lambda: cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    assert naive >= frame.nbytes
+
+    allocated = steady_state_allocation(lambda: pre.process(frame))
+    assert allocated < frame.nbytes // 100
+
+    # 预处理 + 运动门控一起跑也不分配
+    motion = MotionDetector()
+    allocated = steady_state_allocation(lambda: motion.has_motion(pre.process(frame)[0]))
+    assert allocated < frame.nbytes // 100
+
+
+def test_recognizer_input_allocates_no_frames():
+    """测试识别器的 ROI 裁剪 / 颜色转换写进复用的缓冲区：结果正确，ROI 大小每帧变化也不分配"""
+    frame = make_frame()
+    pre = FramePreprocessor()
+    recognizer = make_recognizer()
+    regions = [(100, 50, 420, 370), (120, 60, 380, 330), None]
+
+    _, rgb = pre.process(frame)
+    for region in regions:
+        x0, y0, x1, y1 = region or (0, 0, 640, 480)
+        expected = rgb[y0:y1, x0:x1]
+        assert np.array_equal(recognizer._to_rgb(rgb, region, is_rgb=True), expected)
+        converted = recognizer._to_rgb(frame, region, is_rgb=False)
+        assert converted.flags.c_contiguous
+        assert np.array_equal(converted, cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2RGB))
+    assert recognizer._to_rgb(rgb, is_rgb=True) is rgb     # 整帧 RGB 本来就连续，直接用
+
+    for is_rgb in (True, False):
+        step = iter(regions * 100)
+        allocated = steady_state_allocation(
+            lambda: recognizer._to_rgb(pre.process(frame)[is_rgb], next(step), is_rgb))
+        assert allocated < frame.nbytes // 100
+
+
+if __name__ == "__main__":
+    print("Running preprocess tests...")
+
+    test_matches_flip_and_cvtcolor()
+    print("✓ test_matches_flip_and_cvtcolor")
+
+    test_buffers_are_reused()
+    print("✓ test_buffers_are_reused")
+
+    test_steady_state_allocates_no_frames()
+    print("✓ test_steady_state_allocates_no_frames")
+
+    test_recognizer_input_allocates_no_frames()
+    print("✓ test_recognizer_input_allocates_no_frames")
+
+    print("\n所有预处理测试通过！")
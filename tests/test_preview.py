@@ -0,0 +1,75 @@
+"""
+测试 PreviewProcess - 共享内存写入、限速与 seqlock 读取（不启动窗口）
+
+运行方式：
+    python -m pytest tests/test_preview.py -v
+"""
+
+import sys
+import os
+from unittest.mock import Mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.preview import PreviewProcess, read_frame
+
+
+def make_preview(fps=1000.0):
+    """创建预览对象，子进程用 Mock 代替"""
+    preview = PreviewProcess(32, 24, fps=fps)
+    preview._ctx = Mock()
+    return preview.start()
+
+
+def test_submit_downscales_into_shared_memory():
+    """测试提交的帧缩小后写进共享内存，读端拿到完整画面"""
+    preview = make_preview()
+    try:
+        frame = np.full((240, 320, 3), 77, dtype=np.uint8)
+        assert preview.submit(frame) is True
+
+        out = np.zeros((24, 32, 3), dtype=np.uint8)
+        assert read_frame(preview._buffer, preview._seq, out) == 2
+        assert (out == 77).all()
+    finally:
+        preview.stop()
+
+
+def test_reader_rejects_torn_frame():
+    """测试写者正在写（序号为奇数）时读端放弃"""
+    preview = make_preview()
+    try:
+        preview._seq.value = 3
+        out = np.zeros((24, 32, 3), dtype=np.uint8)
+        assert read_frame(preview._buffer, preview._seq, out) == -1
+    finally:
+        preview.stop()
+
+
+def test_submit_is_rate_limited():
+    """测试超过预览帧率的帧直接跳过"""
+    preview = make_preview(fps=1.0)
+    try:
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        results = [preview.submit(frame) for _ in range(5)]
+        assert results == [True, False, False, False, False]
+        assert preview.submitted_frames == 1
+    finally:
+        preview.stop()
+
+
+if __name__ == "__main__":
+    print("Running preview tests...")
+
+    test_submit_downscales_into_shared_memory()
+    print("✓ test_submit_downscales_into_shared_memory")
+
+    test_reader_rejects_torn_frame()
+    print("✓ test_reader_rejects_torn_frame")
+
+    test_submit_is_rate_limited()
+    print("✓ test_submit_is_rate_limited")
+
+    print("\n所有预览测试通过！")
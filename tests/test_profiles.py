@@ -0,0 +1,221 @@
+"""
+测试手势绑定配置 - JSON / TOML 解析、格式错误、扁平表、热加载、控制器和回放的集成
+
+运行方式：
+    python -m pytest tests/test_profiles.py -v
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.actions import PositionAction, RepeatKeyAction, TimedAction
+from gesture_control.core.clock import FrameClock
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.profiles import (
+    ProfileWatcher, compile_profile, load_profile, parse_gesture, resolve_profile,
+)
+from gesture_control.core.recording import SessionRecorder, load_recording
+from gesture_control.core.swipe import SwipeDetector
+from gesture_control.main import GestureController
+from gesture_control.replay import RecordingDispatcher, ReplayEngine
+from tests.helpers import make_result
+
+FIST = GestureType.FIST
+
+
+def test_bundled_profiles():
+    """测试自带的 JSON / TOML 配置编译成按 GestureType 编号索引的扁平表"""
+    default = load_profile(resolve_profile('default'))
+    assert len(default.table) == max(g.value for g in GestureType) + 1
+    assert isinstance(default.get(FIST), TimedAction)
+    assert isinstance(default.get(GestureType.THUMB_UP), RepeatKeyAction)
+    assert default.get(GestureType.THUMB_UP).count == 4
+    assert default.get(GestureType.POINTING_UP) is None     # 没绑定：控制器按手指方向滚动
+    assert default.get(GestureType.NONE) is None
+
+    presentation = load_profile(resolve_profile('presentation'))
+    assert presentation.name == 'presentation'
+    assert isinstance(presentation.get(GestureType.POINTING_UP), PositionAction)
+    assert [t[1] for t in presentation.get(FIST).thresholds] == ['b', 'escape']
+    assert ('FIST', 'Blank screen (0.3s) / End show (2s)') in presentation.describe()
+
+    # MediaPipe 名称和枚举名都可以
+    assert parse_gesture('Closed_Fist') == parse_gesture('FIST') == FIST
+
+
+def test_invalid_profiles():
+    """测试格式错误都报 ValueError：未知手势、未知类型、缺字段、字段类型不对、挥手带保持时间"""
+    bad = [
+        {},
+        {'bindings': {'Wave': {'type': 'timed', 'thresholds': [[0.3, 'a', 'A']]}}},
+        {'bindings': {'NONE': {'type': 'idle', 'message': 'x'}}},
+        {'bindings': {'FIST': {'type': 'hold'}}},
+        {'bindings': {'FIST': {'type': 'repeat', 'hold_time': 0.3}}},
+        {'bindings': {'FIST': {'type': 'repeat', 'key': 'a', 'hold_time': '0.3'}}},
+        {'bindings': {'FIST': {'type': 'timed', 'thresholds': [[0.3, 'a']]}}},
+        {'bindings': {'FIST': {'type': 'timed', 'thresholds': []}}},
+        # 挥手没有保持时间：有阈值 / hold_time 的绑定永远不会触发
+        {'bindings': {'SWIPE_LEFT': {'type': 'timed', 'thresholds': [[0.3, 'a', 'A']]}}},
+        {'bindings': {'SWIPE_UP': {'type': 'repeat', 'key': 'up', 'hold_time': 0.5}}},
+        {'bindings': {'SWIPE_RIGHT': {'type': 'release', 'min_time': 0, 'max_time': 1,
+                                      'key': 'k'}}},
+    ]
+    for data in bad:
+        try:
+            compile_profile(data)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {data}")
+    compile_profile({'bindings': {
+        'SWIPE_LEFT': {'type': 'timed', 'thresholds': [[0, 'a', 'A']]},
+        'SWIPE_UP': {'type': 'repeat', 'key': 'up', 'hold_time': 0}}})
+    try:
+        resolve_profile('no_such_profile')
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError("expected FileNotFoundError")
+
+
+def fist_profile(key):
+    return {'name': key, 'bindings': {'FIST': {'type': 'timed',
+                                               'thresholds': [[0.3, key, key.upper()]]}}}
+
+
+def test_hot_reload():
+    """测试热加载：间隔内不检查；文件修改后换新表；新文件有错时保留旧表，修好后再加载"""
+    now = [0.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.json')
+        with open(path, 'w') as f:
+            json.dump(fist_profile('a'), f)
+        watcher = ProfileWatcher(path, interval=1.0, clock=lambda: now[0])
+        first = watcher.profile
+        assert first.get(FIST).thresholds[0][1] == 'a'
+
+        with open(path, 'w') as f:
+            json.dump(fist_profile('space'), f)
+        assert not watcher.poll()                 # 还没到检查间隔
+        now[0] = 1.5
+        assert watcher.poll()
+        assert watcher.profile.get(FIST).thresholds[0][1] == 'space'
+        assert watcher.reloads == 1
+        now[0] = 3.0
+        assert not watcher.poll()                 # 文件没变
+
+        with open(path, 'w') as f:
+            f.write('{"bindings": {"FIST": ')     # 写了一半
+        now[0] = 4.5
+        assert not watcher.poll()
+        assert watcher.error and watcher.profile.get(FIST).thresholds[0][1] == 'space'
+
+        with open(path, 'w') as f:
+            json.dump(fist_profile('enter'), f)
+        now[0] = 6.0
+        assert watcher.poll() and watcher.error is None
+        assert watcher.profile.name == 'enter'
+
+
+HAND = np.array([[0.50, 0.70], [0.42, 0.45], [0.47, 0.40], [0.50, 0.38], [0.53, 0.40],
+                 [0.57, 0.45]])   # 手腕 + 五个指尖
+
+
+def test_controller_uses_profile():
+    """测试控制器按配置执行：保持触发、松开触发、挥手；改了文件下一帧起用新绑定"""
+    events = []
+    dispatcher = RecordingDispatcher(events)
+    clock = FrameClock()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.json')
+        with open(path, 'w') as f:
+            json.dump({'name': 'app', 'bindings': {
+                'FIST': {'type': 'release', 'min_time': 0.2, 'max_time': 2.0, 'key': 'k'},
+                'OPEN_PALM': {'type': 'timed', 'thresholds': [[0.3, 'space', 'Play']]},
+                'SWIPE_RIGHT': {'type': 'repeat', 'key': 'n', 'description': 'Next'},
+            }}, f)
+        watcher = ProfileWatcher(path, dispatcher, interval=0.0)
+        controller = GestureController(dispatcher, verbose=False, clock=clock,
+                                       swipe=SwipeDetector(), profile=watcher)
+        points = {'tracked': HAND, 'pointing_up': False, 'single_finger': False}
+
+        actions = []
+        frame = 0
+        for gesture, frames in [(GestureType.OPEN_PALM, 15), (FIST, 15),
+                                (GestureType.NONE, 5)]:
+            for _ in range(frames):
+                clock.update(frame * 33)
+                frame += 1
+                actions.append(controller.update(gesture, points))
+        assert [a for a in actions if a] == ['Play', 'k']
+        assert [e[2] for e in events] == ['spacex1', 'kx1']
+        assert controller.get_status(GestureType.OPEN_PALM) == 'OPEN_PALM → Play (0.3s)'
+
+        # 向右挥 → 配置里的 Next；挥完停下的张掌不触发 Play
+        del events[:]
+        actions = []
+        for i in range(30):
+            clock.update((frame + i) * 33)
+            moved = dict(points, tracked=HAND + [min(i, 8) * 0.03, 0])
+            actions.append(controller.update(GestureType.OPEN_PALM, moved))
+        assert [a for a in actions if a] == ['Next']
+        assert [e[2] for e in events] == ['nx1']
+
+        with open(path, 'w') as f:
+            json.dump(fist_profile('x'), f)
+        controller.update(GestureType.NONE, {})
+        assert watcher.reloads == 1
+        assert controller.get_status(GestureType.OPEN_PALM) == 'OPEN_PALM'
+
+
+def test_replay_default_profile_matches_builtin():
+    """测试自带的 default 配置和内置映射回放出同样的按键"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 's.npz')
+        recorder = SessionRecorder(path)
+        timestamp_ms = 1000
+        for name, frames in [(None, 10), ('Closed_Fist', 20), (None, 10), ('Thumb_Up', 20),
+                             (None, 10), ('Victory', 20), (None, 10)]:
+            for _ in range(frames):
+                result = make_result(name, 0.95)
+                recorder.record(timestamp_ms, result, result.hand_landmarks, 320, 240)
+                timestamp_ms += 33
+        recorder.close()
+        recording = load_recording(path)
+
+    def presses(report):
+        return [(t, value) for t, kind, value in report['events'] if kind == 'press']
+
+    builtin = ReplayEngine(recording, trigger='hold', swipe=False).run()
+    profiled = ReplayEngine(recording, trigger='hold', swipe=False, profile='default').run()
+    assert presses(builtin) == presses(profiled)
+    assert [v for _, v in presses(profiled)] == ['spacex1', 'rightx4', 'fx1']
+    assert profiled['trigger_latency']['count'] == 3
+    assert [e[2] for e in profiled['events'] if e[1] == 'action'] == [
+        'Pause', 'Forward 20s', 'Fullscreen']
+
+
+if __name__ == "__main__":
+    print("Running profile tests...")
+
+    test_bundled_profiles()
+    print("✓ test_bundled_profiles")
+
+    test_invalid_profiles()
+    print("✓ test_invalid_profiles")
+
+    test_hot_reload()
+    print("✓ test_hot_reload")
+
+    test_controller_uses_profile()
+    print("✓ test_controller_uses_profile")
+
+    test_replay_default_profile_matches_builtin()
+    print("✓ test_replay_default_profile_matches_builtin")
+
+    print("\n所有绑定配置测试通过！")
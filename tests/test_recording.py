@@ -0,0 +1,114 @@
+"""
+测试 SessionRecorder / ReplayEngine - 录制格式往返与确定性回放
+
+运行方式：
+    python -m pytest tests/test_recording.py -v
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.actions import RepeatKeyAction
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.recording import SessionRecorder, load_recording
+from gesture_control.replay import ReplayEngine
+from tests.helpers import make_result
+
+
+def record_session(path, script, fps=30):
+    """
+    按脚本录制一段会话
+
+    Args:
+        script: [(手势名或 None, 秒数), ...]
+    """
+    recorder = SessionRecorder(path, initial_capacity=4)   # 小容量，顺便测试扩容
+    timestamp_ms = 1000
+    for name, seconds in script:
+        for _ in range(int(seconds * fps)):
+            result = make_result(name)
+            recorder.record(timestamp_ms, result, result.hand_landmarks, 320, 240)
+            timestamp_ms += 1000 // fps
+    recorder.close()
+    return load_recording(path)
+
+
+def test_recording_roundtrip():
+    """测试录制后加载，重建的结果与原始结果一致"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = record_session(os.path.join(tmp, 's.npz'), [('Closed_Fist', 0.2), (None, 0.1)])
+
+    assert len(recording) == 9
+    assert recording.frame_size == (320, 240)
+
+    result = recording.result_at(0)
+    assert result.gestures[0][0].category_name == 'Closed_Fist'
+    assert abs(result.gestures[0][0].score - 0.9) < 1e-6
+    assert result.gestures[0][1].category_name == 'None'
+    assert result.handedness[0][0].category_name == 'Right'
+    assert abs(result.hand_landmarks[0][8].y - 0.2) < 1e-6
+    assert abs(result.hand_world_landmarks[0][20].z - 0.2) < 1e-6
+
+    assert recording.result_at(8).hand_landmarks == []
+
+
+def test_replay_triggers_actions_deterministically():
+    """测试回放触发动作（固定保持时间），多次回放结果相同"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = record_session(os.path.join(tmp, 's.npz'),
+                                   [(None, 0.5), ('Closed_Fist', 1.0), (None, 0.5)])
+
+    engine = ReplayEngine(recording, trigger='hold')
+    report = engine.run()
+    actions = [e for e in report['events'] if e[1] == 'action']
+    assert [a[2] for a in actions] == ['pause']
+    assert ('press' in report['counts']) and report['counts']['action'] == 1
+
+    # 平滑 2 帧 + 保持 0.3s：第一次握拳后约 0.3s 触发
+    first_fist = 1000 + 15 * 33
+    assert 300 <= actions[0][0] - first_fist <= 400
+
+    assert engine.run()['events'] == report['events']
+
+
+def test_replay_parameter_overrides():
+    """测试覆盖保持时间：保持时间比手势短就不触发"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = record_session(os.path.join(tmp, 's.npz'), [('Victory', 0.6), (None, 0.2)])
+
+    assert ReplayEngine(recording, trigger='hold').run()['counts'].get('action') == 1
+    assert ReplayEngine(recording, hold_time=0.7,
+                        trigger='hold').run()['counts'].get('action') is None
+
+
+def test_replay_table_driven_bindings():
+    """测试回放表驱动动作（GestureStateMachine + RepeatKeyAction）"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = record_session(os.path.join(tmp, 's.npz'), [('Thumb_Down', 1.0)])
+
+    engine = ReplayEngine(recording, bindings=lambda d: {
+        GestureType.THUMB_DOWN: RepeatKeyAction(0.5, 'left', 4, 'Rewind 20s', dispatcher=d),
+    })
+    presses = [e[2] for e in engine.run()['events'] if e[1] == 'press']
+    assert 'leftx4' in presses
+
+
+if __name__ == "__main__":
+    print("Running recording tests...")
+
+    test_recording_roundtrip()
+    print("✓ test_recording_roundtrip")
+
+    test_replay_triggers_actions_deterministically()
+    print("✓ test_replay_triggers_actions_deterministically")
+
+    test_replay_parameter_overrides()
+    print("✓ test_replay_parameter_overrides")
+
+    test_replay_table_driven_bindings()
+    print("✓ test_replay_table_driven_bindings")
+
+    print("\n所有录制/回放测试通过！")
@@ -0,0 +1,84 @@
+"""
+测试 HandROITracker - 裁剪区域跟踪与坐标映射
+
+运行方式：
+    python -m pytest tests/test_roi.py -v
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.roi import HandROITracker, Landmark
+
+
+def make_hand(cx, cy, size=0.1):
+    """在 (cx, cy) 附近生成 21 个归一化关键点"""
+    return [Landmark(cx + size * (i % 5 - 2) / 4, cy + size * (i // 5 - 2) / 4, 0.0)
+            for i in range(21)]
+
+
+def test_region_follows_hand():
+    """测试找到手后裁剪区域包住手，跟丢回退整帧"""
+    tracker = HandROITracker(padding=0.5, min_size=64)
+    assert tracker.next_region() is None
+
+    tracker.update(make_hand(0.5, 0.5), 640, 480)
+    x0, y0, x1, y1 = tracker.next_region()
+    assert x0 < 0.45 * 640 and x1 > 0.55 * 640
+    assert y0 < 0.45 * 480 and y1 > 0.55 * 480
+    assert x1 - x0 == y1 - y0  # 正方形
+
+    tracker.update(None, 640, 480)
+    assert tracker.next_region() is None
+
+
+def test_region_is_sticky_and_clamped():
+    """测试手在区域内小幅移动时区域不变；靠近边缘时区域不越界"""
+    tracker = HandROITracker(padding=0.5, min_size=64)
+    tracker.update(make_hand(0.5, 0.5), 640, 480)
+    region = tracker.region
+
+    tracker.update(make_hand(0.505, 0.5), 640, 480)
+    assert tracker.region == region
+
+    tracker.update(make_hand(0.97, 0.97, size=0.05), 640, 480)
+    x0, y0, x1, y1 = tracker.region
+    assert x1 <= 640 and y1 <= 480
+
+
+def test_to_full_frame_mapping():
+    """测试裁剪区域坐标映射回整帧"""
+    tracker = HandROITracker()
+    mapped = tracker.to_full_frame([Landmark(0.5, 0.5, 0.1)], (100, 50, 300, 250), 400, 300)
+    assert abs(mapped[0].x - 0.5) < 1e-9   # (100 + 0.5 * 200) / 400
+    assert abs(mapped[0].y - 0.5) < 1e-9   # (50 + 0.5 * 200) / 300
+    assert abs(mapped[0].z - 0.05) < 1e-9
+
+
+def test_periodic_full_frame():
+    """测试每隔 full_frame_interval 帧强制整帧检测"""
+    tracker = HandROITracker(full_frame_interval=2)
+    tracker.update(make_hand(0.5, 0.5), 640, 480)
+    regions = [tracker.next_region() for _ in range(3)]
+    assert regions[0] is not None and regions[1] is not None
+    assert regions[2] is None
+
+
+if __name__ == "__main__":
+    print("Running ROI tests...")
+
+    test_region_follows_hand()
+    print("✓ test_region_follows_hand")
+
+    test_region_is_sticky_and_clamped()
+    print("✓ test_region_is_sticky_and_clamped")
+
+    test_to_full_frame_mapping()
+    print("✓ test_to_full_frame_mapping")
+
+    test_periodic_full_frame()
+    print("✓ test_periodic_full_frame")
+
+    print("\n所有 ROI 测试通过！")
@@ -0,0 +1,144 @@
+"""
+测试手势平滑 - 置信度加权证据、迟滞、单手势窗口、与识别器的集成
+
+运行方式：
+    python -m pytest tests/test_smoothing.py -v
+"""
+
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.smoothing import EvidenceSmoother, GestureSmoother, create_smoother
+from tests.helpers import make_recognizer, make_result
+
+FIST, PALM, NONE = GestureType.FIST, GestureType.OPEN_PALM, GestureType.NONE
+
+
+def feed(smoother, frames):
+    """frames: 每帧的类别分布；返回每帧确认的手势"""
+    return [smoother.update(max(scores, key=scores.get) if scores else NONE, scores)
+            for scores in frames]
+
+
+def test_confident_gesture_confirms_faster():
+    """测试高置信度两帧确认（多数投票要三帧），0.6 左右的要三帧"""
+    assert feed(EvidenceSmoother(3), [{FIST: 0.95}] * 3) == [NONE, FIST, FIST]
+    assert feed(EvidenceSmoother(3), [{FIST: 0.6}] * 3) == [NONE, NONE, FIST]
+    assert feed(GestureSmoother(3), [{FIST: 0.95}] * 3) == [NONE, NONE, FIST]
+
+
+def test_low_confidence_never_confirms():
+    """测试低置信度的抖动（多数投票会认的那种）不会确认"""
+    frames = [{FIST: 0.45, PALM: 0.4}, {FIST: 0.5, PALM: 0.45}, {FIST: 0.4, PALM: 0.5}] * 3
+    assert set(feed(EvidenceSmoother(3), frames)) == {NONE}
+
+
+def test_hysteresis():
+    """测试确认后单帧变化不切换，证据跌破 exit 才放开"""
+    smoother = EvidenceSmoother(3, enter=0.6, exit=0.35)
+    feed(smoother, [{FIST: 0.9}] * 3)
+    assert smoother.update(PALM, {PALM: 0.9, FIST: 0.05}) == FIST      # 证据 0.62
+    assert smoother.update(PALM, {PALM: 0.9, FIST: 0.05}) == PALM      # 握拳 0.33 < exit，张掌 0.6
+    assert smoother.update(FIST, {FIST: 0.9}) == PALM                  # 张掌还有 0.6
+    assert abs(smoother.score(PALM) - 0.6) < 1e-9
+
+
+def test_hand_leaving_resets():
+    """测试手离开（没有类别分布）立即放开并清空证据"""
+    smoother = EvidenceSmoother(3)
+    feed(smoother, [{FIST: 0.9}] * 3)
+    assert smoother.update(NONE) == NONE
+    assert smoother.score(FIST) == 0.0
+    assert smoother.update(FIST, {FIST: 0.9}) == NONE   # 重新累积
+
+
+def test_per_gesture_window():
+    """测试单手势窗口：指向用 2 帧窗口，0.7 的置信度两帧确认，其他手势仍是 3 帧"""
+    pointing = GestureType.POINTING_UP
+    smoother = EvidenceSmoother(3, windows={'POINTING_UP': 2})
+    assert smoother.windows[pointing] == 2 and smoother.windows[FIST] == 3
+    assert feed(smoother, [{pointing: 0.7}] * 2) == [NONE, pointing]
+    assert feed(EvidenceSmoother(3), [{pointing: 0.7}] * 2) == [NONE, NONE]
+
+
+def test_incremental_sums_match_window():
+    """测试增量窗口和与直接按窗口求和一致（不同长度的窗口混在一起）"""
+    rng = random.Random(7)
+    windows = {GestureType.VICTORY: 5, PALM: 1}
+    smoother = EvidenceSmoother(3, windows=windows)
+    history = []
+    for _ in range(200):
+        scores = {gesture: rng.random() for gesture in rng.sample(list(GestureType), 3)}
+        history.append(scores)
+        smoother.update(FIST, scores)
+        for gesture in GestureType:
+            n = windows.get(gesture, 3)
+            expected = sum(frame.get(gesture, 0.0) for frame in history[-n:]) / n
+            assert abs(smoother.score(gesture) - expected) < 1e-9
+
+
+def test_create_smoother():
+    """测试按名字创建，以及参数检查"""
+    assert isinstance(create_smoother('vote', 3), GestureSmoother)
+    smoother = create_smoother('evidence', 4, enter=0.7, exit=0.3)
+    assert (smoother.window, smoother.enter, smoother.exit) == (4, 0.7, 0.3)
+    for bad in (lambda: create_smoother('median'), lambda: EvidenceSmoother(enter=0.3, exit=0.5)):
+        try:
+            bad()
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError")
+
+
+def test_recognizer_uses_full_distribution():
+    """测试识别器把全部类别交给平滑器：top-1 低于 0.5 的手势也能靠累积确认，每只手同样处理"""
+    recognizer = make_recognizer(smoothing='evidence')
+    vote = make_recognizer()
+
+    result = make_result(categories=[('Victory', 0.48), ('Open_Palm', 0.3)])
+    for i in range(3):
+        gesture, points = recognizer.process_result(result, 320, 240, timestamp_ms=i * 33)
+        assert vote.process_result(result, 320, 240)[0] == NONE
+    assert recognizer.raw_gesture == NONE   # top-1 没过 0.5 的阈值
+    assert gesture == NONE                  # 0.48 不够 enter
+    assert recognizer.smoother.score(GestureType.VICTORY) > 0.47
+
+    result = make_result(categories=[('Closed_Fist', 0.95), ('Victory', 0.03)])
+    gestures = [recognizer.process_result(result, 320, 240, timestamp_ms=100 + i * 33)
+                for i in range(2)]
+    assert [g for g, _ in gestures] == [NONE, FIST]
+    assert gestures[-1][1]['hands']['Right']['gesture'] == FIST
+
+
+if __name__ == "__main__":
+    print("Running smoothing tests...")
+
+    test_confident_gesture_confirms_faster()
+    print("✓ test_confident_gesture_confirms_faster")
+
+    test_low_confidence_never_confirms()
+    print("✓ test_low_confidence_never_confirms")
+
+    test_hysteresis()
+    print("✓ test_hysteresis")
+
+    test_hand_leaving_resets()
+    print("✓ test_hand_leaving_resets")
+
+    test_per_gesture_window()
+    print("✓ test_per_gesture_window")
+
+    test_incremental_sums_match_window()
+    print("✓ test_incremental_sums_match_window")
+
+    test_create_smoother()
+    print("✓ test_create_smoother")
+
+    test_recognizer_uses_full_distribution()
+    print("✓ test_recognizer_uses_full_distribution")
+
+    print("\n所有平滑测试通过！")
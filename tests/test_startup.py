@@ -0,0 +1,115 @@
+"""
+测试启动加速 - 延迟导入、后台阶段与主线程并行、启动耗时分解
+
+运行方式：
+    python -m pytest tests/test_startup.py -v
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.lazy import IMPORT_TIMES, LazyModule, lazy_import, preload
+from gesture_control.core.startup import StartupTimer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_lazy_module():
+    """测试代理在第一次访问属性时才 import；下划线属性不触发；可以 patch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'lazy_probe.py'), 'w') as f:
+            f.write("VALUE = 42\n")
+        sys.path.insert(0, tmp)
+        try:
+            module = lazy_import('lazy_probe')
+            assert isinstance(module, LazyModule) and not module.loaded
+            assert 'lazy_probe' not in sys.modules
+            assert not hasattr(module, '__version__')   # mock / inspect 的探测不加载
+            assert not module.loaded
+
+            assert module.VALUE == 42
+            assert module.loaded and 'lazy_probe' in sys.modules
+            assert 'lazy_probe' in IMPORT_TIMES
+            with patch.object(module, 'VALUE', 7):
+                assert module.VALUE == 7
+            assert module.VALUE == 42
+
+            other = lazy_import('lazy_probe')
+            preload(other)
+            assert other.loaded
+            preload(object())    # 不是代理：什么也不做
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop('lazy_probe', None)
+
+
+def test_import_does_not_load_heavy_modules():
+    """测试 import main / replay 不会 import mediapipe 和 pyautogui（子进程里检查）"""
+    code = ("import sys, gesture_control.main, gesture_control.replay; "
+            "print(sorted(m for m in ('mediapipe', 'pyautogui') if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                         text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == '[]'
+
+
+def test_background_stage_runs_in_parallel():
+    """测试后台阶段与主线程同时进行：后台任务要等主线程阶段里的信号才能完成"""
+    startup = StartupTimer()
+    model_loading = threading.Event()
+
+    def open_camera():
+        assert model_loading.wait(timeout=5), "background stage did not overlap"
+        return 'cap'
+
+    camera = startup.background('camera', open_camera)
+    with startup.stage('recognizer'):
+        model_loading.set()
+    assert camera.result(timeout=5) == 'cap'
+    assert set(startup.stages) == {'camera', 'recognizer'}
+    assert startup.parallel == {'camera'}
+
+
+def test_startup_report():
+    """测试时刻只记第一次，报告里有阶段耗时、并行标记和到第一个结果的时间"""
+    now = [0.0]
+    startup = StartupTimer(clock=lambda: now[0])
+    with startup.stage('recognizer'):
+        now[0] += 0.25
+    startup.parallel.add('camera')
+    startup.stages['camera'] = 0.4
+    now[0] += 0.25
+    assert startup.mark('first_result')
+    now[0] += 1.0
+    assert not startup.mark('first_result')
+
+    summary = startup.summary()
+    assert summary['stages'] == {'recognizer': 250.0, 'camera': 400.0}
+    assert summary['marks'] == {'first_result': 500.0}
+    report = startup.report()
+    assert report.startswith("Startup: ")
+    assert "recognizer 250ms | camera 400ms (parallel) | first result 0.50s" in report
+
+
+if __name__ == "__main__":
+    print("Running startup tests...")
+
+    test_lazy_module()
+    print("✓ test_lazy_module")
+
+    test_import_does_not_load_heavy_modules()
+    print("✓ test_import_does_not_load_heavy_modules")
+
+    test_background_stage_runs_in_parallel()
+    print("✓ test_background_stage_runs_in_parallel")
+
+    test_startup_report()
+    print("✓ test_startup_report")
+
+    print("\n所有启动加速测试通过！")
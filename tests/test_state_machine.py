@@ -5,13 +5,13 @@
     python -m pytest tests/test_state_machine.py -v
 """
 
-import time
 import sys
 import os
 
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from gesture_control.core.clock import ManualClock
 from gesture_control.core.state_machine import GestureStateMachine
 from gesture_control.core.gestures import GestureType
 
@@ -26,26 +26,28 @@ def test_initial_state():
 
 def test_gesture_tracking():
     """测试手势跟踪和计时"""
-    sm = GestureStateMachine()
+    clock = ManualClock()
+    sm = GestureStateMachine(clock)
 
     # 第一次更新：握拳
     hold_time = sm.update(GestureType.FIST)
     assert hold_time == 0.0
     assert sm.current_gesture == GestureType.FIST
 
-    # 等待 0.1 秒
-    time.sleep(0.1)
+    # 过 0.1 秒
+    clock.advance(0.1)
     hold_time = sm.update(GestureType.FIST)
-    assert 0.09 <= hold_time <= 0.15  # 允许一些误差
+    assert abs(hold_time - 0.1) < 1e-9
 
 
 def test_gesture_switch():
     """测试手势切换时重置状态"""
-    sm = GestureStateMachine()
+    clock = ManualClock()
+    sm = GestureStateMachine(clock)
 
     # 握拳 0.2 秒
     sm.update(GestureType.FIST)
-    time.sleep(0.2)
+    clock.advance(0.2)
     sm.update(GestureType.FIST)
 
     # 切换到 OPEN_PALM
@@ -71,11 +73,12 @@ def test_should_execute():
 
 def test_multiple_thresholds():
     """测试多个时间阈值（握拳 0.5s → 暂停，3s → 全屏）"""
-    sm = GestureStateMachine()
+    clock = ManualClock()
+    sm = GestureStateMachine(clock)
 
     sm.update(GestureType.FIST)
-    time.sleep(0.6)
-    sm.update(GestureType.FIST)
+    clock.advance(0.6)
+    assert abs(sm.update(GestureType.FIST) - 0.6) < 1e-9
 
     # 0.5s 阈值应该可以执行
     assert sm.should_execute(0.5) is True
@@ -0,0 +1,193 @@
+"""
+测试挥手检测 - 四个方向、慢速/斜向/单指不算、环形缓冲区、与动作派发的集成
+
+运行方式：
+    python -m pytest tests/test_swipe.py -v
+"""
+
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.clock import FrameClock
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.recording import SessionRecorder, load_recording
+from gesture_control.core.swipe import SwipeDetector
+from gesture_control.main import GestureController
+from gesture_control.replay import RecordingDispatcher, ReplayEngine
+
+HAND = np.array([[0.50, 0.70], [0.42, 0.45], [0.47, 0.40], [0.50, 0.38], [0.53, 0.40],
+                 [0.57, 0.45]])   # 手腕 + 五个指尖
+
+
+def move(detector, step, frames=12, start=0.0, moving=None):
+    """整只手每帧移动 step=(dx, dy)，返回每帧的检测结果；moving 指定只移动哪些点"""
+    results = []
+    for i in range(frames):
+        tracked = HAND.copy()
+        offset = np.array(step) * i
+        if moving is None:
+            tracked += offset
+        else:
+            tracked[moving] += offset
+        results.append(detector.update(tracked, start + i / 30))
+    return results
+
+
+def arrive(detector, start=0.0):
+    """手进入画面后先静止 settle 帧（进场的帧不检测），到 start 时刻为止"""
+    for i in range(detector.settle):
+        assert detector.update(HAND, start - (detector.settle - i) / 30) is None
+
+
+def first_swipe(results):
+    return next(((i, r) for i, r in enumerate(results) if r is not None), None)
+
+
+def test_four_directions():
+    """测试四个方向（镜像画面坐标：x 增大是右，y 增大是下），窗口没满也能检测"""
+    cases = {(0.03, 0): GestureType.SWIPE_RIGHT, (-0.03, 0): GestureType.SWIPE_LEFT,
+             (0, -0.03): GestureType.SWIPE_UP, (0, 0.03): GestureType.SWIPE_DOWN}
+    for step, expected in cases.items():
+        detector = SwipeDetector()
+        arrive(detector)
+        frame, gesture = first_swipe(move(detector, step))
+        assert gesture == expected
+        assert frame == 5          # 5 × 0.03 = 0.15 达到阈值
+
+
+def test_rejects_slow_diagonal_and_single_finger():
+    """测试慢速移动、斜向移动、只有一个手指在动都不算挥手"""
+    for step, frames, moving in (((0.01, 0), 60, None), ((0.03, 0.025), 12, None),
+                                 ((0.1, 0), 12, [2])):
+        detector = SwipeDetector()
+        arrive(detector)
+        assert first_swipe(move(detector, step, frames=frames, moving=moving)) is None
+
+
+def test_entering_hand_is_not_a_swipe():
+    """测试手从画面下边缘伸进来：刚出现的 settle 帧里的移动不算，之后的移动才进窗口"""
+    detector = SwipeDetector()
+    results = [detector.update(HAND + [0, 0.4 - 0.04 * i], i / 30) for i in range(20)]
+    frame, gesture = first_swipe(results)
+    assert gesture == GestureType.SWIPE_UP
+    assert frame == detector.settle + 3     # 窗口从最后一个进场帧开始：0.04 × 4 ≥ 0.15
+
+
+def test_one_event_per_swipe():
+    """测试一次长挥只触发一次、收手不触发反方向（冷却期），冷却后可以再挥；手离开清空缓冲区"""
+    detector = SwipeDetector(cooldown=0.6)
+    arrive(detector)
+    results = move(detector, (0.03, 0), frames=14)
+    assert [r for r in results if r is not None] == [GestureType.SWIPE_RIGHT]
+    assert move(detector, (-0.05, 0), frames=6, start=0.5) == [None] * 6   # 收手
+    assert first_swipe(move(detector, (-0.03, 0), start=1.0))[1] == GestureType.SWIPE_LEFT
+
+    assert detector.update(None, 0.5) is None
+    arrive(detector, 1.0)
+    assert move(detector, (0.03, 0), frames=4, start=1.0) == [None] * 4
+    assert detector.moving                     # 0.09：正在移动，还不够挥手
+    assert detector.update(None, 1.2) is None
+    assert not detector.moving and detector._count == 0
+
+
+def test_ring_buffer_window():
+    """测试缓冲区绕回后，位移和速度只看最近 frames 帧的首尾"""
+    detector = SwipeDetector(threshold=10.0, frames=4)   # 阈值很大：只看统计
+    for i in range(11):
+        detector.update(HAND + [0.01 * i, 0], i / 30)
+    assert np.allclose(detector.displacement, [0.03, 0])          # 第 7 帧 → 第 10 帧
+    assert np.allclose(detector.velocity, [0.3, 0])
+    try:
+        SwipeDetector(frames=1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_controller_dispatches_swipe():
+    """测试挥手走和静态手势同一个派发：右挥 → 快进；挥手过程中和挥完停下的张掌不触发播放"""
+    events = []
+    clock = FrameClock()
+    controller = GestureController(RecordingDispatcher(events), verbose=False, clock=clock,
+                                   swipe=SwipeDetector())
+    actions = []
+    for i in range(48):
+        clock.update(i * 33)
+        x = min(max(i - 8, 0), 8) * 0.03     # 手进场后静止 8 帧，再向右挥 8 帧，之后停住
+        points = {'tracked': HAND + [x, 0], 'pointing_up': False, 'single_finger': False}
+        gesture = GestureType.OPEN_PALM if i >= 8 else GestureType.NONE
+        actions.append(controller.update(gesture, points))
+    assert [a for a in actions if a] == ['forward']
+    assert [e[2] for e in events] == ['rightx4']
+
+    # 指向滚动时手指上下移动不算挥手
+    controller = GestureController(RecordingDispatcher([]), verbose=False, clock=clock,
+                                   swipe=SwipeDetector())
+    for i in range(20):
+        y = -0.03 * max(i - 8, 0)
+        points = {'tracked': HAND + [0, y], 'pointing_up': True, 'single_finger': True}
+        controller.update(GestureType.POINTING_UP, points)
+        assert controller.last_swipe is None
+
+
+def open_palm(x):
+    """张开手掌的 21 个关键点，手腕在 (x, 0.75)"""
+    points = [(x, 0.75), (x - 0.04, 0.7), (x - 0.07, 0.66), (x - 0.1, 0.62), (x - 0.13, 0.58)]
+    for offset in (-0.03, 0.0, 0.03, 0.06):
+        points += [(x + offset, 0.6 - 0.07 * k) for k in range(4)]
+    return [SimpleNamespace(x=px, y=py, z=0.0) for px, py in points]
+
+
+def test_replay_swipe_from_landmarks():
+    """测试完整后处理：录制的关键点向左移动 → 识别器给出 tracked → 快退；关掉挥手则没有动作
+    （张掌分数 0.55 不够确认，静态手势不会触发）"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 's.npz')
+        recorder = SessionRecorder(path)
+        for i in range(40):
+            landmarks = open_palm(0.7 - 0.04 * min(max(i - 10, 0), 10))   # 进场静止 10 帧再挥
+            result = SimpleNamespace(
+                gestures=[[SimpleNamespace(category_name='Open_Palm', score=0.55)]],
+                handedness=[[SimpleNamespace(category_name='Right', score=0.98)]],
+                hand_landmarks=[landmarks], hand_world_landmarks=[landmarks])
+            recorder.record(1000 + i * 33, result, result.hand_landmarks, 320, 240)
+        recorder.close()
+        recording = load_recording(path)
+
+    actions = [e[2] for e in ReplayEngine(recording).run()['events'] if e[1] == 'action']
+    assert actions == ['rewind']
+    assert ReplayEngine(recording, swipe=False).run()['counts'].get('action') is None
+
+
+if __name__ == "__main__":
+    print("Running swipe tests...")
+
+    test_four_directions()
+    print("✓ test_four_directions")
+
+    test_rejects_slow_diagonal_and_single_finger()
+    print("✓ test_rejects_slow_diagonal_and_single_finger")
+
+    test_entering_hand_is_not_a_swipe()
+    print("✓ test_entering_hand_is_not_a_swipe")
+
+    test_one_event_per_swipe()
+    print("✓ test_one_event_per_swipe")
+
+    test_ring_buffer_window()
+    print("✓ test_ring_buffer_window")
+
+    test_controller_dispatches_swipe()
+    print("✓ test_controller_dispatches_swipe")
+
+    test_replay_swipe_from_landmarks()
+    print("✓ test_replay_swipe_from_landmarks")
+
+    print("\n所有挥手检测测试通过！")
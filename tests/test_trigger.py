@@ -0,0 +1,172 @@
+"""
+测试证据触发 - SPRT 的接受/重来、SimpleGesture 和 TimedAction 提前触发、回放的触发延迟
+
+运行方式：
+    python -m pytest tests/test_trigger.py -v
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.actions import TimedAction
+from gesture_control.core.clock import FrameClock
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.recording import SessionRecorder, load_recording
+from gesture_control.core.state_machine import GestureStateMachine
+from gesture_control.core.trigger import SPRTTrigger, create_trigger
+from gesture_control.main import SimpleGesture
+from gesture_control.replay import ReplayEngine, latency_summary
+from tests.helpers import make_result
+
+FIST, PALM = GestureType.FIST, GestureType.OPEN_PALM
+
+
+def frames_to_accept(trigger, score, limit=60):
+    """同一个分数连续输入，第几帧接受（limit 帧内没接受返回 None）"""
+    for n in range(1, limit + 1):
+        trigger.update({FIST: score, GestureType.NONE: 1 - score})
+        if trigger.accepted(FIST):
+            return n
+    return None
+
+
+def test_confidence_sets_speed():
+    """测试分数越高接受越快，模糊的分数永远不接受"""
+    assert frames_to_accept(SPRTTrigger(), 0.99) == 4
+    assert frames_to_accept(SPRTTrigger(), 0.8) == 6
+    assert frames_to_accept(SPRTTrigger(), 0.6) is None
+    # 更严格的误触发率要更多证据
+    assert frames_to_accept(SPRTTrigger(false_trigger=0.0001), 0.99) > 4
+
+
+def test_release_and_reset():
+    """测试证据封顶：手势结束后很快不再接受；没有分数的帧全部重来；NONE 不参与"""
+    trigger = SPRTTrigger()
+    frames_to_accept(trigger, 0.99, limit=30)
+    assert trigger.llr[FIST] == trigger.upper
+    trigger.update({PALM: 0.9})
+    assert not trigger.accepted(FIST)
+    assert GestureType.NONE not in trigger.llr
+
+    for _ in range(5):
+        trigger.update({PALM: 0.1})
+    assert PALM not in trigger.llr            # 跌破下界：接受 H0，从 0 重来
+
+    frames_to_accept(trigger, 0.99)
+    trigger.update(None)
+    assert trigger.llr == {}
+
+
+def test_create_trigger():
+    """测试按名字创建，以及参数检查"""
+    assert create_trigger('hold') is None
+    assert isinstance(create_trigger('sprt', miss=0.1), SPRTTrigger)
+    for bad in (lambda: create_trigger('cusum'), lambda: SPRTTrigger(false_trigger=0),
+                lambda: SPRTTrigger(p_hit=0.2, p_false=0.5)):
+        try:
+            bad()
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError")
+
+
+def run_detector(detector, clock, frames, score):
+    """每帧 33ms，返回第一次触发的时间（秒）"""
+    for i in range(frames):
+        clock.update(i * 33)
+        scores = {FIST: score} if score is not None else None
+        if detector.update(FIST, scores):
+            return i * 0.033
+    return None
+
+
+def test_simple_gesture_early_trigger():
+    """测试 SimpleGesture：高分提前触发，低分或没有分数（拍手）仍按保持时间，且只触发一次"""
+    clock = FrameClock()
+    assert run_detector(SimpleGesture(clock, SPRTTrigger()), clock, 30, 0.95) < 0.15
+
+    for score in (0.6, None):
+        clock = FrameClock()
+        fired = run_detector(SimpleGesture(clock, SPRTTrigger()), clock, 30, score)
+        assert 0.3 <= fired < 0.35
+
+    clock = FrameClock()
+    detector = SimpleGesture(clock, SPRTTrigger())
+    fired = [detector.update(FIST, {FIST: 0.95}) for _ in range(10)]
+    assert fired.count('pause') == 1
+
+
+def test_timed_action_early_first_threshold():
+    """测试 TimedAction：第一档证据足够就执行，第二档仍要等满时间；新的一段重新积累"""
+    pressed = []
+    clock = FrameClock()
+    machine = GestureStateMachine(clock)
+    action = TimedAction([(0.5, lambda: pressed.append('space'), 'Play/Pause'),
+                          (3.0, lambda: pressed.append('f'), 'Fullscreen')],
+                         trigger=SPRTTrigger())
+    for i in range(30):
+        clock.update(i * 33)
+        action.execute(machine.update(FIST), machine, {'scores': {FIST: 0.95}})
+    assert pressed == ['space']
+
+    clock.update(2000)
+    machine.update(GestureType.NONE)
+    clock.update(2033)
+    hold_time = machine.update(FIST)
+    action.execute(hold_time, machine, {'scores': {FIST: 0.95}})
+    assert pressed == ['space']                # 上一段的证据已经清空
+
+
+def test_replay_trigger_latency():
+    """测试回放报告触发延迟：SPRT 的平均和 p95 延迟都比固定保持时间短，动作数相同"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 's.npz')
+        recorder = SessionRecorder(path)
+        timestamp_ms = 1000
+        for name, frames in [(None, 15), ('Closed_Fist', 30), (None, 15), ('Victory', 30),
+                             (None, 15)]:
+            for _ in range(frames):
+                result = make_result(name, 0.95)
+                recorder.record(timestamp_ms, result, result.hand_landmarks, 320, 240)
+                timestamp_ms += 33
+        recorder.close()
+        recording = load_recording(path)
+
+    hold = ReplayEngine(recording, trigger='hold').run()
+    sprt = ReplayEngine(recording, trigger='sprt').run()
+    assert hold['counts']['action'] == sprt['counts']['action'] == 2
+    assert hold['trigger_latency']['count'] == 2
+    assert hold['trigger_latency']['mean_ms'] >= 300
+    assert sprt['trigger_latency']['p95_ms'] < 150
+    assert sprt['trigger_latency']['p95_ms'] < hold['trigger_latency']['mean_ms'] / 2
+
+    summary = latency_summary(list(range(1, 101)))
+    assert (summary['count'], summary['mean_ms'], summary['p95_ms']) == (100, 50.5, 95.0)
+    assert latency_summary([])['count'] == 0
+
+
+if __name__ == "__main__":
+    print("Running trigger tests...")
+
+    test_confidence_sets_speed()
+    print("✓ test_confidence_sets_speed")
+
+    test_release_and_reset()
+    print("✓ test_release_and_reset")
+
+    test_create_trigger()
+    print("✓ test_create_trigger")
+
+    test_simple_gesture_early_trigger()
+    print("✓ test_simple_gesture_early_trigger")
+
+    test_timed_action_early_first_threshold()
+    print("✓ test_timed_action_early_first_threshold")
+
+    test_replay_trigger_latency()
+    print("✓ test_replay_trigger_latency")
+
+    print("\n所有证据触发测试通过！")
@@ -0,0 +1,208 @@
+"""
+测试子进程识别 - RemoteRecognizer 的结果回传、启动失败、崩溃后自动重启
+
+运行方式：
+    python -m pytest tests/test_worker.py -v
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.core.gestures import GestureType
+from gesture_control.core.metrics import Metrics
+from gesture_control.core.worker import RemoteRecognizer
+from tests.helpers import CRASH, SHAPE, FakeRecognizer, create_broken, create_fake, frame_with
+
+
+def create_fragile(crash_marker, startup_marker=None, always=False):
+    """崩溃过一次之后，重启的进程在 READY 之前退出：一次（startup_marker）或每次（always）"""
+    if os.path.exists(crash_marker):
+        if always or not os.path.exists(startup_marker):
+            if startup_marker is not None:
+                open(startup_marker, 'w').close()
+            os._exit(1)
+    return FakeRecognizer(crash_marker)
+
+
+class Results:
+    """收集 on_result 回调（在接收线程里调用）"""
+
+    def __init__(self):
+        self.items = []
+        self.event = threading.Event()
+
+    def __call__(self, gesture, points, timestamp_ms):
+        self.items.append((gesture, points, timestamp_ms))
+        self.event.set()
+
+    def wait(self, timeout=10.0):
+        assert self.event.wait(timeout), "no result"
+        self.event.clear()
+        return self.items[-1]
+
+
+def test_remote_results():
+    """测试结果经 on_result 和 latest 送回，HandFeatures 不跨进程，推理耗时记入 metrics"""
+    results = Results()
+    metrics = Metrics(enabled=True)
+    recognizer = RemoteRecognizer(on_result=results, metrics=metrics, factory=create_fake)
+    try:
+        assert recognizer.start(SHAPE).wait_ready(30)
+        assert recognizer.recognize_async(frame_with(1), 32, 24, 1000, is_rgb=True)
+        gesture, points, timestamp_ms = results.wait()
+        assert (gesture, timestamp_ms) == (GestureType.FIST, 1000)
+        assert points == {'index_x': 32, 'index_y': 24}
+        assert recognizer.latest == (gesture, points, 1000)
+        assert recognizer.raw_gesture == GestureType.OPEN_PALM
+        assert metrics.snapshot()['counters']['inferences'] == 1
+    finally:
+        recognizer.close()
+
+
+def test_remote_startup_error():
+    """测试子进程里模型加载失败时 wait_ready 返回 False 并给出原因，之后的帧不再提交"""
+    recognizer = RemoteRecognizer(factory=create_broken)
+    try:
+        assert not recognizer.start(SHAPE).wait_ready(30)
+        assert 'model.task' in recognizer.error
+        assert not recognizer.recognize_async(frame_with(1), 32, 24, 1000, is_rgb=True)
+        time.sleep(0.3)
+        assert recognizer.restarts == 0   # 启动失败不重启
+    finally:
+        recognizer.close()
+
+
+def test_remote_restarts_after_crash():
+    """测试识别进程崩溃后自动重启，后续帧照常出结果"""
+    results = Results()
+    with tempfile.TemporaryDirectory() as tmp:
+        marker = os.path.join(tmp, 'crashed')
+        recognizer = RemoteRecognizer({'crash_marker': marker}, on_result=results,
+                                      factory=create_fake)
+        try:
+            assert recognizer.start(SHAPE).wait_ready(30)
+            recognizer.recognize_async(frame_with(CRASH), 32, 24, 1000, is_rgb=True)
+
+            deadline = time.monotonic() + 30
+            while recognizer.restarts == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert recognizer.restarts == 1
+            assert os.path.exists(marker)
+
+            # 新进程加载完之前提交的帧也会在就绪后处理（请求在队列里等着）
+            recognizer.recognize_async(frame_with(2), 32, 24, 1100, is_rgb=True)
+            gesture, _, timestamp_ms = results.wait(30)
+            assert (gesture, timestamp_ms) == (GestureType.FIST, 1100)
+            assert recognizer.error is None
+        finally:
+            recognizer.close()
+
+
+def test_remote_restarts_worker_that_dies_before_ready():
+    """测试重启后还没 READY 就又退出的进程照样重启；重启途中提交帧不会出错（丢掉）"""
+    results = Results()
+    with tempfile.TemporaryDirectory() as tmp:
+        options = {'crash_marker': os.path.join(tmp, 'crashed'),
+                   'startup_marker': os.path.join(tmp, 'startup')}
+        recognizer = RemoteRecognizer(options, on_result=results, factory=create_fragile)
+        errors = []
+        submitting = threading.Event()
+
+        def submit_frames():
+            try:
+                while not submitting.is_set():
+                    recognizer.recognize_async(frame_with(0), 32, 24, 500, is_rgb=True)
+                    time.sleep(0.001)
+            except Exception as e:
+                errors.append(e)
+
+        try:
+            assert recognizer.start(SHAPE).wait_ready(30)
+            recognizer.recognize_async(frame_with(CRASH), 32, 24, 1000, is_rgb=True)
+            deadline = time.monotonic() + 30
+            while not os.path.exists(options['crash_marker']) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            submitter = threading.Thread(target=submit_frames)
+            submitter.start()
+
+            while recognizer.restarts < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            submitting.set()
+            submitter.join()
+            assert errors == []
+            assert recognizer.restarts == 2
+            assert os.path.exists(options['startup_marker'])
+
+            recognizer.recognize_async(frame_with(2), 32, 24, 1100, is_rgb=True)
+            deadline = time.monotonic() + 30
+            while results.wait(30)[2] != 1100:
+                assert time.monotonic() < deadline
+            assert recognizer.error is None
+        finally:
+            recognizer.close()
+
+
+def test_remote_gives_up_after_max_restarts():
+    """测试每次重启都在 READY 之前退出：连续 MAX_RESTARTS 次后放弃，原因在 error"""
+    results = Results()
+    with tempfile.TemporaryDirectory() as tmp:
+        options = {'crash_marker': os.path.join(tmp, 'crashed'), 'always': True}
+        recognizer = RemoteRecognizer(options, on_result=results, factory=create_fragile)
+        recognizer.pool.MAX_RESTARTS = 2
+        try:
+            assert recognizer.start(SHAPE).wait_ready(30)
+            recognizer.recognize_async(frame_with(CRASH), 32, 24, 1000, is_rgb=True)
+
+            deadline = time.monotonic() + 30
+            while recognizer.error is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert 'without becoming ready' in recognizer.error
+            assert recognizer.restarts == 2
+            assert not recognizer.recognize_async(frame_with(2), 32, 24, 1100, is_rgb=True)
+        finally:
+            recognizer.close()
+
+
+def test_remote_converts_bgr():
+    """测试提交 BGR 帧时先转 RGB，第一帧到达时才启动也可以"""
+    results = Results()
+    recognizer = RemoteRecognizer(on_result=results, factory=create_fake)
+    try:
+        frame = np.zeros(SHAPE, dtype=np.uint8)
+        frame[..., 2] = 5   # BGR 的 R 通道 → RGB 的第 0 通道
+        recognizer.recognize_async(frame, 32, 24, 1000)
+        gesture, _, _ = results.wait(30)
+        assert gesture == GestureType.FIST
+    finally:
+        recognizer.close()
+
+
+if __name__ == "__main__":
+    print("Running inference worker tests...")
+
+    test_remote_results()
+    print("✓ test_remote_results")
+
+    test_remote_startup_error()
+    print("✓ test_remote_startup_error")
+
+    test_remote_restarts_after_crash()
+    print("✓ test_remote_restarts_after_crash")
+
+    test_remote_restarts_worker_that_dies_before_ready()
+    print("✓ test_remote_restarts_worker_that_dies_before_ready")
+
+    test_remote_gives_up_after_max_restarts()
+    print("✓ test_remote_gives_up_after_max_restarts")
+
+    test_remote_converts_bgr()
+    print("✓ test_remote_converts_bgr")
+
+    print("\n所有子进程识别测试通过！")